@@ -0,0 +1,156 @@
+"""Time the warden/API gatepass filters against a large gatepass table.
+
+Inserts ``--rows`` gatepasses inside a transaction that is rolled back at the
+end, then runs each filter combination the way the list views do (first page
+newest first, plus the total) and reports the query plan's index and whether
+both stayed under ``--budget-ms``. Run it from the project directory against a
+migrated scratch database:
+
+    export DATABASE_URL=sqlite:////tmp/bench.sqlite3
+    python manage.py migrate
+    python benchmarks/filter_gatepasses.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, time as clock, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hostel_gatepass.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from gatepass import filters  # noqa: E402
+from gatepass.hostels import hostel_scope  # noqa: E402
+from gatepass.models import User, Hostel, Student, GatePass  # noqa: E402
+
+
+STUDENTS = 2000
+PAGE = 50
+STATUS_WEIGHTS = {
+    'returned': 80, 'completed': 6, 'warden_rejected': 8, 'pending': 2, 'warden_approved': 2, 'security_approved': 2,
+}
+
+
+def create_rows(count, seed=1):
+    rng = random.Random(seed)
+    hostels = [Hostel.objects.create(name=f'Bench Hostel {n}', gender='MF'[n % 2]) for n in range(4)]
+    wardens = [
+        User.objects.create(username=f'benchwarden{n}', email=f'benchwarden{n}@example.com', role='warden')
+        for n in range(8)
+    ]
+    students = []
+    for n in range(STUDENTS):
+        hostel = hostels[n % len(hostels)]
+        user = User.objects.create(
+            username=f'benchstudent{n}', email=f'benchstudent{n}@example.com', role='student', gender=hostel.gender
+        )
+        students.append(Student.objects.create(
+            user=user, hostel=hostel, hall_ticket_no=f'2{n % 4}BH1A{n:04d}', student_name=f'Bench Student {n}',
+            room_no=str(100 + n % 200), parent_name='Parent', parent_mobile=f'70000{n:05d}',
+        ))
+
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    start = date(2023, 1, 1)
+    now = timezone.now()
+    batch = []
+    for n in range(count):
+        student = students[rng.randrange(len(students))]
+        outing = start + timedelta(days=rng.randrange(1000))
+        status = rng.choices(statuses, weights)[0]
+        outing_at = timezone.make_aware(datetime.combine(outing, clock(10, 0)))
+        batch.append(GatePass(
+            student=student, hostel_id=student.hostel_id, student_name=student.student_name,
+            hall_ticket_no=student.hall_ticket_no, room_no=student.room_no, parent_mobile=student.parent_mobile,
+            student_gender=student.user.gender, outing_date=outing, outing_time=clock(10, 0),
+            expected_return_date=outing + timedelta(days=1), expected_return_time=clock(18, 0),
+            outing_at=outing_at, expected_return_at=outing_at + timedelta(days=1, hours=8),
+            purpose='Benchmark outing', status=status,
+            warden_approval=wardens[rng.randrange(len(wardens))] if status != 'pending' else None,
+            created_at=now, updated_at=now,
+        ))
+        if len(batch) == 10000:
+            GatePass.objects.bulk_create(batch)
+            batch = []
+    GatePass.objects.bulk_create(batch)
+    # auto_now_add ignores the values above, so spread created_at over the outing dates afterwards
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE gatepass_gatepass SET created_at = outing_at - (id % 7) * INTERVAL '1 day'"
+            if connection.vendor == 'postgresql' else
+            "UPDATE gatepass_gatepass SET created_at = datetime(outing_at, '-' || (id % 7) || ' days')"
+        )
+        cursor.execute('ANALYZE')
+    return hostels, wardens
+
+
+def scenarios(hostels, wardens):
+    day = date(2024, 6, 1)
+    return [
+        ('status=pending', None, {'status': ['pending']}),
+        ('status in (approved, out)', None, {'status': ['warden_approved', 'security_approved']}),
+        ('status=returned, outing in June 2024', None,
+         {'status': ['returned'], 'from_date': day, 'to_date': day + timedelta(days=29)}),
+        ('outing on one day', None, {'from_date': day, 'to_date': day}),
+        ('return window of a week', None, {'return_from': day, 'return_to': day + timedelta(days=6)}),
+        ('overdue only', None, {'overdue': True}),
+        ('room 150', None, {'room': '150'}),
+        ('hall ticket prefix 21BH1A01', None, {'hall_ticket': '21BH1A01'}),
+        ('gender F, status pending', None, {'gender': 'F', 'status': ['pending']}),
+        ('approver', None, {'approver': wardens[0]}),
+        ('free text "Student 1234"', None, {'q': 'Bench Student 1234'}),
+        ('hostel scope, status pending', hostels[0].pk, {'status': ['pending']}),
+        ('hostel scope, returned in June 2024', hostels[0].pk,
+         {'status': ['returned'], 'from_date': day, 'to_date': day + timedelta(days=29)}),
+    ]
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def plan_index(queryset):
+    plan = queryset.explain()
+    for word in plan.replace('(', ' ').replace(')', ' ').split():
+        if word.endswith('_idx') or word.startswith('gatepass_gatepass_') or word.startswith('sqlite_autoindex'):
+            return word
+    return 'SCAN' if 'SCAN' in plan.upper() else plan.splitlines()[0][:40]
+
+
+def main(args):
+    with transaction.atomic():
+        (hostels, wardens), seconds = timed(lambda: create_rows(args.rows))
+        print(f'{GatePass.all_hostels.count():,} gatepasses on {connection.vendor}, inserted in {seconds / 1000:.1f} s')
+        print(f'budget {args.budget_ms:.0f} ms per query\n')
+        print(f'{"filter":<40} {"page ms":>8} {"count ms":>9} {"rows":>9}  index')
+
+        over = 0
+        for label, hostel_id, data in scenarios(hostels, wardens):
+            with hostel_scope(hostel_id):
+                queryset = filters.apply(GatePass.objects.all(), data).order_by('-created_at')
+                page, page_ms = timed(lambda: list(queryset[:PAGE]))
+                total, count_ms = timed(queryset.count)
+                index = plan_index(queryset[:PAGE])
+            slow = max(page_ms, count_ms) > args.budget_ms
+            over += slow
+            print(f'{label:<40} {page_ms:8.1f} {count_ms:9.1f} {total:9,}  {index}{"  OVER BUDGET" if slow else ""}')
+        transaction.set_rollback(True)
+    print(f'\n{over} filter(s) over budget')
+    return over
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--budget-ms', type=float, default=100)
+    sys.exit(1 if main(parser.parse_args()) else 0)
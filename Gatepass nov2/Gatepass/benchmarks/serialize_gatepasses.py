@@ -0,0 +1,84 @@
+"""Compare gatepass list serialization and JSON rendering throughput.
+
+Inserts ``--rows`` gatepasses inside a transaction that is rolled back at the
+end, then times each serializer and renderer over the same rows. Run it from
+the project directory against a migrated scratch database:
+
+    export DATABASE_URL=sqlite:////tmp/bench.sqlite3
+    python manage.py migrate
+    python benchmarks/serialize_gatepasses.py --rows 10000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, time as clock, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hostel_gatepass.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from gatepass.models import User, Student, GatePass  # noqa: E402
+from gatepass.renderers import ORJSONRenderer, orjson  # noqa: E402
+from gatepass.serializers import GatePassSerializer, GatePassListSerializer, gatepass_list_values  # noqa: E402
+
+
+def create_rows(count):
+    students = []
+    for n in range(20):
+        user = User.objects.create(username=f'bench{n}', email=f'bench{n}@example.com', role='student', gender='M')
+        students.append(Student.objects.create(
+            user=user, hall_ticket_no=f'BENCH{n:05d}', student_name=f'Bench Student {n}', room_no=str(100 + n),
+            parent_name='Parent', parent_mobile=f'80000{n:05d}',
+        ))
+    start = date(2024, 1, 1)
+    GatePass.objects.bulk_create([
+        GatePass(
+            student=students[n % len(students)], **students[n % len(students)].gatepass_snapshot(),
+            outing_date=start + timedelta(days=n % 365), outing_time=clock(10, 0),
+            expected_return_date=start + timedelta(days=n % 365), expected_return_time=clock(18, 0),
+            purpose='Benchmark outing', status='returned',
+        )
+        for n in range(count)
+    ], batch_size=1000)
+
+
+def timed(label, rows, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f'{label:<48} {elapsed * 1000:8.1f} ms {rows / elapsed:>12,.0f} rows/s')
+    return result
+
+
+def main(args):
+    with transaction.atomic():
+        create_rows(args.rows)
+        queryset = GatePass.objects.order_by('-created_at')
+        rows = queryset.count()
+        print(f'{rows} gatepasses; orjson {"available" if orjson else "not installed"}\n')
+
+        nested = timed('GatePassSerializer (nested, select_related)', rows,
+                       lambda: GatePassSerializer(queryset.select_related('student__user'), many=True).data)
+        flat = timed('GatePassListSerializer (ModelSerializer)', rows,
+                     lambda: GatePassListSerializer(queryset, many=True).data)
+        values = timed('gatepass_list_values (values())', rows, lambda: gatepass_list_values.serialize(queryset))
+        assert [dict(row) for row in flat] == values
+        print()
+        for label, data in (('nested', nested), ('flat', values)):
+            timed(f'JSONRenderer, {label}', rows, lambda: JSONRenderer().render(data))
+            timed(f'ORJSONRenderer, {label}', rows, lambda: ORJSONRenderer().render(data))
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    main(parser.parse_args())
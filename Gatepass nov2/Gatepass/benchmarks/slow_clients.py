@@ -0,0 +1,90 @@
+"""Measure how many long-polling mobile clients one worker can hold at once.
+
+Each client logs in, then long-polls the unread notification count for
+``--wait`` seconds. Under a sync worker the async view runs to completion
+inside the worker thread, so polls are served one after another; under an
+ASGI worker they wait on the event loop and overlap. Run the same command
+against both servers:
+
+    # terminal 1, one of:
+    gunicorn hostel_gatepass.wsgi:application -w 1 -b 127.0.0.1:8000
+    gunicorn hostel_gatepass.asgi:application -w 1 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8000
+
+    # terminal 2
+    python benchmarks/slow_clients.py --clients 50 --wait 2 --username <user> --password <password>
+
+Only the standard library is needed on the client side.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+
+async def http(host, port, method, path, headers=None, body=b''):
+    reader, writer = await asyncio.open_connection(host, port)
+    lines = [f'{method} {path} HTTP/1.1', f'Host: {host}:{port}', 'Connection: close', f'Content-Length: {len(body)}']
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), payload
+
+
+async def login(args):
+    body = json.dumps({'username': args.username, 'password': args.password}).encode()
+    status, payload = await http(
+        args.host, args.port, 'POST', '/api/async/login/', {'Content-Type': 'application/json'}, body
+    )
+    if status != 200:
+        raise SystemExit(f'Login failed ({status}): {payload.decode()}')
+    return json.loads(payload)['token']
+
+
+async def unread_count(args, token, query=''):
+    path = f'/api/async/notifications/unread-count/{query}'
+    status, payload = await http(args.host, args.port, 'GET', path, {'Authorization': f'Token {token}'})
+    return status, payload
+
+
+async def long_poll(args, token, since):
+    started = time.monotonic()
+    # Polling with the current count only answers once the wait runs out
+    status, _ = await unread_count(args, token, f'?since={since}&wait={args.wait}')
+    return status, time.monotonic() - started
+
+
+async def main(args):
+    token = await login(args)
+    _, payload = await unread_count(args, token)
+    since = json.loads(payload)['unread']
+    started = time.monotonic()
+    results = await asyncio.gather(*[long_poll(args, token, since) for _ in range(args.clients)], return_exceptions=True)
+    elapsed = time.monotonic() - started
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    latencies = sorted(result[1] for result in results if not isinstance(result, Exception))
+    statuses = {}
+    for result in results:
+        if not isinstance(result, Exception):
+            statuses[result[0]] = statuses.get(result[0], 0) + 1
+
+    print(f'{args.clients} clients, {args.wait}s long-poll each, finished in {elapsed:.2f}s')
+    print(f'Statuses: {statuses}, connection errors: {len(failures)}')
+    if latencies:
+        print(f'Latency p50 {latencies[len(latencies) // 2]:.2f}s, max {latencies[-1]:.2f}s')
+    # 1.0 means the worker held one client at a time
+    print(f'Clients held concurrently per worker: {args.clients * args.wait / elapsed:.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--wait', type=int, default=2, help='Seconds each long-poll is held open')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin123')
+    asyncio.run(main(parser.parse_args()))
@@ -1,6 +1,18 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Student, Warden, Security, GatePass, ParentVerification, Notification
+from .models import (
+    User, Hostel, Student, Warden, Security, GatePass, ParentVerification, Notification,
+    ArchivedGatePass, ArchivedNotification, DailyGatePassStats, OccupancyCounter, OutboxMessage,
+    Job, StudentGatePassStats,
+)
+from .pagination import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables that grow by thousands of rows a day"""
+    
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(User)
@@ -28,21 +40,34 @@ class CustomUserAdmin(UserAdmin):
     )
 
 
+@admin.register(Hostel)
+class HostelAdmin(admin.ModelAdmin):
+    """Hostel Admin"""
+    
+    list_display = ('name', 'gender', 'created_at')
+    list_filter = ('gender',)
+    search_fields = ('name',)
+
+
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(LargeTableAdmin):
     """Student Admin"""
     
-    list_display = ('student_name', 'hall_ticket_no', 'room_no', 'parent_name', 'parent_mobile', 'user')
-    list_filter = ('user__gender', 'user__is_approved')
+    list_display = ('student_name', 'hall_ticket_no', 'hostel', 'room_no', 'parent_name', 'parent_mobile', 'user')
+    list_filter = ('hostel', 'user__gender', 'user__is_approved')
+    list_select_related = ('user', 'hostel')
     search_fields = ('student_name', 'hall_ticket_no', 'parent_name', 'parent_mobile')
     readonly_fields = ('username_format',)
+    autocomplete_fields = ('user',)
 
 
 @admin.register(Warden)
 class WardenAdmin(admin.ModelAdmin):
     """Warden Admin"""
     
-    list_display = ('name', 'department', 'user')
+    list_display = ('name', 'department', 'hostel', 'user')
+    list_filter = ('hostel',)
+    list_select_related = ('user', 'hostel')
     search_fields = ('name', 'department')
 
 
@@ -50,22 +75,28 @@ class WardenAdmin(admin.ModelAdmin):
 class SecurityAdmin(admin.ModelAdmin):
     """Security Admin"""
     
-    list_display = ('name', 'shift', 'user')
+    list_display = ('name', 'shift', 'hostel', 'user')
+    list_filter = ('hostel', 'shift')
+    list_select_related = ('user', 'hostel')
     search_fields = ('name', 'shift')
 
 
 @admin.register(GatePass)
-class GatePassAdmin(admin.ModelAdmin):
+class GatePassAdmin(LargeTableAdmin):
     """GatePass Admin"""
     
-    list_display = ('student', 'outing_date', 'outing_time', 'status', 'created_at')
-    list_filter = ('status', 'outing_date', 'student__user__gender')
-    search_fields = ('student__student_name', 'student__hall_ticket_no')
-    readonly_fields = ('created_at', 'updated_at')
+    # The list only shows snapshot columns, so it needs no joins
+    list_display = ('student_name', 'hall_ticket_no', 'outing_date', 'outing_time', 'status', 'created_at')
+    list_filter = ('hostel', 'status', 'student_gender')
+    date_hierarchy = 'outing_date'
+    search_fields = ('student_name', 'hall_ticket_no')
+    autocomplete_fields = ('student', 'warden_approval', 'security_approval')
+    raw_id_fields = ('return_verified_by',)
+    readonly_fields = ('hostel', 'student_name', 'hall_ticket_no', 'room_no', 'parent_mobile', 'student_gender', 'created_at', 'updated_at')
     
     fieldsets = (
         ('Student Information', {
-            'fields': ('student',)
+            'fields': ('student', 'hostel', 'student_name', 'hall_ticket_no', 'room_no', 'parent_mobile', 'student_gender')
         }),
         ('Outing Details', {
             'fields': ('outing_date', 'outing_time', 'expected_return_date', 'expected_return_time', 'purpose')
@@ -81,19 +112,111 @@ class GatePassAdmin(admin.ModelAdmin):
 
 
 @admin.register(ParentVerification)
-class ParentVerificationAdmin(admin.ModelAdmin):
+class ParentVerificationAdmin(LargeTableAdmin):
     """Parent Verification Admin"""
     
     list_display = ('gatepass', 'parent_mobile', 'is_verified', 'verified_at', 'created_at')
-    list_filter = ('is_verified', 'created_at')
-    search_fields = ('gatepass__student__student_name', 'parent_mobile')
+    list_filter = ('is_verified',)
+    list_select_related = ('gatepass',)
+    date_hierarchy = 'created_at'
+    search_fields = ('gatepass__student_name', 'parent_mobile')
+    raw_id_fields = ('gatepass',)
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(LargeTableAdmin):
     """Notification Admin"""
     
     list_display = ('user', 'gatepass', 'notification_type', 'is_read', 'created_at')
-    list_filter = ('notification_type', 'is_read', 'created_at')
+    list_filter = ('notification_type', 'is_read')
+    list_select_related = ('user', 'gatepass')
+    date_hierarchy = 'created_at'
+    search_fields = ('user__username', 'message')
+    readonly_fields = ('created_at',)
+    raw_id_fields = ('user', 'gatepass')
+
+
+@admin.register(ArchivedGatePass)
+class ArchivedGatePassAdmin(LargeTableAdmin):
+    """Archived GatePass Admin"""
+    
+    list_display = ('id', 'student_name', 'hall_ticket_no', 'outing_date', 'status', 'updated_at', 'archived_at')
+    list_filter = ('status',)
+    search_fields = ('student_name', 'hall_ticket_no')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(LargeTableAdmin):
+    """Archived Notification Admin"""
+    
+    list_display = ('user', 'gatepass_id', 'notification_type', 'is_read', 'created_at', 'archived_at')
+    list_filter = ('notification_type', 'is_read')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'message')
-    readonly_fields = ('created_at',)
\ No newline at end of file
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+
+@admin.register(DailyGatePassStats)
+class DailyGatePassStatsAdmin(admin.ModelAdmin):
+    """Daily Gatepass Stats Admin"""
+    
+    list_display = ('date', 'created_count', 'warden_approved_count', 'warden_rejected_count', 'exit_count', 'return_count')
+    date_hierarchy = 'date'
+    readonly_fields = ('updated_at',)
+
+
+
+@admin.register(OccupancyCounter)
+class OccupancyCounterAdmin(admin.ModelAdmin):
+    """Occupancy Counter Admin"""
+    
+    list_display = ('room_no', 'hostel', 'gender', 'count', 'updated_at')
+    list_filter = ('hostel', 'gender')
+    list_select_related = ('hostel',)
+    search_fields = ('room_no',)
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(StudentGatePassStats)
+class StudentGatePassStatsAdmin(admin.ModelAdmin):
+    """Student Gatepass Stats Admin"""
+    
+    list_display = ('student', 'total_count', 'pending_count', 'approved_count', 'rejected_count', 'updated_at')
+    list_select_related = ('student',)
+    search_fields = ('student__hall_ticket_no', 'student__student_name')
+    raw_id_fields = ('student',)
+    readonly_fields = ('updated_at',)
+
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(LargeTableAdmin):
+    """Outbox Message Admin"""
+    
+    list_display = ('recipient', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+    raw_id_fields = ('gatepass',)
+
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    """Background Job Admin"""
+    
+    list_display = ('name', 'status', 'attempts', 'run_at', 'duration_ms', 'locked_by', 'finished_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('created_at', 'finished_at', 'locked_at', 'locked_by', 'duration_ms', 'last_error')
@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import GatePass, ArchivedGatePass, DailyGatePassStats
+
+
+STAT_FIELDS = [
+    'created_count', 'warden_approved_count', 'warden_rejected_count', 'exit_count', 'return_count',
+    'approval_latency_seconds', 'approval_latency_samples',
+]
+
+# Statuses a gatepass can only reach after the warden approved it
+APPROVED_STATUSES = ('warden_approved', 'security_approved', 'returned', 'completed')
+EXITED_STATUSES = ('security_approved', 'returned', 'completed')
+RETURNED_STATUSES = ('returned', 'completed')
+
+
+def transition_increments(gatepass, previous_status, status):
+    """Counter increments caused by a single status transition"""
+    increments = {}
+    if previous_status is None:
+        increments['created_count'] = 1
+    if previous_status in (None, 'pending'):
+        if status == 'warden_approved':
+            increments['warden_approved_count'] = 1
+        elif status == 'warden_rejected':
+            increments['warden_rejected_count'] = 1
+        if status in ('warden_approved', 'warden_rejected') and gatepass.warden_decided_at and gatepass.created_at:
+            latency = gatepass.warden_decided_at - gatepass.created_at
+            increments['approval_latency_seconds'] = max(int(latency.total_seconds()), 0)
+            increments['approval_latency_samples'] = 1
+    if status == 'security_approved' and previous_status != 'security_approved':
+        increments['exit_count'] = 1
+    if status == 'returned' and previous_status != 'returned':
+        increments['return_count'] = 1
+    return increments
+
+
+def bump_daily_stats(day, increments):
+    """Add ``increments`` to the rollup row for ``day`` with a single UPDATE"""
+    if not increments:
+        return
+    DailyGatePassStats.objects.get_or_create(date=day)
+    DailyGatePassStats.objects.filter(date=day).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + value for field, value in increments.items()}
+    )
+
+
+def record_transition(gatepass, previous_status, status):
+    bump_daily_stats(timezone.localdate(), transition_increments(gatepass, previous_status, status))
+
+
+def totals():
+    """All-time sums of the rollup counters"""
+    result = DailyGatePassStats.objects.aggregate(**{field: Sum(field) for field in STAT_FIELDS})
+    return {field: value or 0 for field, value in result.items()}
+
+
+def _local_date(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def rebuild_daily_stats(chunk_size=2000):
+    """Recompute the whole rollup from live and archived gatepasses.
+
+    Passes are streamed once; only one counter dict per day is held in
+    memory. Exit and return days fall back to the outing/return dates
+    recorded on the pass, since individual transition times are not stored.
+    """
+    days = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    columns = ('status', 'created_at', 'updated_at', 'warden_decided_at', 'outing_date', 'actual_return_date')
+
+    for model in (GatePass, ArchivedGatePass):
+        rows = model.objects.values_list(*columns).iterator(chunk_size=chunk_size)
+        for status, created_at, updated_at, decided_at, outing_date, actual_return_date in rows:
+            days[_local_date(created_at)]['created_count'] += 1
+
+            if status == 'warden_rejected' or status in APPROVED_STATUSES:
+                decision_day = days[_local_date(decided_at or updated_at)]
+                if status == 'warden_rejected':
+                    decision_day['warden_rejected_count'] += 1
+                else:
+                    decision_day['warden_approved_count'] += 1
+                if decided_at:
+                    latency = decided_at - created_at
+                    decision_day['approval_latency_seconds'] += max(int(latency.total_seconds()), 0)
+                    decision_day['approval_latency_samples'] += 1
+
+            if status in EXITED_STATUSES:
+                days[outing_date]['exit_count'] += 1
+            if status in RETURNED_STATUSES:
+                days[actual_return_date or _local_date(updated_at)]['return_count'] += 1
+
+    with transaction.atomic():
+        DailyGatePassStats.objects.all().delete()
+        DailyGatePassStats.objects.bulk_create(
+            DailyGatePassStats(date=day, **counters) for day, counters in days.items()
+        )
+    return len(days)
@@ -1,16 +1,22 @@
 from django.contrib.auth import authenticate
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status, permissions
+from rest_framework import status, permissions, serializers
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListCreateAPIView, get_object_or_404
 
-from .models import GatePass, Student
-from .serializers import GatePassSerializer, UserSerializer
+from .models import GatePass, Student, Notification
+from .serializers import GatePassSerializer, GatePassListSerializer, UserSerializer, gatepass_list_values
+from . import occupancy, search, returns, conditional, filters, hostels
+from .forms import GatePassFilterForm
+from .throttling import LoginIPThrottle, LoginUsernameThrottle, GatePassThrottle
 
 
 class LoginAPIView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request, *args, **kwargs):
         username = request.data.get('username')
@@ -24,16 +30,83 @@ class LoginAPIView(APIView):
         return Response({'token': token.key, 'user': user_data})
 
 
+def wants_compact(request):
+    """``?compact=1`` selects the flat, join-free list representation"""
+    return request.GET.get('compact', '').lower() in ('1', 'true', 'yes')
+
+
+def sparse_fields(request, serializer_class):
+    """``?fields=a,b`` and ``?expand=student``; returns (fields or None, expand).
+
+    Raises ValidationError naming the valid choices for unknown names.
+    """
+    def names(param):
+        if param not in request.GET:
+            return None
+        return [name.strip() for name in request.GET[param].split(',') if name.strip()]
+
+    fields, expand = names('fields'), names('expand') or []
+    valid = serializer_class.readable_fields()
+    expandable = getattr(serializer_class.Meta, 'expandable', [])
+    unknown = [name for name in (fields or []) if name not in valid] + [name for name in expand if name not in expandable]
+    if unknown:
+        raise ValidationError({
+            'detail': f"Unknown field(s): {', '.join(unknown)}",
+            'fields': valid,
+            'expand': expandable,
+        })
+    return fields, expand
+
+
+def filter_condition(request):
+    """The list filters in the query string (see filters.py) as a Q; raises ValidationError for bad values"""
+    form = GatePassFilterForm(request.GET)
+    if not form.is_valid():
+        raise ValidationError(form.errors)
+    return filters.gatepass_filter(form.cleaned_data)
+
+
 class GatePassListCreateAPIView(ListCreateAPIView):
     serializer_class = GatePassSerializer
+    throttle_classes = [GatePassThrottle]
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and wants_compact(self.request):
+            return GatePassListSerializer
+        return GatePassSerializer
 
     def get_queryset(self):
         user = self.request.user
         if hasattr(user, 'student_profile'):
             # student's own gatepasses
-            return GatePass.objects.filter(student=user.student_profile).order_by('-created_at')
-        # warden/security/superadmin: return all gatepasses
-        return GatePass.objects.all().order_by('-created_at')
+            queryset = GatePass.objects.filter(student=user.student_profile).order_by('-created_at')
+        else:
+            # warden/security/superadmin: return all gatepasses
+            queryset = GatePass.objects.all().order_by('-created_at')
+        if self.request.method == 'GET':
+            queryset = queryset.filter(filter_condition(self.request))
+        if self.request.method == 'GET' and not wants_compact(self.request):
+            fields, expand = sparse_fields(self.request, GatePassSerializer)
+            queryset = GatePassSerializer.optimize_queryset(queryset, fields, expand)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs['fields'], kwargs['expand'] = sparse_fields(self.request, self.get_serializer_class())
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        etag = conditional.api_etag(request)
+        response = conditional.not_modified(request, etag)
+        if response is not None:
+            return response
+        if wants_compact(request):
+            # Flat columns only, so rows go straight from values() to the renderer
+            fields, _ = sparse_fields(request, GatePassListSerializer)
+            response = Response(gatepass_list_values.serialize(self.filter_queryset(self.get_queryset()), fields))
+        else:
+            response = super().list(request, *args, **kwargs)
+        return conditional.tag(response, etag)
 
     def perform_create(self, serializer):
         # expect student_id in payload (PrimaryKey of Student)
@@ -57,8 +130,82 @@ class SecurityApproveAPIView(APIView):
         user = request.user
         if user.role != 'security':
             return Response({'detail': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
-        gp = get_object_or_404(GatePass, pk=pk)
-        gp.status = 'security_approved'
-        gp.security_approval = user
-        gp.save()
+        with transaction.atomic():
+            gp = get_object_or_404(GatePass.objects.select_for_update(), pk=pk)
+            gp.status = 'security_approved'
+            gp.security_approval = user
+            gp.save()
         return Response({'detail': 'Security approval recorded'})
+
+
+class BatchReturnAPIView(APIView):
+    """Record many returns at once; ``items`` is a list or newline-separated hall tickets / pass tokens"""
+
+    def post(self, request, *args, **kwargs):
+        if request.user.role != 'security':
+            return Response({'detail': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        items = returns.parse_items(request.data.get('items') or [])
+        if not items or len(items) > returns.MAX_ITEMS:
+            return Response(
+                {'detail': f'Provide "items": 1 to {returns.MAX_ITEMS} hall tickets or pass tokens'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        notes = request.data.get('return_notes') or ''
+        results = returns.record_returns(items, request.user, notes=str(notes)[:500])
+        return Response({
+            'returned': sum(row['result'] == returns.RETURNED for row in results),
+            'results': results,
+        })
+
+
+class NotificationMarkReadAPIView(APIView):
+    """Mark one notification (``pk`` in the URL), a list of ``ids`` or ``all`` as read"""
+
+    def post(self, request, pk=None, *args, **kwargs):
+        notifications = Notification.objects.filter(user=request.user)
+        # Form posts send "false"/"0" as non-empty strings, so the flag is parsed rather than tested for truth
+        mark_all = False
+        if pk is None and 'all' in request.data:
+            try:
+                mark_all = serializers.BooleanField().to_internal_value(request.data['all'])
+            except ValidationError as e:
+                return Response({'all': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        if pk is not None:
+            ids = [pk]
+        elif mark_all:
+            ids = None
+        else:
+            ids = request.data.get('ids')
+            if not isinstance(ids, list) or not ids or not all(isinstance(value, int) for value in ids):
+                return Response({'detail': 'Provide "ids" (list of integers) or "all": true'}, status=status.HTTP_400_BAD_REQUEST)
+        updated = notifications.mark_read(ids)
+        return Response({'updated': updated, 'unread': notifications.unread().count()})
+
+
+class NotificationUnreadCountAPIView(APIView):
+    def get(self, request, *args, **kwargs):
+        unread = Notification.objects.filter(user=request.user).unread().count()
+        return Response({'unread': unread})
+
+
+class OccupancyAPIView(APIView):
+    """Students currently off campus in the caller's hostel, served from the maintained counters only"""
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role not in ('security', 'warden', 'superadmin'):
+            return Response({'detail': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        return Response(occupancy.snapshot(hostels.current_hostel_id()))
+
+
+class StudentSearchAPIView(APIView):
+    """Partial-match student lookup for the gate desk"""
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role not in ('security', 'warden', 'superadmin'):
+            return Response({'detail': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 20
+        students = search.search_students(request.query_params.get('q', ''), limit=max(limit, 1))
+        return Response({'results': [search.serialize_student(student) for student in students]})
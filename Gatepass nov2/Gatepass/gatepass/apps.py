@@ -43,4 +43,6 @@ class GatepassConfig(AppConfig):
     name = 'gatepass'
 
     def ready(self):
+        from . import signals  # noqa: F401 - connects signal receivers
+        from . import tasks  # noqa: F401 - registers background job handlers
         _create_superuser_from_env()
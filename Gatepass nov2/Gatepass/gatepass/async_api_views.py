@@ -0,0 +1,196 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import authenticate
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+
+from .models import GatePass, Student, Notification
+from .api_views import wants_compact, sparse_fields, filter_condition
+from .serializers import GatePassSerializer, GatePassListSerializer, UserSerializer, gatepass_list_values
+from . import conditional, hostels, renderers, throttling
+
+
+# Async counterparts of the mobile endpoints in api_views.py. They return the
+# same payloads, but waiting on the client or the database does not hold a
+# worker thread when served by an ASGI server (see the Procfile).
+#
+# Django 4.2's csrf_exempt and require_http_methods wrap views in sync
+# functions, so CSRF exemption is set as an attribute and methods are checked
+# inline; these endpoints authenticate with tokens, never with cookies.
+
+# Long-polls re-check the database this often, for at most LONG_POLL_MAX_WAIT seconds
+LONG_POLL_INTERVAL = 1
+LONG_POLL_MAX_WAIT = 30
+
+
+def csrf_exempt(view):
+    view.csrf_exempt = True
+    return view
+
+
+def method_not_allowed(request):
+    return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+
+
+def parse_body(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+    return request.POST
+
+
+async def token_user(request):
+    """Resolve the ``Authorization: Token <key>`` header like DRF's TokenAuthentication"""
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) != 2 or parts[0].lower() != 'token':
+        return None
+    try:
+        token = await Token.objects.select_related('user').aget(key=parts[1])
+    except Token.DoesNotExist:
+        return None
+    if not token.user.is_active:
+        return None
+    # Like DRF, expose the user on the request; resolving the hostel here keeps
+    # scoped querysets built in async code from querying the profile
+    request.user = token.user
+    await sync_to_async(hostels.hostel_for_request)(request)
+    return token.user
+
+
+def not_authenticated():
+    return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+
+@csrf_exempt
+async def login(request):
+    if request.method != 'POST':
+        return method_not_allowed(request)
+    data = parse_body(request)
+    if data is None:
+        return JsonResponse({'detail': 'JSON parse error'}, status=400)
+    username = data.get('username')
+    wait = await sync_to_async(throttling.login_wait)(request, username if isinstance(username, str) else None)
+    if wait:
+        return throttling.throttled_response(wait)
+
+    user = await sync_to_async(authenticate)(
+        request, username=data.get('username'), password=data.get('password')
+    )
+    if user is None:
+        return JsonResponse({'detail': 'Invalid credentials'}, status=400)
+
+    token, created = await Token.objects.aget_or_create(user=user)
+    return JsonResponse({'token': token.key, 'user': UserSerializer(user).data})
+
+
+@csrf_exempt
+async def gatepass_list(request):
+    if request.method != 'GET':
+        return method_not_allowed(request)
+    user = await token_user(request)
+    if user is None:
+        return not_authenticated()
+    wait = await sync_to_async(throttling.consume)('gatepass', f'user:{user.pk}')
+    if wait:
+        return throttling.throttled_response(wait)
+
+    etag = await sync_to_async(conditional.api_etag)(request)
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return response
+
+    compact = wants_compact(request)
+    try:
+        fields, expand = sparse_fields(request, GatePassListSerializer if compact else GatePassSerializer)
+        condition = await sync_to_async(filter_condition)(request)
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    queryset = GatePass.objects.filter(condition).order_by('-created_at')
+    if not compact:
+        queryset = GatePassSerializer.optimize_queryset(queryset, fields, expand)
+    student = await Student.objects.filter(user=user).afirst()
+    if student is not None:
+        queryset = queryset.filter(student=student)
+    if compact:
+        data = await sync_to_async(gatepass_list_values.serialize)(queryset, fields)
+    else:
+        gatepasses = [gatepass async for gatepass in queryset]
+        data = GatePassSerializer(gatepasses, many=True, fields=fields, expand=expand).data
+    return conditional.tag(HttpResponse(renderers.dumps(data), content_type='application/json'), etag)
+
+
+@csrf_exempt
+async def warden_approve(request, pk):
+    if request.method != 'POST':
+        return method_not_allowed(request)
+    user = await token_user(request)
+    if user is None:
+        return not_authenticated()
+    if user.role != 'warden':
+        return JsonResponse({'detail': 'Not authorized'}, status=403)
+
+    try:
+        gp = await GatePass.objects.aget(pk=pk)
+    except GatePass.DoesNotExist:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    gp.status = 'warden_approved'
+    gp.warden_approval = user
+    await gp.asave()
+    return JsonResponse({'detail': 'Warden approval recorded'})
+
+
+@sync_to_async
+def _security_approve(pk, user):
+    # Row locks need a transaction, which the async ORM cannot open yet
+    with transaction.atomic():
+        gp = GatePass.objects.select_for_update().filter(pk=pk).first()
+        if gp is None:
+            return False
+        gp.status = 'security_approved'
+        gp.security_approval = user
+        gp.save()
+    return True
+
+
+@csrf_exempt
+async def security_approve(request, pk):
+    if request.method != 'POST':
+        return method_not_allowed(request)
+    user = await token_user(request)
+    if user is None:
+        return not_authenticated()
+    if user.role != 'security':
+        return JsonResponse({'detail': 'Not authorized'}, status=403)
+
+    if not await _security_approve(pk, user):
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    return JsonResponse({'detail': 'Security approval recorded'})
+
+
+@csrf_exempt
+async def notification_unread_count(request):
+    """Unread count; with ``?since=<count>&wait=<seconds>`` it long-polls until the count changes"""
+    if request.method != 'GET':
+        return method_not_allowed(request)
+    user = await token_user(request)
+    if user is None:
+        return not_authenticated()
+
+    try:
+        since = int(request.GET['since'])
+        wait = min(max(int(request.GET.get('wait', LONG_POLL_MAX_WAIT)), 0), LONG_POLL_MAX_WAIT)
+    except (KeyError, ValueError):
+        since, wait = None, 0
+    deadline = time.monotonic() + wait
+    while True:
+        unread = await Notification.objects.filter(user=user).unread().acount()
+        if unread != since or time.monotonic() >= deadline:
+            return JsonResponse({'unread': unread})
+        await asyncio.sleep(LONG_POLL_INTERVAL)
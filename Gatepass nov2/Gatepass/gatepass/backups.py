@@ -0,0 +1,202 @@
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+
+BACKUP_PREFIX = 'backup_'
+
+# Suffix per backend; PostgreSQL parallel dumps produce a directory instead of a file
+SQLITE_SUFFIX = '.sqlite3.gz'
+POSTGRES_SUFFIX = '.dump'
+POSTGRES_DIR_SUFFIX = '.dumpdir'
+
+# Pages copied per step of the SQLite online backup, so writers are never blocked for long
+SQLITE_BACKUP_PAGES = 1024
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Raised when a backup or restore cannot be completed"""
+
+
+def database_vendor(db_settings):
+    engine = db_settings['ENGINE']
+    if engine.endswith('sqlite3'):
+        return 'sqlite'
+    if 'postgresql' in engine or 'postgis' in engine:
+        return 'postgresql'
+    raise BackupError(f'Unsupported database engine: {engine}')
+
+
+def default_backup_dir():
+    return Path(settings.GATEPASS_BACKUP_DIR)
+
+
+def backup_path(backup_dir, vendor, jobs=1):
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    if vendor == 'sqlite':
+        suffix = SQLITE_SUFFIX
+    elif jobs > 1:
+        suffix = POSTGRES_DIR_SUFFIX
+    else:
+        suffix = POSTGRES_SUFFIX
+    return Path(backup_dir) / f'{BACKUP_PREFIX}{timestamp}{suffix}'
+
+
+def list_backups(backup_dir):
+    """Existing backups, newest first"""
+    backup_dir = Path(backup_dir)
+    if not backup_dir.exists():
+        return []
+    backups = [
+        path for path in backup_dir.iterdir()
+        if path.name.startswith(BACKUP_PREFIX)
+        and path.name.endswith((SQLITE_SUFFIX, POSTGRES_SUFFIX, POSTGRES_DIR_SUFFIX))
+    ]
+    return sorted(backups, key=lambda path: path.name, reverse=True)
+
+
+def rotate_backups(backup_dir, keep):
+    """Delete all but the ``keep`` newest backups; returns the removed paths"""
+    if keep < 1:
+        # keep=0 would also delete the backup that was just written
+        raise ValueError(f'keep must be at least 1, got {keep}')
+    removed = list_backups(backup_dir)[keep:]
+    for path in removed:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    return removed
+
+
+def backup_size(path):
+    path = Path(path)
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.rglob('*') if child.is_file())
+    return path.stat().st_size
+
+
+def backup_database(db_settings, destination, jobs=1, compress_level=6):
+    vendor = database_vendor(db_settings)
+    if vendor == 'sqlite':
+        backup_sqlite(db_settings['NAME'], destination, compress_level)
+    else:
+        backup_postgres(db_settings, destination, jobs, compress_level)
+
+
+def restore_database(db_settings, source, jobs=1):
+    vendor = database_vendor(db_settings)
+    if vendor == 'sqlite':
+        restore_sqlite(source, db_settings['NAME'])
+    else:
+        restore_postgres(db_settings, source, jobs)
+
+
+def backup_sqlite(database_name, destination, compress_level=6):
+    """Snapshot a live SQLite database with the online backup API and gzip it.
+
+    The snapshot is written to a temporary file next to the destination and
+    then streamed through gzip, so memory use does not grow with the database.
+    """
+    destination = Path(destination)
+    fd, snapshot_path = tempfile.mkstemp(dir=destination.parent, suffix='.sqlite3')
+    os.close(fd)
+    try:
+        source = sqlite3.connect(database_name)
+        snapshot = sqlite3.connect(snapshot_path)
+        try:
+            with snapshot:
+                source.backup(snapshot, pages=SQLITE_BACKUP_PAGES)
+        finally:
+            snapshot.close()
+            source.close()
+
+        partial = destination.with_name(destination.name + '.part')
+        with open(snapshot_path, 'rb') as src, gzip.open(partial, 'wb', compresslevel=compress_level) as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        partial.replace(destination)
+    except (OSError, sqlite3.DatabaseError) as e:
+        raise BackupError(f'Failed to back up {database_name}: {e}') from e
+    finally:
+        os.unlink(snapshot_path)
+
+
+def restore_sqlite(source, database_name):
+    """Decompress a backup and copy it over the live database with the backup API"""
+    source = Path(source)
+    fd, snapshot_path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(fd)
+    try:
+        with gzip.open(source, 'rb') as src, open(snapshot_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+        snapshot = sqlite3.connect(snapshot_path)
+        target = sqlite3.connect(database_name)
+        try:
+            with target:
+                snapshot.backup(target, pages=SQLITE_BACKUP_PAGES)
+        finally:
+            target.close()
+            snapshot.close()
+    except (OSError, sqlite3.DatabaseError) as e:
+        raise BackupError(f'Failed to restore {source}: {e}') from e
+    finally:
+        os.unlink(snapshot_path)
+
+
+def _postgres_args(db_settings):
+    args = []
+    if db_settings.get('HOST'):
+        args += ['-h', db_settings['HOST']]
+    if db_settings.get('PORT'):
+        args += ['-p', str(db_settings['PORT'])]
+    if db_settings.get('USER'):
+        args += ['-U', db_settings['USER']]
+    return args
+
+
+def _postgres_env(db_settings):
+    env = dict(os.environ)
+    if db_settings.get('PASSWORD'):
+        env['PGPASSWORD'] = db_settings['PASSWORD']
+    return env
+
+
+def _run(cmd, env):
+    try:
+        subprocess.run(cmd, env=env, check=True)
+    except FileNotFoundError as e:
+        raise BackupError(f'{cmd[0]} is not installed or not on PATH') from e
+    except subprocess.CalledProcessError as e:
+        raise BackupError(f'{cmd[0]} failed: {e}') from e
+
+
+def backup_postgres(db_settings, destination, jobs=1, compress_level=6):
+    """Dump with pg_dump's compressed custom format, or directory format for parallel jobs"""
+    cmd = ['pg_dump', *_postgres_args(db_settings), '-Z', str(compress_level), '-f', str(destination)]
+    if jobs > 1:
+        cmd += ['-Fd', '-j', str(jobs)]
+    else:
+        cmd += ['-Fc']
+    cmd.append(db_settings['NAME'])
+    _run(cmd, _postgres_env(db_settings))
+
+
+def restore_postgres(db_settings, source, jobs=1):
+    cmd = [
+        'pg_restore', *_postgres_args(db_settings),
+        '--clean', '--if-exists', '--no-owner',
+        '-j', str(jobs),
+        '-d', db_settings['NAME'],
+        str(source),
+    ]
+    _run(cmd, _postgres_env(db_settings))
@@ -0,0 +1,103 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from . import hostels
+from .models import (
+    ChangeMarker, ALL_GATEPASSES_SCOPE, NOTIFICATIONS_SCOPE, USERS_SCOPE, gatepasses_scope, notifications_scope,
+)
+
+
+# ETags are hashed from the ChangeMarker versions of the data a response shows,
+# so a repeat poll costs one small query instead of rebuilding the page. What a
+# page shows also depends on the viewer, their hostel, the query string and the
+# CSRF cookie embedded in its forms, and on the clock (overdue badges appear
+# without any write), so those go into the hash too; the time bucket bounds how
+# long a 304 can hide a purely time-based change.
+
+
+def gatepass_scope(request):
+    """The viewer's hostel's gatepasses; superadmins and users without a hostel see every hostel"""
+    hostel_id = hostels.hostel_for_request(request)
+    return gatepasses_scope(hostel_id) if hostel_id is not None else ALL_GATEPASSES_SCOPE
+
+
+def page_scopes(request):
+    """Gatepass lists plus the viewer's notification menu"""
+    return [gatepass_scope(request), notifications_scope(request.user.pk)]
+
+
+def superadmin_scopes(request):
+    return page_scopes(request) + [NOTIFICATIONS_SCOPE, USERS_SCOPE]
+
+
+def api_scopes(request):
+    return [gatepass_scope(request)]
+
+
+def api_etag(request):
+    """ETag of the gatepass list API (DRF and async views share it)"""
+    return compute_etag(request, 'gatepass_list', api_scopes(request))
+
+
+def time_bucket(now=None):
+    max_age = settings.GATEPASS_ETAG_MAX_AGE
+    if not max_age:
+        return 0
+    return int((time.time() if now is None else now) // max_age)
+
+
+def compute_etag(request, key, scopes):
+    """ETag for ``key`` as seen by this request, or None when the response must be rebuilt"""
+    if not settings.GATEPASS_CONDITIONAL_GET or request.method not in ('GET', 'HEAD'):
+        return None
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    # A 304 would leave queued flash messages unrendered until the next change
+    if len(get_messages(request)):
+        return None
+    versions = ChangeMarker.versions(*scopes)
+    parts = [
+        key, user.pk, user.role, user.is_approved, hostels.hostel_for_request(request),
+        request.META.get('QUERY_STRING', ''), request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        time_bucket(),
+    ] + [f'{scope}={versions[scope]}' for scope in sorted(versions)]
+    return quote_etag(hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest())
+
+
+def not_modified(request, etag):
+    """A 304 response if the client already holds ``etag``, else None"""
+    if etag is None:
+        return None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        tag(response, etag)
+    return response
+
+
+def tag(response, etag):
+    """Attach ``etag`` to a successful response; clients must revalidate before reuse"""
+    if etag is not None and response.status_code in (200, 304):
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(scopes=page_scopes):
+    """Answer repeat GETs with 304 Not Modified while the page's change markers are unchanged"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag = compute_etag(request, view.__name__, scopes(request))
+            response = not_modified(request, etag)
+            if response is None:
+                response = tag(view(request, *args, **kwargs), etag)
+            return response
+        return wrapper
+    return decorator
@@ -4,7 +4,9 @@ from .models import Notification
 def notifications_context(request):
     """Add notifications to global template context"""
     if request.user.is_authenticated:
-        notifications = Notification.objects.filter(user=request.user).order_by('-created_at')[:12]
-        return {'notifications': notifications}
-    return {'notifications': []}
+        user_notifications = Notification.objects.filter(user=request.user)
+        notifications = user_notifications.order_by('-created_at')[:12]
+        unread_count = user_notifications.unread().count()
+        return {'notifications': notifications, 'unread_notifications_count': unread_count}
+    return {'notifications': [], 'unread_notifications_count': 0}
 
@@ -0,0 +1,165 @@
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import User, GatePass, Notification, bump_notification_markers
+
+
+OUT_STATUS = 'security_approved'
+
+OVERDUE = 'overdue'
+REMINDER = 'reminder'
+
+# While a student stays out past the deadline, the overdue alert is repeated this often
+OVERDUE_REPEAT = timedelta(days=1)
+
+# refresh() looks this far behind its cursor so clock skew between app servers cannot hide a save
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def reminder_lead():
+    return timedelta(minutes=settings.GATEPASS_RETURN_REMINDER_MINUTES)
+
+
+def notify_overdue(gatepass):
+    """Alert the warden, a super admin and the student; at most once per pass per day"""
+    if Notification.objects.filter(
+        gatepass=gatepass,
+        notification_type='overdue_return',
+        created_at__date=timezone.localdate()
+    ).exists():
+        return False
+
+    expected = f"{gatepass.expected_return_date} {gatepass.expected_return_time}"
+    notifications = []
+    if gatepass.warden_approval:
+        notifications.append(Notification(
+            user=gatepass.warden_approval,
+            gatepass=gatepass,
+            notification_type='overdue_return',
+            message=f"URGENT: Student {gatepass.student_name} has not returned after expected return {expected}. Parent contact: {gatepass.parent_mobile}"
+        ))
+    superadmin = User.objects.filter(role='superadmin').first()
+    if superadmin:
+        notifications.append(Notification(
+            user=superadmin,
+            gatepass=gatepass,
+            notification_type='overdue_return',
+            message=f"URGENT: Student {gatepass.student_name} (Hall Ticket: {gatepass.hall_ticket_no}) has not returned after expected return {expected}. Parent contact: {gatepass.parent_mobile}"
+        ))
+    notifications.append(Notification(
+        user=gatepass.student.user,
+        gatepass=gatepass,
+        notification_type='overdue_return',
+        message=f"URGENT: You have not returned to the hostel after your expected return {expected}. Please contact the hostel immediately."
+    ))
+    Notification.objects.bulk_create(notifications)
+    bump_notification_markers(notification.user_id for notification in notifications)
+    return True
+
+
+def notify_return_reminder(gatepass):
+    """Remind the student that their return is due soon; once per pass"""
+    if Notification.objects.filter(gatepass=gatepass, notification_type='return_reminder').exists():
+        return False
+    minutes = round((gatepass.expected_return_at - timezone.now()).total_seconds() / 60)
+    Notification.objects.create(
+        user=gatepass.student.user,
+        gatepass=gatepass,
+        notification_type='return_reminder',
+        message=f"Reminder: your return to the hostel is due in {max(minutes, 0)} minutes ({gatepass.expected_return_date} {gatepass.expected_return_time})."
+    )
+    return True
+
+
+def overdue_gatepasses(now=None):
+    return GatePass.objects.filter(
+        status=OUT_STATUS, expected_return_at__lt=now or timezone.now()
+    ).select_related('warden_approval', 'student__user')
+
+
+def notify_overdue_passes():
+    """Full scan used when the scheduler is not running; returns passes alerted"""
+    return sum(notify_overdue(gatepass) for gatepass in overdue_gatepasses())
+
+
+class DeadlineScheduler:
+    """Fires overdue alerts and return reminders at their exact times.
+
+    Upcoming events live in a min-heap ordered by due time. The heap is built
+    from the database on start, and ``refresh()`` adds events for gatepasses
+    saved since the last refresh (an indexed ``updated_at`` range query), so
+    the work done is proportional to the number of transitions and events.
+    Entries are never removed from the heap; an event is re-validated against
+    the current row when it comes due and dropped if it no longer applies.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.cursor = None
+        # gatepass id -> expected_return_at already in the heap, so repeated saves are not queued twice
+        self.scheduled = {}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, when, kind, gatepass_id, expected_return_at):
+        heapq.heappush(self.heap, (when, kind, gatepass_id, expected_return_at))
+
+    def schedule(self, gatepass_id, expected_return_at, now):
+        if self.scheduled.get(gatepass_id) == expected_return_at:
+            return False
+        self.scheduled[gatepass_id] = expected_return_at
+        reminder_at = expected_return_at - reminder_lead()
+        if reminder_at > now:
+            self.push(reminder_at, REMINDER, gatepass_id, expected_return_at)
+        self.push(max(expected_return_at, now), OVERDUE, gatepass_id, expected_return_at)
+        return True
+
+    def load(self, now=None):
+        """Rebuild the heap from every gatepass that is currently out"""
+        now = now or timezone.now()
+        self.heap = []
+        self.scheduled = {}
+        self.cursor = now
+        rows = GatePass.objects.filter(
+            status=OUT_STATUS, expected_return_at__isnull=False
+        ).values_list('id', 'expected_return_at')
+        for gatepass_id, expected_return_at in rows.iterator():
+            self.schedule(gatepass_id, expected_return_at, now)
+        return len(self.heap)
+
+    def refresh(self, now=None):
+        """Schedule gatepasses that were saved since the last load or refresh"""
+        now = now or timezone.now()
+        rows = GatePass.objects.filter(
+            updated_at__gte=self.cursor - REFRESH_OVERLAP, status=OUT_STATUS, expected_return_at__isnull=False
+        ).values_list('id', 'expected_return_at')
+        self.cursor = now
+        return sum(self.schedule(gatepass_id, expected_return_at, now) for gatepass_id, expected_return_at in rows)
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def run_due(self, now=None):
+        """Fire every event due by ``now``; returns the number of alerts sent"""
+        now = now or timezone.now()
+        sent = 0
+        while self.heap and self.heap[0][0] <= now:
+            when, kind, gatepass_id, expected_return_at = heapq.heappop(self.heap)
+            gatepass = GatePass.objects.select_related('warden_approval', 'student__user').filter(
+                pk=gatepass_id, status=OUT_STATUS, expected_return_at=expected_return_at
+            ).first()
+            if gatepass is None:
+                # Returned, rescheduled or archived since the event was queued
+                if self.scheduled.get(gatepass_id) == expected_return_at:
+                    del self.scheduled[gatepass_id]
+                continue
+            if kind == REMINDER:
+                sent += notify_return_reminder(gatepass)
+            else:
+                sent += notify_overdue(gatepass)
+                self.push(when + OVERDUE_REPEAT, OVERDUE, gatepass_id, expected_return_at)
+        return sent
@@ -0,0 +1,111 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import GatePass, ArchivedGatePass
+
+
+# (column header, ORM lookup) pairs exported for every gatepass row
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('hall_ticket_no', 'hall_ticket_no'),
+    ('student_name', 'student_name'),
+    ('room_no', 'room_no'),
+    ('status', 'status'),
+    ('outing_date', 'outing_date'),
+    ('outing_time', 'outing_time'),
+    ('expected_return_date', 'expected_return_date'),
+    ('expected_return_time', 'expected_return_time'),
+    ('purpose', 'purpose'),
+    ('parent_verification', 'parent_verification'),
+    ('warden_approval', 'warden_approval__username'),
+    ('warden_rejection_reason', 'warden_rejection_reason'),
+    ('security_approval', 'security_approval__username'),
+    ('actual_return_date', 'actual_return_date'),
+    ('actual_return_time', 'actual_return_time'),
+    ('return_verified_by', 'return_verified_by__username'),
+    ('return_notes', 'return_notes'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Lines handed to the ASGI server per message when streaming asynchronously
+ASYNC_CHUNK_LINES = 500
+
+
+class Echo:
+    """File-like object that hands back whatever is written to it"""
+
+    def write(self, value):
+        return value
+
+
+def filter_gatepasses(queryset, statuses=None, from_date=None, to_date=None):
+    """Apply the export status and outing date filters to a gatepass queryset"""
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    if from_date:
+        queryset = queryset.filter(outing_date__gte=from_date)
+    if to_date:
+        queryset = queryset.filter(outing_date__lte=to_date)
+    return queryset
+
+
+def export_rows(statuses=None, from_date=None, to_date=None, chunk_size=DEFAULT_CHUNK_SIZE, include_archive=True):
+    """Yield one tuple per gatepass without building model instances.
+
+    Rows are fetched in chunks through ``iterator()`` so memory use stays
+    constant regardless of how many gatepasses match. Archived gatepasses
+    share the same columns and are streamed after the live ones.
+    """
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    models = [GatePass, ArchivedGatePass] if include_archive else [GatePass]
+    for model in models:
+        queryset = filter_gatepasses(model.objects.all(), statuses, from_date, to_date)
+        queryset = queryset.order_by('id').values_list(*lookups)
+        yield from queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_csv(rows):
+    """Render rows as CSV lines, header first"""
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_jsonl(rows):
+    """Render rows as JSON Lines, one object per gatepass"""
+    headers = [header for header, _ in EXPORT_COLUMNS]
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def render_export(export_format, rows):
+    """Return a line iterator for the requested export format"""
+    if export_format == 'jsonl':
+        return iter_jsonl(rows)
+    return iter_csv(rows)
+
+
+async def aiter_lines(lines, chunk_size=None):
+    """Async version of a render_export iterator for responses served over ASGI.
+
+    Django's ASGI handler buffers a synchronous streaming iterator in full
+    before sending anything, so under ASGI the export pulls ``chunk_size``
+    lines at a time in the sync thread and sends each chunk as it is ready.
+    """
+    chunk_size = chunk_size or ASYNC_CHUNK_LINES
+    next_chunk = sync_to_async(lambda: list(islice(lines, chunk_size)))
+    while True:
+        chunk = await next_chunk()
+        if not chunk:
+            return
+        yield ''.join(chunk)
@@ -0,0 +1,68 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from . import search
+from .models import normalize_hall_ticket
+
+
+OUT_STATUS = 'security_approved'
+
+# Free-text search narrows the list to at most this many best-matching students
+TEXT_SEARCH_STUDENTS = search.MAX_RESULTS
+
+
+# Filters for gatepass lists, shared by the warden dashboard and the gatepass
+# API and validated by forms.GatePassFilterForm. Every criterion is a sargable
+# predicate on a GatePass column so the planner can use the composite indexes
+# on GatePass (hostel/status/created_at, status/outing_date, status/
+# expected_return_at, gender/status/created_at, room/created_at, hall ticket);
+# free text goes through the student search index and becomes an IN list.
+
+
+def prefix_range(prefix):
+    """Half-open range of strings starting with ``prefix``, usable by a plain B-tree index"""
+    return prefix, prefix[:-1] + chr(min(ord(prefix[-1]) + 1, 0x10FFFF))
+
+
+def gatepass_filter(data, now=None):
+    """Compile cleaned filter values into a Q for GatePass (or ArchivedGatePass)"""
+    condition = Q()
+    if data.get('status'):
+        condition &= Q(status__in=data['status'])
+    if data.get('overdue'):
+        condition &= Q(status=OUT_STATUS, expected_return_at__lt=now or timezone.now())
+    if data.get('from_date'):
+        condition &= Q(outing_date__gte=data['from_date'])
+    if data.get('to_date'):
+        condition &= Q(outing_date__lte=data['to_date'])
+    if data.get('return_from'):
+        condition &= Q(expected_return_date__gte=data['return_from'])
+    if data.get('return_to'):
+        condition &= Q(expected_return_date__lte=data['return_to'])
+    if data.get('room'):
+        condition &= Q(room_no=data['room'].strip())
+    if data.get('hall_ticket'):
+        # Students' tickets are normalised on save and copied onto their passes, so the prefix is
+        # normalised the same way; the range lets the index seek, startswith keeps it exact
+        prefix = normalize_hall_ticket(data['hall_ticket'])
+        low, high = prefix_range(prefix)
+        condition &= Q(hall_ticket_no__gte=low, hall_ticket_no__lt=high, hall_ticket_no__startswith=prefix)
+    if data.get('gender'):
+        condition &= Q(student_gender=data['gender'])
+    approver = data.get('approver')
+    if approver is not None:
+        if approver.role == 'security':
+            condition &= Q(security_approval=approver)
+        else:
+            condition &= Q(warden_approval=approver)
+    if data.get('q'):
+        condition &= Q(student_id__in=search.ranked_student_ids(data['q'], TEXT_SEARCH_STUDENTS))
+    return condition
+
+
+def apply(queryset, data, now=None):
+    return queryset.filter(gatepass_filter(data, now))
+
+
+def is_filtered(data):
+    return any(value not in (None, '', [], False) for value in data.values())
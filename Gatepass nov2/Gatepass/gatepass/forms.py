@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.core.exceptions import ValidationError
-from .models import User, Student, GatePass, ParentVerification
+from .models import User, Student, GatePass, ParentVerification, normalize_hall_ticket
 from django.utils import timezone
 from datetime import datetime, date
 
@@ -66,8 +66,8 @@ class StudentRegistrationForm(forms.ModelForm):
         return cleaned_data
     
     def clean_hall_ticket_no(self):
-        hall_ticket_no = self.cleaned_data.get('hall_ticket_no')
-        if Student.objects.filter(hall_ticket_no=hall_ticket_no).exists():
+        hall_ticket_no = normalize_hall_ticket(self.cleaned_data.get('hall_ticket_no'))
+        if Student.all_hostels.filter(hall_ticket_no=hall_ticket_no).exists():
             raise ValidationError("Student with this hall ticket number already exists")
         return hall_ticket_no
     
@@ -296,40 +296,161 @@ class SecurityReturnForm(forms.ModelForm):
             self.fields['actual_return_date'].initial = timezone.now().date()
 
 
+class BatchReturnForm(forms.Form):
+    """Rapid return entry: one hall ticket or pass token per line"""
+    
+    items = forms.CharField(
+        widget=forms.Textarea(attrs={
+            'class': 'form-control font-monospace', 'rows': 10, 'autofocus': True,
+            'placeholder': 'Scan or type hall tickets / GP-<id> tokens, one per line',
+        }),
+        label='Hall tickets or pass tokens'
+    )
+    return_notes = forms.CharField(
+        required=False,
+        max_length=500,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Optional note for every return'}),
+    )
+    
+    def clean_items(self):
+        from .returns import parse_items, MAX_ITEMS
+        items = parse_items(self.cleaned_data['items'])
+        if not items:
+            raise forms.ValidationError('Enter at least one hall ticket or pass token.')
+        if len(items) > MAX_ITEMS:
+            raise forms.ValidationError(f'Record at most {MAX_ITEMS} returns at a time.')
+        return items
+
+
+
+class CommaSeparatedMultipleChoiceField(forms.MultipleChoiceField):
+    """Accepts repeated parameters and comma-separated lists (``?status=pending,returned``)"""
+    
+    def to_python(self, value):
+        values = super().to_python(value)
+        return [part.strip() for item in values for part in item.split(',') if part.strip()]
+
 
-class WardenDateFilterForm(forms.Form):
-    """Warden date filter form"""
+class GatePassFilterForm(forms.Form):
+    """Gatepass list filters shared by the warden dashboard and the gatepass API (see filters.py)"""
     
+    status = CommaSeparatedMultipleChoiceField(
+        required=False,
+        choices=GatePass.STATUS_CHOICES,
+        widget=forms.SelectMultiple(attrs={'class': 'form-select'}),
+        label='Status'
+    )
     from_date = forms.DateField(
         required=False,
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-        label='From Date'
+        label='Outing From'
     )
     to_date = forms.DateField(
         required=False,
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
-        label='To Date'
+        label='Outing To'
     )
-    status_filter = forms.ChoiceField(
+    return_from = forms.DateField(
         required=False,
-        choices=[
-            ('', 'All Status'),
-            ('pending', 'Pending'),
-            ('warden_approved', 'Warden Approved'),
-            ('security_approved', 'Students Out'),
-            ('returned', 'Returned'),
-            ('warden_rejected', 'Rejected'),
-        ],
-        widget=forms.Select(attrs={'class': 'form-control'}),
-        label='Status Filter'
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Return From'
     )
+    return_to = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='Return To'
+    )
+    room = forms.CharField(
+        required=False,
+        max_length=10,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., 101'}),
+        label='Room'
+    )
+    hall_ticket = forms.CharField(
+        required=False,
+        max_length=20,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., 22BH1A'}),
+        label='Hall Ticket Starts With'
+    )
+    gender = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Any Gender')] + User.GENDER_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Gender'
+    )
+    approver = forms.ModelChoiceField(
+        required=False,
+        queryset=User.objects.filter(role__in=['warden', 'security']),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Approved By'
+    )
+    overdue = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        label='Overdue only'
+    )
+    q = forms.CharField(
+        required=False,
+        max_length=100,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Name, hall ticket, room or parent mobile'}),
+        label='Search'
+    )
+    
+    def __init__(self, data=None, *args, **kwargs):
+        # Dashboard links from before multi-status filtering used ?status_filter=
+        if data is not None and 'status_filter' in data and 'status' not in data:
+            data = data.copy()
+            data.setlist('status', data.getlist('status_filter'))
+        super().__init__(data, *args, **kwargs)
     
+    def clean(self):
+        cleaned_data = super().clean()
+        for start, end, label in (('from_date', 'to_date', 'From date'), ('return_from', 'return_to', 'Return from date')):
+            if cleaned_data.get(start) and cleaned_data.get(end) and cleaned_data[start] > cleaned_data[end]:
+                raise ValidationError(f"{label} cannot be after the end date")
+        return cleaned_data
+
+
+class GatePassExportForm(forms.Form):
+    """Gatepass history export filter form"""
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+
+    format = forms.ChoiceField(
+        required=False,
+        choices=FORMAT_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Format'
+    )
+    status = forms.MultipleChoiceField(
+        required=False,
+        choices=GatePass.STATUS_CHOICES,
+        widget=forms.SelectMultiple(attrs={'class': 'form-select'}),
+        label='Status'
+    )
+    from_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='From Date'
+    )
+    to_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+        label='To Date'
+    )
+
     def clean(self):
         cleaned_data = super().clean()
         from_date = cleaned_data.get('from_date')
         to_date = cleaned_data.get('to_date')
-        
+
         if from_date and to_date and from_date > to_date:
             raise ValidationError("From date cannot be after to date")
-        
+
+        if not cleaned_data.get('format'):
+            cleaned_data['format'] = 'csv'
+
         return cleaned_data
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Hostel scoping: while a scope is active, the default managers of hostel-owned
+# models (GatePass, Student) only return that hostel's rows. The middleware
+# scopes each request to the signed-in user's hostel; superadmins, users
+# without a hostel, management commands and background jobs are unscoped.
+# Use ``Model.all_hostels`` to read across hostels on purpose.
+
+# Holds a zero-argument callable returning the hostel id, so a request's hostel
+# is only looked up once a scoped query actually runs (DRF and the async API
+# authenticate inside the view, after the middleware has run).
+_scope = ContextVar('gatepass_hostel_scope', default=None)
+
+PROFILE_BY_ROLE = {
+    'student': 'student_profile',
+    'warden': 'warden_profile',
+    'security': 'security_profile',
+}
+
+
+def hostel_for_user(user):
+    """Hostel id of a student, warden or guard; None for everyone else"""
+    if user is None or not user.is_authenticated:
+        return None
+    profile = getattr(user, PROFILE_BY_ROLE.get(user.role, ''), None)
+    return profile.hostel_id if profile is not None else None
+
+
+def hostel_for_request(request):
+    user = getattr(request, 'user', None)
+    key = getattr(user, 'pk', None)
+    cached = getattr(request, '_gatepass_hostel', None)
+    if cached is None or cached[0] != key:
+        cached = request._gatepass_hostel = (key, hostel_for_user(user))
+    return cached[1]
+
+
+def hostel_staff(users, role, hostel_id):
+    """Narrow ``users`` of ``role`` to those assigned to the hostel, if it has any"""
+    if hostel_id is None:
+        return users
+    assigned = users.filter(**{f'{PROFILE_BY_ROLE[role]}__hostel_id': hostel_id})
+    return assigned if assigned.exists() else users
+
+
+def current_hostel_id():
+    resolve = _scope.get()
+    return resolve() if resolve is not None else None
+
+
+@contextmanager
+def hostel_scope(hostel_id):
+    """Scope queries to ``hostel_id`` (None lifts the scope) for the duration of the block"""
+    token = _scope.set(lambda: hostel_id)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+@contextmanager
+def request_scope(request):
+    token = _scope.set(lambda: hostel_for_request(request))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
@@ -0,0 +1,138 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .outbox import backoff
+
+
+logger = logging.getLogger(__name__)
+
+# name -> callable, filled by the @job decorator (see gatepass/tasks.py)
+registry = {}
+
+# A running job whose worker has not finished it within this long is assumed
+# dead and queued again
+STALE_AFTER = timedelta(minutes=10)
+
+# SQLite fails concurrent writes with "database table is locked" instead of
+# waiting, so worker writes are retried a few times with a short backoff
+LOCKED_RETRIES = 5
+LOCKED_MESSAGES = ('database is locked', 'database table is locked')
+
+
+def job(name):
+    """Register a function as a background job handler"""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, unique=False, run_at=None, max_attempts=None, **payload):
+    """Queue a job; with ``unique`` an identical job that is still queued is reused"""
+    if name not in registry:
+        raise KeyError(f'Unknown job: {name}')
+    if unique:
+        existing = Job.objects.filter(name=name, payload=payload, status='queued').first()
+        if existing:
+            return existing
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.GATEPASS_JOBS_MAX_ATTEMPTS,
+    )
+
+
+def dispatch(name, unique=False, **payload):
+    """Run a job now, or queue it for run_workers when GATEPASS_JOBS_INLINE is off"""
+    if settings.GATEPASS_JOBS_INLINE:
+        return registry[name](**payload)
+    return enqueue(name, unique=unique, **payload)
+
+
+def is_locked(error):
+    return any(message in str(error) for message in LOCKED_MESSAGES)
+
+
+def retry_locked(func):
+    """Call ``func``, retrying only when SQLite reports a lock; other errors surface at once"""
+    for attempt in range(LOCKED_RETRIES):
+        try:
+            return func()
+        except OperationalError as e:
+            if not is_locked(e) or attempt == LOCKED_RETRIES - 1:
+                raise
+            time.sleep(0.05 * 2 ** attempt)
+
+
+def claim_job(worker_id, now=None):
+    """Lock the next due job for ``worker_id``; returns None when nothing is due.
+
+    PostgreSQL hands concurrent workers different rows via SKIP LOCKED. SQLite
+    has no row locks, so a candidate is claimed with a conditional UPDATE and
+    the next one is tried if another worker won the race.
+    """
+    return retry_locked(lambda: _claim_job(worker_id, now))
+
+
+def _claim_job(worker_id, now=None):
+    now = now or timezone.now()
+    due = Job.objects.filter(status='queued', run_at__lte=now).order_by('run_at', 'id')
+    claim = {'status': 'running', 'locked_at': now, 'locked_by': worker_id, 'attempts': F('attempts') + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job_id = due.select_for_update(skip_locked=True).values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            Job.objects.filter(id=job_id).update(**claim)
+    else:
+        while True:
+            job_id = due.values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            if Job.objects.filter(id=job_id, status='queued').update(**claim):
+                break
+    return Job.objects.get(id=job_id)
+
+
+def run_job(job):
+    """Run a claimed job and record the outcome; returns True on success"""
+    started = time.monotonic()
+    try:
+        handler = registry[job.name]
+        handler(**job.payload)
+    except Exception as e:
+        job.duration_ms = round((time.monotonic() - started) * 1000)
+        job.last_error = f'{type(e).__name__}: {e}'[:1000]
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+        else:
+            job.status = 'queued'
+            job.run_at = timezone.now() + backoff(job.attempts)
+        logger.warning('Job %s #%s failed (attempt %s/%s): %s', job.name, job.pk, job.attempts, job.max_attempts, e)
+        retry_locked(lambda: job.save(update_fields=['status', 'run_at', 'last_error', 'duration_ms', 'finished_at']))
+        return False
+
+    job.duration_ms = round((time.monotonic() - started) * 1000)
+    job.status = 'done'
+    job.finished_at = timezone.now()
+    job.last_error = ''
+    retry_locked(lambda: job.save(update_fields=['status', 'last_error', 'duration_ms', 'finished_at']))
+    return True
+
+
+def requeue_stale(now=None, stale_after=STALE_AFTER):
+    """Give jobs left running by a crashed worker back to the queue"""
+    now = now or timezone.now()
+    return Job.objects.filter(status='running', locked_at__lt=now - stale_after).update(
+        status='queued', run_at=now, locked_by=''
+    )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import time
+
+from gatepass import retention
+
+
+class Command(BaseCommand):
+    help = 'Move finished gatepasses and their verifications/notifications into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.GATEPASS_ARCHIVE_AFTER_DAYS,
+            help='Archive gatepasses last updated more than this many days ago',
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.GATEPASS_ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many gatepasses would be archived')
+
+    def handle(self, *args, **kwargs):
+        cutoff = retention.archive_cutoff(kwargs['days'])
+
+        if kwargs['dry_run']:
+            count = retention.archivable_gatepasses(cutoff).count()
+            self.stdout.write(f'{count} gatepasses last updated before {cutoff:%Y-%m-%d %H:%M} would be archived')
+            return
+
+        total = 0
+        batches = 0
+        started = time.monotonic()
+        while kwargs['max_batches'] is None or batches < kwargs['max_batches']:
+            archived = retention.archive_batch(cutoff, kwargs['batch_size'])
+            if not archived:
+                break
+            total += archived
+            batches += 1
+            self.stdout.write(f'Batch {batches}: archived {archived} gatepasses')
+            if kwargs['sleep']:
+                time.sleep(kwargs['sleep'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {total} gatepasses in {batches} batches ({elapsed:.1f}s)')
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+import time
+
+from gatepass import analytics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily gatepass rollup table from live and archived gatepasses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **kwargs):
+        started = time.monotonic()
+        days = analytics.rebuild_daily_stats(chunk_size=kwargs['chunk_size'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt daily gatepass stats for {days} days in {elapsed:.1f}s')
+        )
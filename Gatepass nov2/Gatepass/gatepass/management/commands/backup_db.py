@@ -1,38 +1,42 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 import os
-import datetime
-import subprocess
+import time
+
+from gatepass import backups
+
 
 class Command(BaseCommand):
-    help = 'Backup PostgreSQL database'
+    help = 'Backup the database (SQLite online backup or compressed pg_dump) and rotate old backups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', default=None, help='Directory for backups (default: GATEPASS_BACKUP_DIR)')
+        parser.add_argument('--keep', type=int, default=settings.GATEPASS_BACKUP_KEEP, help='Number of backups to keep')
+        parser.add_argument('--jobs', type=int, default=1, help='Parallel pg_dump jobs (PostgreSQL only)')
+        parser.add_argument('--compress-level', type=int, default=6, choices=range(0, 10))
+        parser.add_argument('--database', default='default')
 
     def handle(self, *args, **kwargs):
-        backup_dir = 'backups'
+        if kwargs['keep'] < 1:
+            raise CommandError('--keep must be at least 1')
+        db_settings = settings.DATABASES[kwargs['database']]
+        backup_dir = kwargs['output_dir'] or backups.default_backup_dir()
         if not os.path.exists(backup_dir):
             os.makedirs(backup_dir)
         
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = os.path.join(backup_dir, f'backup_{timestamp}.sql')
-        
-        db_settings = settings.DATABASES['default']
-        env = dict(os.environ)
-        env['PGPASSWORD'] = db_settings['PASSWORD']
+        try:
+            vendor = backups.database_vendor(db_settings)
+            backup_file = backups.backup_path(backup_dir, vendor, kwargs['jobs'])
+            started = time.monotonic()
+            backups.backup_database(db_settings, backup_file, kwargs['jobs'], kwargs['compress_level'])
+        except backups.BackupError as e:
+            raise CommandError(f'Failed to backup database: {e}')
+        elapsed = time.monotonic() - started
+        size_mb = backups.backup_size(backup_file) / (1024 * 1024)
         
-        cmd = [
-            'pg_dump',
-            '-h', db_settings['HOST'],
-            '-U', db_settings['USER'],
-            '-d', db_settings['NAME'],
-            '-f', backup_file
-        ]
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully backed up database to {backup_file} ({size_mb:.1f} MB in {elapsed:.1f}s)')
+        )
         
-        try:
-            subprocess.run(cmd, env=env, check=True)
-            self.stdout.write(
-                self.style.SUCCESS(f'Successfully backed up database to {backup_file}')
-            )
-        except subprocess.CalledProcessError as e:
-            self.stdout.write(
-                self.style.ERROR(f'Failed to backup database: {str(e)}')
-            )
\ No newline at end of file
+        for removed in backups.rotate_backups(backup_dir, kwargs['keep']):
+            self.stdout.write(f'Removed old backup {removed}')
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import close_old_connections
+import time
+
+from gatepass import outbox, sms
+
+
+class Command(BaseCommand):
+    help = 'Send queued parent SMS messages in batches, retrying failures with exponential backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.GATEPASS_OUTBOX_BATCH_SIZE)
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when nothing is due')
+        parser.add_argument('--once', action='store_true', help='Drain whatever is due now and exit')
+
+    def handle(self, *args, **kwargs):
+        gateway = sms.get_gateway()
+        totals = [0, 0, 0]
+        started = time.monotonic()
+        while True:
+            sent, retried, failed = outbox.deliver_batch(gateway, kwargs['batch_size'])
+            if sent or retried or failed:
+                totals = [total + count for total, count in zip(totals, (sent, retried, failed))]
+                self.stdout.write(f'Sent {sent}, will retry {retried}, gave up on {failed}')
+                continue
+            if kwargs['once']:
+                break
+            time.sleep(kwargs['poll_interval'])
+            close_old_connections()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Sent {totals[0]} messages, {totals[1]} retries scheduled, {totals[2]} failed ({elapsed:.1f}s)'
+        ))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from gatepass import exports
+from gatepass.models import GatePass
+
+
+class Command(BaseCommand):
+    help = 'Stream gatepass history as CSV or JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=exports.EXPORT_FORMATS, default='csv')
+        parser.add_argument(
+            '--status',
+            action='append',
+            choices=[value for value, _ in GatePass.STATUS_CHOICES],
+            help='Only export gatepasses with this status (repeatable)',
+        )
+        parser.add_argument('--from-date', help='Earliest outing date (YYYY-MM-DD)')
+        parser.add_argument('--to-date', help='Latest outing date (YYYY-MM-DD)')
+        parser.add_argument('--output', default='-', help='Output file path, "-" for stdout')
+        parser.add_argument('--chunk-size', type=int, default=exports.DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **kwargs):
+        from_date = self._parse_date(kwargs['from_date'], '--from-date')
+        to_date = self._parse_date(kwargs['to_date'], '--to-date')
+        if from_date and to_date and from_date > to_date:
+            raise CommandError('--from-date cannot be after --to-date')
+
+        rows = exports.export_rows(
+            statuses=kwargs['status'],
+            from_date=from_date,
+            to_date=to_date,
+            chunk_size=kwargs['chunk_size'],
+        )
+        lines = exports.render_export(kwargs['format'], rows)
+
+        output = kwargs['output']
+        if output == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        count = -1 if kwargs['format'] == 'csv' else 0
+        with open(output, 'w', newline='', encoding='utf-8') as fh:
+            for line in lines:
+                fh.write(line)
+                count += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Exported {count} gatepasses to {output}')
+        )
+
+    def _parse_date(self, value, option):
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise CommandError(f'{option} must be a date in YYYY-MM-DD format')
+        return parsed
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+import time
+
+from gatepass import retention
+
+
+class Command(BaseCommand):
+    help = 'Delete done and failed background jobs in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.GATEPASS_JOBS_KEEP_DAYS,
+            help='Delete jobs that finished more than this many days ago',
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.GATEPASS_JOBS_PRUNE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many jobs would be deleted')
+
+    def handle(self, *args, **kwargs):
+        cutoff = retention.jobs_cutoff(kwargs['days'])
+
+        if kwargs['dry_run']:
+            count = retention.finished_jobs(cutoff).count()
+            self.stdout.write(f'{count} jobs finished before {cutoff:%Y-%m-%d %H:%M} would be deleted')
+            return
+
+        total = 0
+        batches = 0
+        started = time.monotonic()
+        while kwargs['max_batches'] is None or batches < kwargs['max_batches']:
+            deleted = retention.prune_job_batch(cutoff, kwargs['batch_size'])
+            if not deleted:
+                break
+            total += deleted
+            batches += 1
+            self.stdout.write(f'Batch {batches}: deleted {deleted} jobs')
+            if kwargs['sleep']:
+                time.sleep(kwargs['sleep'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Deleted {total} jobs in {batches} batches ({elapsed:.1f}s)'))
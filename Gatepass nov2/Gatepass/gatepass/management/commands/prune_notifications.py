@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+import time
+
+from gatepass import retention
+
+
+class Command(BaseCommand):
+    help = 'Delete (or archive) old notifications in small primary-key batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.GATEPASS_NOTIFICATION_READ_DAYS,
+            help='Prune read notifications created more than this many days ago',
+        )
+        parser.add_argument(
+            '--unread-days',
+            type=int,
+            default=settings.GATEPASS_NOTIFICATION_UNREAD_DAYS,
+            help='Prune unread notifications created more than this many days ago (0 keeps them)',
+        )
+        parser.add_argument('--batch-size', type=int, default=settings.GATEPASS_NOTIFICATION_PRUNE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+        parser.add_argument(
+            '--max-rate', type=float, default=None, help='Pause as needed to stay under this many rows per second'
+        )
+        parser.add_argument('--archive', action='store_true', help='Copy rows to the notification archive first')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many notifications would go')
+
+    def handle(self, *args, **kwargs):
+        read_cutoff, unread_cutoff = retention.notification_cutoffs(kwargs['days'], kwargs['unread_days'])
+
+        if kwargs['dry_run']:
+            count = retention.prunable_notifications(read_cutoff, unread_cutoff).count()
+            self.stdout.write(f'{count} notifications would be pruned')
+            return
+
+        upper = retention.prune_upper_bound(read_cutoff, unread_cutoff)
+        verb = 'archived' if kwargs['archive'] else 'deleted'
+        total = 0
+        batches = 0
+        last_id = 0
+        busy = 0.0
+        started = time.monotonic()
+        while upper is not None and (kwargs['max_batches'] is None or batches < kwargs['max_batches']):
+            batch_started = time.monotonic()
+            pruned, last_id = retention.prune_notification_batch(
+                read_cutoff, unread_cutoff, after=last_id, upper=upper,
+                batch_size=kwargs['batch_size'], archive=kwargs['archive'],
+            )
+            if not pruned:
+                break
+            took = time.monotonic() - batch_started
+            busy += took
+            total += pruned
+            batches += 1
+            self.stdout.write(
+                f'Batch {batches}: {verb} {pruned} notifications up to id {last_id} ({pruned / max(took, 1e-6):.0f} rows/s)'
+            )
+
+            pause = kwargs['sleep']
+            if kwargs['max_rate']:
+                # Keep the overall rate under the cap, counting the time already spent
+                pause = max(pause, total / kwargs['max_rate'] - (time.monotonic() - started))
+            if pause > 0:
+                time.sleep(pause)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb.capitalize()} {total} notifications in {batches} batches ({elapsed:.1f}s, '
+            f'{total / max(elapsed, 1e-6):.0f} rows/s overall, {total / max(busy, 1e-6):.0f} rows/s while working)'
+        ))
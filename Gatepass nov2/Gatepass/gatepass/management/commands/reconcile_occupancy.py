@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from gatepass import occupancy
+
+
+class Command(BaseCommand):
+    help = 'Recompute the students-out occupancy counters from security-approved gatepasses'
+
+    def handle(self, *args, **kwargs):
+        drift = occupancy.reconcile()
+        for (hostel_id, gender, room_no), (stored, expected) in sorted(
+            drift.items(), key=lambda item: (item[0][0] or 0, *item[0][1:])
+        ):
+            hostel = f'hostel {hostel_id}, ' if hostel_id else ''
+            self.stdout.write(f'Room {room_no} ({hostel}{gender or "-"}): {stored} -> {expected}')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Occupancy reconciled: {len(drift)} buckets corrected, {occupancy.snapshot()["total"]} students out'
+            )
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from gatepass import student_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute each student's dashboard counters from live and archived gatepasses"
+
+    def handle(self, *args, **kwargs):
+        drift = student_stats.reconcile()
+        for student_id, (stored, expected) in sorted(drift.items()):
+            changes = ', '.join(
+                f'{field} {stored[field]} -> {expected[field]}'
+                for field in student_stats.COUNT_FIELDS if stored[field] != expected[field]
+            )
+            self.stdout.write(f'Student {student_id}: {changes}')
+        self.stdout.write(self.style.SUCCESS(f'Student stats reconciled: {len(drift)} students corrected'))
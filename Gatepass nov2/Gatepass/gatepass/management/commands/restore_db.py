@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.db import connections
+import os
+import time
+
+from gatepass import backups
+
+
+class Command(BaseCommand):
+    help = 'Restore the database from a backup created by backup_db'
+
+    def add_arguments(self, parser):
+        parser.add_argument('backup', nargs='?', help='Backup file or directory (default: newest backup)')
+        parser.add_argument('--backup-dir', default=None, help='Directory to look for the newest backup in')
+        parser.add_argument('--jobs', type=int, default=1, help='Parallel pg_restore jobs (PostgreSQL only)')
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive')
+
+    def handle(self, *args, **kwargs):
+        backup_file = kwargs['backup']
+        if not backup_file:
+            available = backups.list_backups(kwargs['backup_dir'] or backups.default_backup_dir())
+            if not available:
+                raise CommandError('No backups found')
+            backup_file = available[0]
+        if not os.path.exists(backup_file):
+            raise CommandError(f'Backup {backup_file} does not exist')
+
+        if kwargs['interactive']:
+            confirm = input(
+                f'This will overwrite the "{kwargs["database"]}" database with {backup_file}. '
+                'Type "yes" to continue: '
+            )
+            if confirm != 'yes':
+                self.stdout.write('Restore cancelled.')
+                return
+
+        db_settings = settings.DATABASES[kwargs['database']]
+        # Release our own connection so the restore is not blocked by it
+        connections[kwargs['database']].close()
+
+        started = time.monotonic()
+        try:
+            backups.restore_database(db_settings, backup_file, kwargs['jobs'])
+        except backups.BackupError as e:
+            raise CommandError(f'Failed to restore database: {e}')
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully restored database from {backup_file} in {elapsed:.1f}s')
+        )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+import time
+
+from gatepass import deadlines
+
+
+class Command(BaseCommand):
+    help = 'Long-running process that sends overdue alerts and return reminders at their exact times'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds between checks for newly approved or changed gatepasses',
+        )
+        parser.add_argument('--once', action='store_true', help='Send whatever is due now and exit')
+
+    def handle(self, *args, **kwargs):
+        scheduler = deadlines.DeadlineScheduler()
+        queued = scheduler.load()
+        self.stdout.write(f'Loaded {queued} deadline events')
+
+        while True:
+            sent = scheduler.run_due()
+            if sent:
+                self.stdout.write(f'{timezone.now():%Y-%m-%d %H:%M:%S} sent {sent} alerts')
+            if kwargs['once']:
+                break
+
+            # Sleep until the next event or the next poll, whichever comes first
+            delay = kwargs['poll_interval']
+            next_due = scheduler.next_due()
+            if next_due is not None:
+                delay = min(delay, max((next_due - timezone.now()).total_seconds(), 0))
+            time.sleep(delay)
+
+            close_old_connections()
+            added = scheduler.refresh()
+            if added:
+                self.stdout.write(f'Scheduled {added} new deadlines')
+
+        self.stdout.write(self.style.SUCCESS('Deadline scheduler finished'))
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from collections import defaultdict
+import os
+import socket
+import threading
+import time
+
+from gatepass import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the Job table with a pool of worker threads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Number of worker threads')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when no job is due')
+        parser.add_argument('--once', action='store_true', help='Run every job that is due now and exit')
+
+    def handle(self, *args, **kwargs):
+        self.stats = defaultdict(lambda: {'done': 0, 'failed': 0, 'total_ms': 0, 'max_ms': 0})
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+        requeued = jobs.requeue_stale()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale jobs')
+
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        threads = [
+            threading.Thread(target=self.work, args=(f'{prefix}:{n}', kwargs), daemon=True)
+            for n in range(kwargs['concurrency'])
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.monotonic() - started
+        for name, stat in sorted(self.stats.items()):
+            runs = stat['done'] + stat['failed']
+            self.stdout.write(
+                f"{name}: {stat['done']} done, {stat['failed']} failed, "
+                f"avg {stat['total_ms'] / runs:.0f}ms, max {stat['max_ms']}ms"
+            )
+        total = sum(stat['done'] for stat in self.stats.values())
+        self.stdout.write(self.style.SUCCESS(f'Ran {total} jobs ({elapsed:.1f}s)'))
+
+    def work(self, worker_id, options):
+        try:
+            while not self.stopping.is_set():
+                job = jobs.claim_job(worker_id)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    close_old_connections()
+                    continue
+                ok = jobs.run_job(job)
+                with self.lock:
+                    stat = self.stats[job.name]
+                    stat['done' if ok else 'failed'] += 1
+                    stat['total_ms'] += job.duration_ms
+                    stat['max_ms'] = max(stat['max_ms'], job.duration_ms)
+        finally:
+            connection.close()
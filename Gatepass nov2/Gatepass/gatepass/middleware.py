@@ -0,0 +1,23 @@
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from . import hostels, user_cache
+
+
+class HostelScopeMiddleware:
+    """Scope hostel-owned querysets to the requesting user's hostel"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with hostels.request_scope(request):
+            return self.get_response(request)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that reads the signed-in user and their profile from the cache"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: user_cache.get_user(request))
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0003_alter_security_shift_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGatePass',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('outing_date', models.DateField()),
+                ('outing_time', models.TimeField()),
+                ('expected_return_date', models.DateField()),
+                ('expected_return_time', models.TimeField()),
+                ('purpose', models.TextField(blank=True, max_length=500, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('warden_approved', 'Warden Approved'), ('warden_rejected', 'Warden Rejected'), ('security_approved', 'Security Approved'), ('returned', 'Returned'), ('completed', 'Completed')], max_length=20)),
+                ('warden_rejection_reason', models.TextField(blank=True, max_length=500, null=True)),
+                ('parent_verification', models.BooleanField(default=False)),
+                ('actual_return_date', models.DateField(blank=True, null=True)),
+                ('actual_return_time', models.TimeField(blank=True, null=True)),
+                ('return_notes', models.TextField(blank=True, max_length=500, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('return_verified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('security_approval', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_gatepasses', to='gatepass.student')),
+                ('warden_approval', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedParentVerification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('parent_mobile', models.CharField(max_length=10)),
+                ('verification_code', models.CharField(max_length=6)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('gatepass', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='verification', to='gatepass.archivedgatepass')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('gatepass_id', models.BigIntegerField(db_index=True)),
+                ('notification_type', models.CharField(choices=[('gatepass_request', 'Gate Pass Request'), ('warden_approval', 'Warden Approval'), ('warden_rejection', 'Warden Rejection'), ('security_approval', 'Security Approval')], max_length=20)),
+                ('message', models.TextField()),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
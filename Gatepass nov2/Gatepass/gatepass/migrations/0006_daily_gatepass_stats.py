@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0005_notification_unread_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyGatePassStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('warden_approved_count', models.PositiveIntegerField(default=0)),
+                ('warden_rejected_count', models.PositiveIntegerField(default=0)),
+                ('exit_count', models.PositiveIntegerField(default=0)),
+                ('return_count', models.PositiveIntegerField(default=0)),
+                ('approval_latency_seconds', models.BigIntegerField(default=0)),
+                ('approval_latency_samples', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily gatepass stats',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='warden_decided_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='warden_decided_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
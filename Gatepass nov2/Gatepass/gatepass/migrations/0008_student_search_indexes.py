@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 04:56
+
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    from gatepass.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from gatepass.search import remove_search_index
+    remove_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0007_occupancy_counter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='room_no',
+            field=models.CharField(db_index=True, max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='student_name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
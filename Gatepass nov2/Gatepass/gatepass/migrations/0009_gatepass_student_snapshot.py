@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:04
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+SNAPSHOT_FIELDS = ['student_name', 'hall_ticket_no', 'room_no', 'parent_mobile']
+
+
+def copy_student_snapshot(apps, schema_editor):
+    Student = apps.get_model('gatepass', 'Student')
+    User = apps.get_model('gatepass', 'User')
+    for model_name in ('GatePass', 'ArchivedGatePass'):
+        model = apps.get_model('gatepass', model_name)
+        student = Student.objects.filter(pk=OuterRef('student_id'))
+        updates = {field: Subquery(student.values(field)[:1]) for field in SNAPSHOT_FIELDS}
+        model.objects.update(**updates)
+        gender = User.objects.filter(student_profile=OuterRef('student_id')).values('gender')[:1]
+        model.objects.exclude(student__user__gender=None).update(student_gender=Subquery(gender))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0008_student_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='hall_ticket_no',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='parent_mobile',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='room_no',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='student_gender',
+            field=models.CharField(blank=True, choices=[('M', 'Male'), ('F', 'Female')], default='', max_length=1),
+        ),
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='student_name',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='hall_ticket_no',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='parent_mobile',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='room_no',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='student_gender',
+            field=models.CharField(blank=True, choices=[('M', 'Male'), ('F', 'Female')], default='', max_length=1),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='student_name',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RunPython(copy_student_snapshot, migrations.RunPython.noop),
+    ]
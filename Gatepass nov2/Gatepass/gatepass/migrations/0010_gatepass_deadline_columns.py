@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:06
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+def combine_local(day, moment):
+    # Frozen copy of gatepass.models.combine_local as of this migration
+    if day is None or moment is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, moment), timezone.get_default_timezone())
+
+
+def fill_deadlines(apps, schema_editor):
+    GatePass = apps.get_model('gatepass', 'GatePass')
+    last_pk = 0
+    while True:
+        # Batches by primary key range: never write to a table while iterating over it
+        batch = list(
+            GatePass.objects.filter(pk__gt=last_pk).order_by('pk').only(
+                'outing_date', 'outing_time', 'expected_return_date', 'expected_return_time'
+            )[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        for gatepass in batch:
+            gatepass.outing_at = combine_local(gatepass.outing_date, gatepass.outing_time)
+            gatepass.expected_return_at = combine_local(gatepass.expected_return_date, gatepass.expected_return_time)
+        GatePass.objects.bulk_update(batch, ['outing_at', 'expected_return_at'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0009_gatepass_student_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gatepass',
+            name='expected_return_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='outing_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_deadlines, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['status', 'expected_return_at'], name='gatepass_status_return_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['outing_at'], name='gatepass_outing_at_idx'),
+        ),
+    ]
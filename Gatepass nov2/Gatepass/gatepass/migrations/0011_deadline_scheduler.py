@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0010_gatepass_deadline_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivednotification',
+            name='notification_type',
+            field=models.CharField(choices=[('gatepass_request', 'Gate Pass Request'), ('warden_approval', 'Warden Approval'), ('warden_rejection', 'Warden Rejection'), ('security_approval', 'Security Approval'), ('overdue_return', 'Overdue Return'), ('return_reminder', 'Return Reminder')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('gatepass_request', 'Gate Pass Request'), ('warden_approval', 'Warden Approval'), ('warden_rejection', 'Warden Rejection'), ('security_approval', 'Security Approval'), ('overdue_return', 'Overdue Return'), ('return_reminder', 'Return Reminder')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['updated_at'], name='gatepass_updated_at_idx'),
+        ),
+    ]
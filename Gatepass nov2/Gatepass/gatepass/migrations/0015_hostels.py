@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0014_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Hostel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('gender', models.CharField(blank=True, choices=[('M', 'Male'), ('F', 'Female')], default='', max_length=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archivedgatepass',
+            name='hostel',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='gatepass.hostel'),
+        ),
+        migrations.AddField(
+            model_name='gatepass',
+            name='hostel',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='gatepasses', to='gatepass.hostel'),
+        ),
+        migrations.AddField(
+            model_name='security',
+            name='hostel',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='security_staff', to='gatepass.hostel'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='hostel',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='students', to='gatepass.hostel'),
+        ),
+        migrations.AddField(
+            model_name='warden',
+            name='hostel',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='wardens', to='gatepass.hostel'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['hostel', 'status', 'created_at'], name='gatepass_hostel_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['hostel', 'status', 'expected_return_at'], name='gatepass_hostel_return_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['hostel', 'room_no'], name='student_hostel_room_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0016_change_markers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentGatePassStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_count', models.IntegerField(default=0)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('approved_count', models.IntegerField(default=0)),
+                ('rejected_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Student gatepass stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedgatepass',
+            index=models.Index(fields=['student', '-created_at', '-id'], name='archived_student_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['student', '-created_at', '-id'], name='gatepass_student_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='studentgatepassstats',
+            name='student',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='gatepass_stats', to='gatepass.student'),
+        ),
+    ]
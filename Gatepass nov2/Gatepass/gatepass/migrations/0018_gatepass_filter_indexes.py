@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0017_student_gatepass_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['status', 'created_at'], name='gatepass_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['status', 'outing_date'], name='gatepass_status_outing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['warden_approval', 'created_at'], name='gatepass_warden_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['student_gender', 'status', 'created_at'], name='gatepass_gender_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['room_no', 'created_at'], name='gatepass_room_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatepass',
+            index=models.Index(fields=['expected_return_date'], name='gatepass_return_date_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:22
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def rebuild_occupancy_by_hostel(apps, schema_editor):
+    # Existing counters pooled every hostel's rooms; recount them per hostel
+    GatePass = apps.get_model('gatepass', 'GatePass')
+    OccupancyCounter = apps.get_model('gatepass', 'OccupancyCounter')
+    OccupancyCounter.objects.all().delete()
+    rows = (
+        GatePass.objects.filter(status='security_approved')
+        .values('hostel_id', 'student_gender', 'room_no').annotate(count=Count('id')).order_by()
+    )
+    OccupancyCounter.objects.bulk_create(
+        OccupancyCounter(hostel_id=row['hostel_id'], gender=row['student_gender'] or '', room_no=row['room_no'], count=row['count'])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0018_gatepass_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='occupancycounter',
+            name='unique_occupancy_gender_room',
+        ),
+        migrations.AddField(
+            model_name='occupancycounter',
+            name='hostel',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='gatepass.hostel'),
+        ),
+        migrations.AddConstraint(
+            model_name='occupancycounter',
+            constraint=models.UniqueConstraint(fields=('hostel', 'gender', 'room_no'), name='unique_occupancy_hostel_room'),
+        ),
+        migrations.AddConstraint(
+            model_name='occupancycounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('hostel__isnull', True)), fields=('gender', 'room_no'), name='unique_occupancy_room_no_hostel'),
+        ),
+        migrations.RunPython(rebuild_occupancy_by_hostel, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+def normalize_hall_tickets(apps, schema_editor):
+    Student = apps.get_model('gatepass', 'Student')
+    GatePass = apps.get_model('gatepass', 'GatePass')
+    ArchivedGatePass = apps.get_model('gatepass', 'ArchivedGatePass')
+    taken = set(Student.objects.values_list('hall_ticket_no', flat=True))
+    stale = Student.objects.annotate(normalized=Upper('hall_ticket_no')).values_list('pk', 'hall_ticket_no', 'normalized')
+    for pk, hall_ticket_no, normalized in stale:
+        normalized = normalized.strip()
+        # Two students whose tickets differ only in case are left for an admin to resolve
+        if normalized == hall_ticket_no or normalized in taken:
+            continue
+        taken.add(normalized)
+        Student.objects.filter(pk=pk).update(hall_ticket_no=normalized)
+        GatePass.objects.filter(student_id=pk).update(hall_ticket_no=normalized)
+        ArchivedGatePass.objects.filter(student_id=pk).update(hall_ticket_no=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0019_occupancy_by_hostel'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_hall_tickets, migrations.RunPython.noop),
+    ]
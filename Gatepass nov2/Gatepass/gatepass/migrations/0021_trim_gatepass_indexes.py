@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0020_normalize_hall_tickets'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='gatepass',
+            name='gatepass_outing_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='gatepass',
+            name='gatepass_hostel_return_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='gatepass',
+            name='gatepass_status_outing_idx',
+        ),
+        migrations.AlterField(
+            model_name='gatepass',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='gatepass_requests', to='gatepass.student'),
+        ),
+        migrations.AlterField(
+            model_name='gatepass',
+            name='warden_approval',
+            field=models.ForeignKey(blank=True, db_index=False, limit_choices_to={'role': 'warden'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='warden_approvals', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.utils import timezone
+
+
+# Frozen copy of gatepass.analytics.rebuild_daily_stats as of this migration, so
+# dashboards have all-time totals straight after deploy instead of waiting for
+# someone to run backfill_daily_stats.
+
+STAT_FIELDS = [
+    'created_count', 'warden_approved_count', 'warden_rejected_count', 'exit_count', 'return_count',
+    'approval_latency_seconds', 'approval_latency_samples',
+]
+APPROVED_STATUSES = ('warden_approved', 'security_approved', 'returned', 'completed')
+EXITED_STATUSES = ('security_approved', 'returned', 'completed')
+RETURNED_STATUSES = ('returned', 'completed')
+
+
+def _local_date(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def backfill_daily_stats(apps, schema_editor):
+    DailyGatePassStats = apps.get_model('gatepass', 'DailyGatePassStats')
+    days = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    columns = ('status', 'created_at', 'updated_at', 'warden_decided_at', 'outing_date', 'actual_return_date')
+
+    for model_name in ('GatePass', 'ArchivedGatePass'):
+        rows = apps.get_model('gatepass', model_name).objects.values_list(*columns).iterator(chunk_size=2000)
+        for status, created_at, updated_at, decided_at, outing_date, actual_return_date in rows:
+            days[_local_date(created_at)]['created_count'] += 1
+
+            if status == 'warden_rejected' or status in APPROVED_STATUSES:
+                decision_day = days[_local_date(decided_at or updated_at)]
+                if status == 'warden_rejected':
+                    decision_day['warden_rejected_count'] += 1
+                else:
+                    decision_day['warden_approved_count'] += 1
+                if decided_at:
+                    latency = decided_at - created_at
+                    decision_day['approval_latency_seconds'] += max(int(latency.total_seconds()), 0)
+                    decision_day['approval_latency_samples'] += 1
+
+            if status in EXITED_STATUSES:
+                days[outing_date]['exit_count'] += 1
+            if status in RETURNED_STATUSES:
+                days[actual_return_date or _local_date(updated_at)]['return_count'] += 1
+
+    # Rows written incrementally since 0006 only cover activity after that deploy
+    DailyGatePassStats.objects.all().delete()
+    DailyGatePassStats.objects.bulk_create(
+        DailyGatePassStats(date=day, **counters) for day, counters in days.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gatepass', '0021_trim_gatepass_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,22 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 from django.utils import timezone
+from datetime import datetime, timedelta
+
+from .hostels import current_hostel_id
+
+
+def combine_local(day, moment):
+    """Aware datetime for a date and wall-clock time in the project's time zone"""
+    if day is None or moment is None:
+        return None
+    return timezone.make_aware(datetime.combine(day, moment), timezone.get_default_timezone())
+
+
+def normalize_hall_ticket(value):
+    """Hall tickets are stored upper-case so exact and prefix lookups match however they were typed"""
+    return (value or '').strip().upper()
 
 
 class User(AbstractUser):
@@ -37,13 +52,40 @@ class User(AbstractUser):
         return f"{self.username} ({self.get_role_display()})"
 
 
+class Hostel(models.Model):
+    """A hostel block; students, wardens, guards and gatepasses belong to one"""
+    
+    name = models.CharField(max_length=100, unique=True)
+    gender = models.CharField(max_length=1, choices=User.GENDER_CHOICES, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.name
+
+
+class HostelScopedManager(models.Manager):
+    """Default manager that only returns the current hostel's rows (see gatepass/hostels.py)"""
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        hostel_id = current_hostel_id()
+        if hostel_id is not None:
+            queryset = queryset.filter(hostel_id=hostel_id)
+        return queryset
+
+
 class Student(models.Model):
     """Student profile model"""
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='student_profile')
+    # Indexed through student_hostel_room_idx
+    hostel = models.ForeignKey(
+        Hostel, on_delete=models.PROTECT, null=True, blank=True, related_name='students', db_index=False
+    )
+    # Always upper-case (see normalize_hall_ticket)
     hall_ticket_no = models.CharField(max_length=20, unique=True)
-    student_name = models.CharField(max_length=100)
-    room_no = models.CharField(max_length=10)
+    student_name = models.CharField(max_length=100, db_index=True)
+    room_no = models.CharField(max_length=10, db_index=True)
     parent_name = models.CharField(max_length=100)
     parent_mobile = models.CharField(
         max_length=10,
@@ -51,9 +93,27 @@ class Student(models.Model):
         unique=True
     )
     
+    objects = HostelScopedManager()
+    all_hostels = models.Manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['hostel', 'room_no'], name='student_hostel_room_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.student_name} ({self.hall_ticket_no})"
     
+    def gatepass_snapshot(self):
+        """Fields copied onto each of the student's gatepasses (excluding gender, which lives on User)"""
+        return {
+            'hostel_id': self.hostel_id,
+            'student_name': self.student_name,
+            'hall_ticket_no': self.hall_ticket_no,
+            'room_no': self.room_no,
+            'parent_mobile': self.parent_mobile,
+        }
+    
     @property
     def username_format(self):
         """Generate username format: Name@last4digits"""
@@ -65,6 +125,7 @@ class Warden(models.Model):
     """Warden profile model"""
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='warden_profile')
+    hostel = models.ForeignKey(Hostel, on_delete=models.PROTECT, null=True, blank=True, related_name='wardens')
     name = models.CharField(max_length=100)
     department = models.CharField(max_length=100, null=True, blank=True)
     
@@ -80,6 +141,7 @@ class Security(models.Model):
         ('Night', 'Night'),
     ]
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='security_profile')
+    hostel = models.ForeignKey(Hostel, on_delete=models.PROTECT, null=True, blank=True, related_name='security_staff')
     name = models.CharField(max_length=100)
     shift = models.CharField(max_length=20, choices=SHIFT_CHOICES, default='Morning')
     
@@ -99,20 +161,34 @@ class GatePass(models.Model):
         ('completed', 'Completed'),
     ]
     
-    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='gatepass_requests')
+    # Indexed through gatepass_student_created_idx
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='gatepass_requests', db_index=False)
+    # Copied from the student; indexed through the hostel-leading composite indexes
+    hostel = models.ForeignKey(
+        Hostel, on_delete=models.PROTECT, null=True, blank=True, related_name='gatepasses', db_index=False
+    )
+    # Snapshot of the student's details so list views never join Student/User;
+    # copied on creation and kept in sync by the receivers in signals.py
+    student_name = models.CharField(max_length=100, blank=True, default='')
+    hall_ticket_no = models.CharField(max_length=20, blank=True, default='', db_index=True)
+    room_no = models.CharField(max_length=10, blank=True, default='')
+    parent_mobile = models.CharField(max_length=10, blank=True, default='')
+    student_gender = models.CharField(max_length=1, choices=User.GENDER_CHOICES, blank=True, default='')
     outing_date = models.DateField()
     outing_time = models.TimeField()
     expected_return_date = models.DateField()
     expected_return_time = models.TimeField()
     purpose = models.TextField(max_length=500, null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Indexed through gatepass_warden_created_idx
     warden_approval = models.ForeignKey(
         User, 
         on_delete=models.SET_NULL, 
         null=True, 
         blank=True, 
         related_name='warden_approvals',
-        limit_choices_to={'role': 'warden'}
+        limit_choices_to={'role': 'warden'},
+        db_index=False,
     )
     security_approval = models.ForeignKey(
         User, 
@@ -135,11 +211,63 @@ class GatePass(models.Model):
         limit_choices_to={'role': 'security'}
     )
     return_notes = models.TextField(max_length=500, null=True, blank=True)
+    warden_decided_at = models.DateTimeField(null=True, blank=True)
+    # outing_date/time and expected_return_date/time combined, maintained on save for deadline queries
+    outing_at = models.DateTimeField(null=True, blank=True, editable=False)
+    expected_return_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = HostelScopedManager()
+    all_hostels = models.Manager()
+    
+    class Meta:
+        indexes = [
+            # Per-hostel dashboards: hostel_id = ? AND status = ? ORDER BY created_at
+            models.Index(fields=['hostel', 'status', 'created_at'], name='gatepass_hostel_status_idx'),
+            # Overdue checks: status='security_approved' AND expected_return_at < now(); few
+            # passes are out at once, so per-hostel checks filter the hostel from this range
+            models.Index(fields=['status', 'expected_return_at'], name='gatepass_status_return_idx'),
+            # Admin date hierarchy and outing date ranges (with or without a status)
+            models.Index(fields=['outing_date'], name='gatepass_outing_date_idx'),
+            # The deadline scheduler polls for recently saved gatepasses
+            models.Index(fields=['updated_at'], name='gatepass_updated_at_idx'),
+            # Filtered lists (filters.py), newest first: by status, gender, room or
+            # approving warden; return date ranges
+            models.Index(fields=['status', 'created_at'], name='gatepass_status_created_idx'),
+            models.Index(fields=['warden_approval', 'created_at'], name='gatepass_warden_created_idx'),
+            models.Index(fields=['student_gender', 'status', 'created_at'], name='gatepass_gender_status_idx'),
+            models.Index(fields=['room_no', 'created_at'], name='gatepass_room_created_idx'),
+            models.Index(fields=['expected_return_date'], name='gatepass_return_date_idx'),
+            # Student history pages: student_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['student', '-created_at', '-id'], name='gatepass_student_created_idx'),
+        ]
+    
     def __str__(self):
-        return f"GatePass for {self.student.student_name} - {self.outing_date}"
+        return f"GatePass for {self.student_name} - {self.outing_date}"
+    
+    def sync_deadlines(self):
+        self.outing_at = combine_local(self.outing_date, self.outing_time)
+        self.expected_return_at = combine_local(self.expected_return_date, self.expected_return_time)
+    
+    @property
+    def pass_token(self):
+        """Code shown on the student's pass; the gate's batch return form accepts it in place of a hall ticket"""
+        return f'GP-{self.pk}'
+    
+    def copy_student_snapshot(self):
+        """Fill the snapshot columns from the student and their user"""
+        for field, value in self.student.gatepass_snapshot().items():
+            setattr(self, field, value)
+        self.student_gender = self.student.user.gender or ''
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so a later save can tell which transition happened
+        if 'status' in instance.__dict__:
+            instance._loaded_status = instance.status
+        return instance
     
     def get_appropriate_warden(self):
         """Get warden based on student's gender"""
@@ -161,7 +289,23 @@ class ParentVerification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"Parent verification for {self.gatepass.student.student_name}"
+        return f"Parent verification for {self.gatepass.student_name}"
+
+
+class NotificationQuerySet(models.QuerySet):
+    def unread(self):
+        return self.filter(is_read=False)
+    
+    def mark_read(self, ids=None):
+        """Mark unread notifications as read with a single UPDATE; returns rows changed"""
+        queryset = self.unread()
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+        user_ids = set(queryset.values_list('user_id', flat=True).distinct())
+        updated = queryset.update(is_read=True)
+        if updated:
+            bump_notification_markers(user_ids)
+        return updated
 
 
 class Notification(models.Model):
@@ -172,6 +316,8 @@ class Notification(models.Model):
         ('warden_approval', 'Warden Approval'),
         ('warden_rejection', 'Warden Rejection'),
         ('security_approval', 'Security Approval'),
+        ('overdue_return', 'Overdue Return'),
+        ('return_reminder', 'Return Reminder'),
     ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
@@ -181,5 +327,301 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = NotificationQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Partial index so unread badge counts are a tiny index-only scan
+            models.Index(fields=['user'], condition=models.Q(is_read=False), name='notification_unread_idx'),
+            models.Index(fields=['created_at'], name='notification_created_at_idx'),
+        ]
+    
     def __str__(self):
-        return f"{self.get_notification_type_display()} - {self.user.username}"
\ No newline at end of file
+        return f"{self.get_notification_type_display()} - {self.user.username}"
+
+class ArchivedGatePass(models.Model):
+    """Completed gate pass moved out of the hot GatePass table by the retention job"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='archived_gatepasses')
+    hostel = models.ForeignKey(Hostel, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    student_name = models.CharField(max_length=100, blank=True, default='')
+    hall_ticket_no = models.CharField(max_length=20, blank=True, default='')
+    room_no = models.CharField(max_length=10, blank=True, default='')
+    parent_mobile = models.CharField(max_length=10, blank=True, default='')
+    student_gender = models.CharField(max_length=1, choices=User.GENDER_CHOICES, blank=True, default='')
+    outing_date = models.DateField()
+    outing_time = models.TimeField()
+    expected_return_date = models.DateField()
+    expected_return_time = models.TimeField()
+    purpose = models.TextField(max_length=500, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=GatePass.STATUS_CHOICES)
+    warden_approval = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    security_approval = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    warden_rejection_reason = models.TextField(max_length=500, null=True, blank=True)
+    parent_verification = models.BooleanField(default=False)
+    actual_return_date = models.DateField(null=True, blank=True)
+    actual_return_time = models.TimeField(null=True, blank=True)
+    return_verified_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    return_notes = models.TextField(max_length=500, null=True, blank=True)
+    warden_decided_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', '-created_at', '-id'], name='archived_student_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Archived GatePass for {self.student_name} - {self.outing_date}"
+
+
+class ArchivedParentVerification(models.Model):
+    """Parent verification archived together with its gate pass"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    gatepass = models.OneToOneField(ArchivedGatePass, on_delete=models.CASCADE, related_name='verification')
+    parent_mobile = models.CharField(max_length=10)
+    verification_code = models.CharField(max_length=6)
+    is_verified = models.BooleanField(default=False)
+    verified_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"Archived parent verification for gatepass {self.gatepass_id}"
+
+
+class ArchivedNotification(models.Model):
+    """Notification moved out of the hot Notification table"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    # Plain id rather than a foreign key: the gate pass may be live or archived
+    gatepass_id = models.BigIntegerField(db_index=True)
+    notification_type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPES)
+    message = models.TextField()
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Archived {self.get_notification_type_display()} - {self.user_id}"
+
+
+
+class DailyGatePassStats(models.Model):
+    """Per-day gatepass activity, updated incrementally on every status transition"""
+    
+    date = models.DateField(unique=True)
+    created_count = models.PositiveIntegerField(default=0)
+    warden_approved_count = models.PositiveIntegerField(default=0)
+    warden_rejected_count = models.PositiveIntegerField(default=0)
+    exit_count = models.PositiveIntegerField(default=0)
+    return_count = models.PositiveIntegerField(default=0)
+    approval_latency_seconds = models.BigIntegerField(default=0)
+    approval_latency_samples = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-date']
+        verbose_name_plural = 'Daily gatepass stats'
+    
+    def __str__(self):
+        return f"Gatepass stats for {self.date}"
+    
+    @property
+    def mean_approval_latency(self):
+        """Mean time from request to warden decision, as a timedelta"""
+        if not self.approval_latency_samples:
+            return None
+        return timedelta(seconds=self.approval_latency_seconds / self.approval_latency_samples)
+
+
+
+class OccupancyCounter(models.Model):
+    """Number of students currently off campus, per hostel, gender and room"""
+    
+    # Room numbers repeat across hostels; NULL buckets passes of students without a hostel
+    hostel = models.ForeignKey(Hostel, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    gender = models.CharField(max_length=1, choices=User.GENDER_CHOICES, blank=True, default='')
+    room_no = models.CharField(max_length=10)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hostel', 'gender', 'room_no'], name='unique_occupancy_hostel_room'),
+            # NULLs never collide in a unique index, so hostel-less buckets need their own constraint
+            models.UniqueConstraint(
+                fields=['gender', 'room_no'], condition=models.Q(hostel__isnull=True), name='unique_occupancy_room_no_hostel',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Room {self.room_no} ({self.gender or '-'}): {self.count} out"
+
+
+class StudentGatePassStats(models.Model):
+    """Per-student dashboard counts, updated incrementally on every status transition"""
+    
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, related_name='gatepass_stats')
+    # Live and archived passes; archiving leaves the counts unchanged
+    total_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    approved_count = models.IntegerField(default=0)
+    rejected_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'Student gatepass stats'
+    
+    def __str__(self):
+        return f"Gatepass stats for {self.student}"
+
+
+
+class OutboxMessage(models.Model):
+    """Outgoing SMS written in the same transaction as the change that caused it"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    recipient = models.CharField(max_length=15)
+    body = models.TextField()
+    gatepass = models.ForeignKey(GatePass, on_delete=models.SET_NULL, null=True, blank=True, related_name='outbox_messages')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            # The delivery worker only ever looks at due pending messages
+            models.Index(fields=['next_attempt_at'], condition=models.Q(status='pending'), name='outbox_pending_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"SMS to {self.recipient} ({self.get_status_display()})"
+
+
+
+class Job(models.Model):
+    """Background job picked up by the run_workers command"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    last_error = models.TextField(blank=True, default='')
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_at'], condition=models.Q(status='queued'), name='job_queued_run_at_idx'),
+            models.Index(fields=['status', 'locked_at'], name='job_status_locked_idx'),
+            # Retention: prune_jobs deletes finished jobs oldest first
+            models.Index(
+                fields=['finished_at'], condition=models.Q(status__in=['done', 'failed']), name='job_finished_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
+
+
+
+class ChangeMarker(models.Model):
+    """Version counter per data scope, bumped on every write; conditional GETs derive ETags from it"""
+    
+    scope = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.scope} v{self.version}"
+    
+    @classmethod
+    def bump(cls, *scopes):
+        """Bump ``scopes`` once the current transaction commits.
+
+        The marker rows stay out of the writer's transaction, so concurrent
+        writes don't queue on their locks and no reader sees a new version
+        before the data behind it.
+        """
+        scopes = sorted(set(scopes))
+        if scopes:
+            transaction.on_commit(lambda: cls.increment(scopes))
+    
+    @classmethod
+    def increment(cls, scopes):
+        """One UPDATE for the existing scopes, one INSERT for any that are new"""
+        updated = cls.objects.filter(scope__in=scopes).update(version=models.F('version') + 1, updated_at=timezone.now())
+        if updated < len(scopes):
+            cls.objects.bulk_create([cls(scope=scope, version=1) for scope in scopes], ignore_conflicts=True)
+    
+    @classmethod
+    def versions(cls, *scopes):
+        """{scope: version}, 0 for scopes that were never written.
+
+        A scope ending in ``*`` stands for every scope with that prefix and
+        gets their summed version, which grows whenever any of them is bumped.
+        """
+        prefixes = [scope[:-1] for scope in scopes if scope.endswith('*')]
+        condition = models.Q(scope__in=[scope for scope in scopes if not scope.endswith('*')])
+        for prefix in prefixes:
+            condition |= models.Q(scope__startswith=prefix)
+        found = {scope: 0 for scope in scopes}
+        for scope, version in cls.objects.filter(condition).values_list('scope', 'version'):
+            if scope in found:
+                found[scope] = version
+            for prefix in prefixes:
+                if scope.startswith(prefix):
+                    found[prefix + '*'] += version
+        return found
+
+
+# Gatepass lists change per hostel; viewers outside any hostel read all of them
+ALL_GATEPASSES_SCOPE = 'gatepasses:*'
+NOTIFICATIONS_SCOPE = 'notifications'
+USERS_SCOPE = 'users'
+
+
+def gatepasses_scope(hostel_id):
+    return f'gatepasses:{hostel_id if hostel_id is not None else "none"}'
+
+
+def bump_gatepass_markers(hostel_ids):
+    """Bump the scope of every hostel whose gatepasses were written"""
+    ChangeMarker.bump(*{gatepasses_scope(hostel_id) for hostel_id in hostel_ids})
+
+
+def notifications_scope(user_id):
+    return f'notifications:{user_id}'
+
+
+def bump_notification_markers(user_ids):
+    """Bump each recipient's scope and the all-notifications scope the superadmin sees"""
+    scopes = sorted({notifications_scope(user_id) for user_id in user_ids})
+    if scopes:
+        ChangeMarker.bump(NOTIFICATIONS_SCOPE, *scopes)
+
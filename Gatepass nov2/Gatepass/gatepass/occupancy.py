@@ -0,0 +1,106 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import GatePass, OccupancyCounter
+
+
+OUT_STATUS = 'security_approved'
+
+# Snapshot columns the counters are bucketed by
+KEY_FIELDS = ('hostel_id', 'student_gender', 'room_no')
+
+
+def occupancy_key(gatepass):
+    return gatepass.hostel_id, gatepass.student_gender or '', gatepass.room_no
+
+
+def adjust(hostel_id, gender, room_no, delta):
+    """Atomically add ``delta`` to the counter for one hostel/gender/room bucket"""
+    bucket = {'hostel_id': hostel_id, 'gender': gender, 'room_no': room_no}
+    OccupancyCounter.objects.get_or_create(**bucket)
+    OccupancyCounter.objects.filter(**bucket).update(count=F('count') + delta, updated_at=timezone.now())
+
+
+def record_transition(gatepass, previous_status, status):
+    if status == OUT_STATUS and previous_status != OUT_STATUS:
+        adjust(*occupancy_key(gatepass), 1)
+    elif previous_status == OUT_STATUS and status != OUT_STATUS:
+        adjust(*occupancy_key(gatepass), -1)
+
+
+def move_out_passes(gatepasses, **changes):
+    """Shift the counts of passes that are out before ``changes`` are written to their snapshot.
+
+    Call inside the transaction that rewrites the columns; otherwise the
+    return would decrement a bucket the exit never incremented.
+    """
+    moves = Counter()
+    for gatepass in gatepasses.filter(status=OUT_STATUS).select_for_update().only('id', *KEY_FIELDS):
+        previous = occupancy_key(gatepass)
+        for field, value in changes.items():
+            setattr(gatepass, field, value)
+        if occupancy_key(gatepass) != previous:
+            moves[previous] -= 1
+            moves[occupancy_key(gatepass)] += 1
+    for key, delta in moves.items():
+        if delta:
+            adjust(*key, delta)
+
+
+def snapshot(hostel_id=None):
+    """Current occupancy of one hostel (or the whole campus for None), read only from the counter table.
+
+    Campus-wide snapshots also break the total down by hostel and key rooms
+    that belong to a hostel as ``<hostel id>/<room>``, since room numbers
+    repeat across hostels.
+    """
+    by_gender = Counter()
+    by_room = Counter()
+    by_hostel = Counter()
+    rows = OccupancyCounter.objects.filter(count__gt=0)
+    if hostel_id is not None:
+        rows = rows.filter(hostel_id=hostel_id)
+    for hostel, gender, room_no, count in rows.values_list('hostel_id', 'gender', 'room_no', 'count'):
+        by_gender[gender or 'unknown'] += count
+        by_room[room_no if hostel_id is not None or hostel is None else f'{hostel}/{room_no}'] += count
+        by_hostel[hostel or 'none'] += count
+    result = {
+        'total': sum(by_gender.values()),
+        'by_gender': dict(by_gender),
+        'by_room': dict(sorted(by_room.items())),
+    }
+    if hostel_id is None and set(by_hostel) - {'none'}:
+        result['by_hostel'] = {str(key): count for key, count in by_hostel.items()}
+    return result
+
+
+def expected_counts():
+    """Occupancy recomputed from GatePass, keyed by (hostel_id, gender, room_no)"""
+    rows = GatePass.all_hostels.filter(status=OUT_STATUS).values_list(*KEY_FIELDS)
+    return Counter((hostel_id, gender or '', room_no) for hostel_id, gender, room_no in rows.iterator())
+
+
+def reconcile():
+    """Rewrite the counters from GatePass; returns {key: (stored, expected)} for drifted buckets"""
+    expected = expected_counts()
+    with transaction.atomic():
+        stored = {
+            (counter.hostel_id, counter.gender, counter.room_no): counter
+            for counter in OccupancyCounter.objects.select_for_update()
+        }
+        drift = {}
+        for key in set(stored) | set(expected):
+            counter = stored.get(key)
+            current = counter.count if counter else 0
+            if current == expected[key]:
+                continue
+            drift[key] = (current, expected[key])
+            if counter:
+                counter.count = expected[key]
+                counter.save(update_fields=['count', 'updated_at'])
+            else:
+                OccupancyCounter.objects.create(hostel_id=key[0], gender=key[1], room_no=key[2], count=expected[key])
+    return drift
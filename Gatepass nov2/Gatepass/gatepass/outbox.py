@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+from . import sms
+
+
+# Retry delays grow 30s, 60s, 120s ... capped at one hour
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=1)
+
+# A claimed batch is hidden from other workers for this long; if a worker dies
+# mid-delivery the messages become due again afterwards
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def enqueue_sms(recipient, body, gatepass=None):
+    """Queue an SMS; call inside the transaction that makes it necessary"""
+    return OutboxMessage.objects.create(recipient=recipient, body=body, gatepass=gatepass)
+
+
+def backoff(attempts):
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+def due_messages(now=None):
+    return OutboxMessage.objects.filter(status='pending', next_attempt_at__lte=now or timezone.now())
+
+
+def claim_batch(batch_size, now=None):
+    """Lease up to ``batch_size`` due messages to this worker.
+
+    On PostgreSQL concurrent workers skip each other's locked rows; SQLite
+    serialises writers, so run a single delivery worker there.
+    """
+    now = now or timezone.now()
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic():
+        ids = list(
+            due_messages(now).select_for_update(skip_locked=skip_locked)
+            .order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(next_attempt_at=now + CLAIM_LEASE)
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by('id'))
+
+
+def deliver_batch(gateway=None, batch_size=None):
+    """Send one batch through the gateway; returns (sent, retried, failed)"""
+    gateway = gateway or sms.get_gateway()
+    batch_size = batch_size or settings.GATEPASS_OUTBOX_BATCH_SIZE
+    messages = claim_batch(batch_size)
+    if not messages:
+        return 0, 0, 0
+
+    try:
+        errors = gateway.send_batch(messages)
+    except Exception as e:
+        errors = {message.id: f'{type(e).__name__}: {e}' for message in messages}
+
+    now = timezone.now()
+    sent_ids = [message.id for message in messages if message.id not in errors]
+    OutboxMessage.objects.filter(id__in=sent_ids).update(status='sent', sent_at=now, last_error='')
+
+    retried = failed = 0
+    for message in messages:
+        if message.id not in errors:
+            continue
+        message.attempts += 1
+        message.last_error = str(errors[message.id])[:1000]
+        if message.attempts >= settings.GATEPASS_OUTBOX_MAX_ATTEMPTS:
+            message.status = 'failed'
+            failed += 1
+        else:
+            message.next_attempt_at = now + backoff(message.attempts)
+            retried += 1
+        message.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+    return len(sent_ids), retried, failed
@@ -0,0 +1,159 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import (
+    GatePass, ParentVerification, Notification,
+    ArchivedGatePass, ArchivedParentVerification, ArchivedNotification, Job,
+    bump_gatepass_markers, bump_notification_markers,
+)
+
+
+# Terminal states; a gatepass in any other state can still change
+ARCHIVABLE_STATUSES = ('returned', 'completed', 'warden_rejected')
+
+GATEPASS_COLUMNS = [
+    'id', 'student_id', 'hostel_id', 'student_name', 'hall_ticket_no', 'room_no', 'parent_mobile', 'student_gender',
+    'outing_date', 'outing_time', 'expected_return_date', 'expected_return_time',
+    'purpose', 'status', 'warden_approval_id', 'security_approval_id', 'warden_rejection_reason',
+    'parent_verification', 'actual_return_date', 'actual_return_time', 'return_verified_by_id',
+    'return_notes', 'warden_decided_at', 'created_at', 'updated_at',
+]
+
+VERIFICATION_COLUMNS = [
+    'id', 'gatepass_id', 'parent_mobile', 'verification_code', 'is_verified', 'verified_at', 'created_at',
+]
+
+NOTIFICATION_COLUMNS = [
+    'id', 'user_id', 'gatepass_id', 'notification_type', 'message', 'is_read', 'created_at',
+]
+
+
+def archive_cutoff(days=None):
+    """Gatepasses last updated before this moment are eligible for archiving"""
+    if days is None:
+        days = settings.GATEPASS_ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable_gatepasses(cutoff):
+    return GatePass.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size=None):
+    """Move one batch of finished gatepasses and their dependents to the archive.
+
+    Each batch runs in its own short transaction so locks are only held for
+    ``batch_size`` rows at a time. Returns the number of gatepasses archived.
+    """
+    if batch_size is None:
+        batch_size = settings.GATEPASS_ARCHIVE_BATCH_SIZE
+
+    with transaction.atomic():
+        ids = list(
+            archivable_gatepasses(cutoff).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+
+        gatepasses = list(GatePass.objects.filter(pk__in=ids).values(*GATEPASS_COLUMNS))
+        ArchivedGatePass.objects.bulk_create(ArchivedGatePass(**row) for row in gatepasses)
+        ArchivedParentVerification.objects.bulk_create(
+            ArchivedParentVerification(**row)
+            for row in ParentVerification.objects.filter(gatepass_id__in=ids).values(*VERIFICATION_COLUMNS)
+        )
+        notifications = list(Notification.objects.filter(gatepass_id__in=ids).values(*NOTIFICATION_COLUMNS))
+        ArchivedNotification.objects.bulk_create(ArchivedNotification(**row) for row in notifications)
+
+        # Dependents are removed explicitly so the cascade has nothing left to collect
+        Notification.objects.filter(gatepass_id__in=ids).delete()
+        ParentVerification.objects.filter(gatepass_id__in=ids).delete()
+        GatePass.objects.filter(pk__in=ids).delete()
+
+        # Fast deletes skip post_delete, so conditional GETs are invalidated here
+        bump_gatepass_markers(row['hostel_id'] for row in gatepasses)
+        bump_notification_markers(row['user_id'] for row in notifications)
+
+    return len(ids)
+
+
+def notification_cutoffs(read_days=None, unread_days=None):
+    """(read, unread) creation cutoffs; an unread cutoff of None keeps unread notifications"""
+    if read_days is None:
+        read_days = settings.GATEPASS_NOTIFICATION_READ_DAYS
+    if unread_days is None:
+        unread_days = settings.GATEPASS_NOTIFICATION_UNREAD_DAYS
+    now = timezone.now()
+    return now - timedelta(days=read_days), (now - timedelta(days=unread_days) if unread_days else None)
+
+
+def prunable_notifications(read_cutoff, unread_cutoff=None):
+    condition = Q(is_read=True, created_at__lt=read_cutoff)
+    if unread_cutoff is not None:
+        condition |= Q(is_read=False, created_at__lt=unread_cutoff)
+    return Notification.objects.filter(condition)
+
+
+def prune_upper_bound(read_cutoff, unread_cutoff=None):
+    """Highest notification id old enough to be pruned; newer ids are never scanned"""
+    oldest = max(read_cutoff, unread_cutoff) if unread_cutoff is not None else read_cutoff
+    return Notification.objects.filter(created_at__lt=oldest).aggregate(Max('pk'))['pk__max']
+
+
+def prune_notification_batch(read_cutoff, unread_cutoff=None, after=0, upper=None, batch_size=None, archive=False):
+    """Delete (or archive) the next batch of prunable notifications with ids in (after, upper].
+
+    Walking the primary key keeps every batch an index range scan that resumes
+    where the previous one stopped, and each batch commits on its own so row
+    locks are only held for ``batch_size`` rows. Returns ``(pruned, last_id)``;
+    ``last_id`` is None once the range is exhausted.
+    """
+    if batch_size is None:
+        batch_size = settings.GATEPASS_NOTIFICATION_PRUNE_BATCH_SIZE
+
+    with transaction.atomic():
+        candidates = prunable_notifications(read_cutoff, unread_cutoff).filter(pk__gt=after)
+        if upper is not None:
+            candidates = candidates.filter(pk__lte=upper)
+        rows = list(candidates.order_by('pk').values('pk', 'user_id')[:batch_size])
+        if not rows:
+            return 0, None
+        ids = [row['pk'] for row in rows]
+
+        if archive:
+            ArchivedNotification.objects.bulk_create(
+                ArchivedNotification(**row)
+                for row in Notification.objects.filter(pk__in=ids).values(*NOTIFICATION_COLUMNS)
+            )
+        Notification.objects.filter(pk__in=ids).delete()
+        bump_notification_markers(row['user_id'] for row in rows)
+
+    return len(ids), ids[-1]
+
+
+# Finished background jobs are only kept for their timings and errors
+FINISHED_JOB_STATUSES = ('done', 'failed')
+
+
+def finished_jobs(cutoff):
+    return Job.objects.filter(status__in=FINISHED_JOB_STATUSES, finished_at__lt=cutoff)
+
+
+def jobs_cutoff(days=None):
+    if days is None:
+        days = settings.GATEPASS_JOBS_KEEP_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def prune_job_batch(cutoff, batch_size=None):
+    """Delete the next batch of jobs that finished before ``cutoff``; returns how many went"""
+    if batch_size is None:
+        batch_size = settings.GATEPASS_JOBS_PRUNE_BATCH_SIZE
+    with transaction.atomic():
+        ids = list(finished_jobs(cutoff).order_by('finished_at').values_list('pk', flat=True)[:batch_size])
+        if ids:
+            Job.objects.filter(pk__in=ids).delete()
+    return len(ids)
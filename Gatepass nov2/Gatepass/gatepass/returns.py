@@ -0,0 +1,110 @@
+import re
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import GatePass, Student, Notification, bump_gatepass_markers, bump_notification_markers
+from .signals import gatepass_status_changed
+
+
+OUT_STATUS = 'security_approved'
+
+# GatePass.pass_token ("GP-<id>", shown on the student's pass); anything else is read as a hall ticket
+PASS_TOKEN = re.compile(r'^(?:GP-?|#)(\d+)$', re.IGNORECASE)
+
+MAX_ITEMS = 200
+
+# Per-item outcomes
+RETURNED = 'returned'
+NOT_FOUND = 'not_found'
+NOT_OUT = 'not_out'
+DUPLICATE = 'duplicate'
+
+
+def parse_items(raw):
+    """Split scanner or typed input (newlines, commas, spaces) into upper-cased items, keeping order.
+
+    Hall tickets are stored upper-case (models.normalize_hall_ticket), so the
+    lookups below can stay exact and use the unique index.
+    """
+    if isinstance(raw, str):
+        raw = re.split(r'[\s,;]+', raw)
+    return [item.strip().upper() for item in raw if isinstance(item, str) and item.strip()]
+
+
+def record_returns(items, guard, notes='', now=None):
+    """Record the return of every pass in ``items`` in one transaction.
+
+    Items are pass tokens or hall tickets (the student's pass that is
+    currently out). Returns one ``{'item', 'result', 'gatepass_id',
+    'student_name'}`` dict per item, in input order.
+    """
+    now = now or timezone.now()
+    local_now = timezone.localtime(now)
+    tokens = {item: int(match.group(1)) for item in items if (match := PASS_TOKEN.match(item))}
+    tickets = [item for item in items if item not in tokens]
+
+    with transaction.atomic():
+        out = GatePass.objects.filter(status=OUT_STATUS)
+        ids_by_ticket = {}
+        for gatepass_id, ticket in (
+            out.filter(hall_ticket_no__in=tickets).order_by('created_at').values_list('id', 'hall_ticket_no')
+        ):
+            ids_by_ticket[ticket] = gatepass_id
+        candidate_ids = set(tokens.values()) | set(ids_by_ticket.values())
+        gatepasses = out.select_for_update().select_related('student__user').in_bulk(candidate_ids)
+
+        # Distinguish unknown items from students or passes that are not out
+        known_ids = set(GatePass.objects.filter(pk__in=tokens.values()).values_list('id', flat=True))
+        known_tickets = set(Student.objects.filter(hall_ticket_no__in=tickets).values_list('hall_ticket_no', flat=True))
+
+        results, returned, seen = [], [], set()
+        for item in items:
+            gatepass_id = tokens.get(item, ids_by_ticket.get(item))
+            gatepass = gatepasses.get(gatepass_id)
+            if gatepass is not None and gatepass_id in seen:
+                result = DUPLICATE
+            elif gatepass is not None:
+                seen.add(gatepass_id)
+                result = RETURNED
+                gatepass.status = 'returned'
+                gatepass.actual_return_date = local_now.date()
+                gatepass.actual_return_time = local_now.time().replace(microsecond=0)
+                gatepass.return_verified_by = guard
+                gatepass.return_notes = notes or gatepass.return_notes
+                # bulk_update skips auto_now; the deadline scheduler and list caches key on updated_at
+                gatepass.updated_at = now
+                returned.append(gatepass)
+            elif (item in tokens and tokens[item] in known_ids) or item in known_tickets:
+                result = NOT_OUT
+            else:
+                result = NOT_FOUND
+            results.append({
+                'item': item,
+                'result': result,
+                'gatepass_id': gatepass.pk if gatepass is not None else None,
+                'student_name': gatepass.student_name if gatepass is not None else None,
+            })
+
+        GatePass.objects.bulk_update(returned, [
+            'status', 'actual_return_date', 'actual_return_time', 'return_verified_by', 'return_notes', 'updated_at',
+        ])
+        Notification.objects.bulk_create([
+            Notification(
+                user=gatepass.student.user,
+                gatepass=gatepass,
+                notification_type='return_recorded',
+                message=f"Your return has been recorded on {gatepass.actual_return_date} at {gatepass.actual_return_time}"
+            )
+            for gatepass in returned
+        ])
+        # bulk_update bypasses post_save, so the rollups and ETag markers are told directly
+        if returned:
+            bump_gatepass_markers(gatepass.hostel_id for gatepass in returned)
+            bump_notification_markers(gatepass.student.user_id for gatepass in returned)
+        for gatepass in returned:
+            gatepass._loaded_status = gatepass.status
+            gatepass_status_changed.send(
+                sender=GatePass, gatepass=gatepass, previous_status=OUT_STATUS, status=gatepass.status
+            )
+    return results
@@ -0,0 +1,208 @@
+import sqlite3
+
+from django.db import connection, OperationalError
+from django.db.models import Prefetch, Q
+
+from .models import Student, GatePass
+
+
+MIN_QUERY_LENGTH = 2
+MAX_RESULTS = 50
+
+# Statuses of a gatepass that still needs the gate's attention
+ACTIVE_STATUSES = ('pending', 'warden_approved', 'security_approved')
+
+# FTS5 table over gatepass_student, kept in sync by triggers (see install_search_index)
+SQLITE_SEARCH_TABLE = 'gatepass_student_search'
+
+SEARCH_COLUMNS = ['student_name', 'hall_ticket_no', 'room_no', 'parent_mobile']
+
+POSTGRES_INDEXES = {
+    'gatepass_student_name_trgm': 'UPPER(student_name) gin_trgm_ops',
+    'gatepass_student_ticket_trgm': 'UPPER(hall_ticket_no) gin_trgm_ops',
+    'gatepass_student_room_trgm': 'UPPER(room_no) gin_trgm_ops',
+    'gatepass_student_parent_trgm': 'parent_mobile gin_trgm_ops',
+}
+
+
+def sqlite_has_trigram():
+    """The FTS5 trigram tokenizer (substring matching) needs SQLite 3.34+"""
+    return sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def _sqlite_triggers():
+    columns = ', '.join(SEARCH_COLUMNS)
+    new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+    old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+    insert = f'INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});'
+    delete = (
+        f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    return {
+        f'{SQLITE_SEARCH_TABLE}_ai': f'AFTER INSERT ON gatepass_student BEGIN {insert} END',
+        f'{SQLITE_SEARCH_TABLE}_ad': f'AFTER DELETE ON gatepass_student BEGIN {delete} END',
+        f'{SQLITE_SEARCH_TABLE}_au': f'AFTER UPDATE ON gatepass_student BEGIN {delete} {insert} END',
+    }
+
+
+def install_search_index(connection):
+    """Create the backend-specific student search index if it is missing.
+
+    Idempotent, so it also runs after every migrate: SQLite drops triggers
+    whenever a migration rebuilds gatepass_student, and the FTS index is
+    rebuilt from the table if any part of it had to be recreated.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for name, expression in POSTGRES_INDEXES.items():
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON gatepass_student USING gin ({expression})')
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            existing = {row[0] for row in cursor.fetchall()}
+            if 'gatepass_student' not in existing:
+                return
+            missing = False
+            if SQLITE_SEARCH_TABLE not in existing:
+                tokenize = "tokenize='trigram'" if sqlite_has_trigram() else "prefix='2 3 4'"
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {SQLITE_SEARCH_TABLE} USING fts5({', '.join(SEARCH_COLUMNS)}, "
+                    f"content='gatepass_student', content_rowid='id', {tokenize})"
+                )
+                missing = True
+            for name, body in _sqlite_triggers().items():
+                if name not in existing:
+                    cursor.execute(f'CREATE TRIGGER {name} {body}')
+                    missing = True
+            if missing:
+                cursor.execute(f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+def remove_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for name in POSTGRES_INDEXES:
+                cursor.execute(f'DROP INDEX IF EXISTS {name}')
+        elif connection.vendor == 'sqlite':
+            for name in _sqlite_triggers():
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}')
+
+
+def normalize_query(query):
+    return ' '.join((query or '').split())
+
+
+def search_students(query, limit=20):
+    """Find students by partial name, hall ticket, room or parent mobile.
+
+    Uses pg_trgm indexes on PostgreSQL and an FTS5 index on SQLite; other
+    backends (and queries too short for trigrams) fall back to indexed
+    prefix matches. Results are ranked, best match first, and each student
+    carries ``active_gatepasses`` (newest first).
+    """
+    ranked_ids = ranked_student_ids(query, limit)
+    students = Student.objects.select_related('user').prefetch_related(
+        Prefetch(
+            'gatepass_requests',
+            queryset=GatePass.objects.filter(status__in=ACTIVE_STATUSES).order_by('-created_at'),
+            to_attr='active_gatepasses',
+        )
+    ).in_bulk(ranked_ids)
+    return [students[student_id] for student_id in ranked_ids if student_id in students]
+
+
+def ranked_student_ids(query, limit=20):
+    """Ids of the students matching ``query``, best match first, through the search index"""
+    query = normalize_query(query)
+    if len(query) < MIN_QUERY_LENGTH:
+        return []
+    limit = min(limit, MAX_RESULTS)
+
+    if connection.vendor == 'postgresql':
+        ranked_ids = _search_postgres(query, limit)
+    elif connection.vendor == 'sqlite' and len(query) >= 3:
+        ranked_ids = _search_sqlite(query, limit)
+    else:
+        ranked_ids = _search_prefix(query, limit)
+
+    # Exact identifier hits always outrank fuzzy name matches
+    exact_ids = list(
+        Student.objects.filter(
+            Q(hall_ticket_no__iexact=query) | Q(parent_mobile=query) | Q(room_no__iexact=query)
+        ).values_list('id', flat=True)[:limit]
+    )
+    return list(dict.fromkeys(exact_ids + ranked_ids))[:limit]
+
+
+def _search_prefix(query, limit):
+    return list(
+        Student.objects.filter(
+            Q(hall_ticket_no__istartswith=query)
+            | Q(student_name__istartswith=query)
+            | Q(room_no__istartswith=query)
+            | Q(parent_mobile__startswith=query)
+        ).order_by('student_name').values_list('id', flat=True)[:limit]
+    )
+
+
+def _search_postgres(query, limit):
+    # Imported lazily: requires psycopg, which SQLite deployments do not install
+    from django.contrib.postgres.search import TrigramSimilarity
+    from django.db.models.functions import Greatest
+
+    return list(
+        Student.objects.filter(
+            Q(student_name__icontains=query)
+            | Q(hall_ticket_no__icontains=query)
+            | Q(room_no__istartswith=query)
+            | Q(parent_mobile__contains=query)
+        ).annotate(
+            rank=Greatest(
+                TrigramSimilarity('student_name', query),
+                TrigramSimilarity('hall_ticket_no', query),
+                TrigramSimilarity('room_no', query),
+                TrigramSimilarity('parent_mobile', query),
+            )
+        ).order_by('-rank', 'student_name').values_list('id', flat=True)[:limit]
+    )
+
+
+def _search_sqlite(query, limit):
+    # Quote as a single FTS5 string so user input is never parsed as query syntax
+    match = '"' + query.replace('"', '""') + '"'
+    if not sqlite_has_trigram():
+        match += '*'
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s '
+                f'ORDER BY rank LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+    except OperationalError:
+        # SQLite built without FTS5: the index could not be created
+        return _search_prefix(query, limit)
+
+
+def serialize_student(student):
+    """Compact JSON-ready representation used by the search endpoints"""
+    active = student.active_gatepasses[0] if student.active_gatepasses else None
+    return {
+        'id': student.id,
+        'student_name': student.student_name,
+        'hall_ticket_no': student.hall_ticket_no,
+        'room_no': student.room_no,
+        'parent_mobile': student.parent_mobile,
+        'gender': student.user.gender,
+        'active_gatepass': {
+            'id': active.id,
+            'status': active.status,
+            'outing_date': active.outing_date,
+            'outing_time': active.outing_time,
+            'expected_return_date': active.expected_return_date,
+            'expected_return_time': active.expected_return_time,
+        } if active else None,
+    }
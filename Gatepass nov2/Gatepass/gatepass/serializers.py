@@ -1,3 +1,5 @@
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
 from .models import User, Student, GatePass, ParentVerification
 
@@ -16,7 +18,23 @@ class StudentSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'hall_ticket_no', 'student_name', 'room_no', 'parent_name', 'parent_mobile']
 
 
-class GatePassSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Output only ``fields`` (all when None), plus any of ``Meta.expandable`` named in ``expand``"""
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            keep = set(fields) | (set(expand) & set(getattr(self.Meta, 'expandable', ())))
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+    @classmethod
+    def readable_fields(cls):
+        write_only = getattr(cls.Meta, 'write_only', ())
+        return [name for name in cls.Meta.fields if name not in write_only]
+
+
+class GatePassSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student = StudentSerializer(read_only=True)
     student_id = serializers.PrimaryKeyRelatedField(write_only=True, queryset=Student.objects.all(), source='student')
 
@@ -25,8 +43,83 @@ class GatePassSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'student', 'student_id', 'outing_date', 'outing_time', 'expected_return_date',
             'expected_return_time', 'purpose', 'status', 'warden_approval', 'security_approval',
-            'actual_return_date', 'actual_return_time', 'created_at'
+            'actual_return_date', 'actual_return_time', 'created_at', 'updated_at'
         ]
+        write_only = ['student_id']
+        expandable = ['student']
+
+    @staticmethod
+    def optimize_queryset(queryset, fields=None, expand=()):
+        """Load only the columns (and joins) the requested representation reads"""
+        if fields is None:
+            return queryset.select_related('student__user')
+        wanted = set(fields) | set(expand)
+        if 'student' in wanted:
+            queryset = queryset.select_related('student__user')
+        return queryset.only('id', *wanted)
+
+
+class GatePassListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Flat gatepass representation read from the GatePass row alone (no joins)"""
+
+    class Meta:
+        model = GatePass
+        fields = [
+            'id', 'student_id', 'student_name', 'hall_ticket_no', 'room_no', 'student_gender',
+            'outing_date', 'outing_time', 'expected_return_date', 'expected_return_time',
+            'outing_at', 'expected_return_at', 'purpose', 'status', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+def _datetime(value):
+    # Same as DRF's DateTimeField: current time zone, ISO 8601, "Z" for UTC
+    value = timezone.localtime(value).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+class ValuesSerializer:
+    """Serialize plain model columns straight from ``QuerySet.values()``.
+
+    Produces the same output as an equivalent read-only ModelSerializer but
+    skips building model instances and per-field serializer calls, for large
+    read-only lists.
+    """
+
+    def __init__(self, model, fields):
+        self.fields = list(fields)
+        self.converters = [
+            (name, convert) for name in self.fields if (convert := self._converter(model, name)) is not None
+        ]
+
+    @staticmethod
+    def _converter(model, name):
+        field = model._meta.get_field(name)
+        if isinstance(field, models.DateTimeField):
+            return _datetime
+        if isinstance(field, (models.DateField, models.TimeField)):
+            return _isoformat
+        return None
+
+    def serialize(self, queryset, fields=None):
+        """Rows as dicts; ``fields`` narrows the output to a subset of the columns"""
+        columns, converters = self.fields, self.converters
+        if fields is not None:
+            columns = [name for name in self.fields if name in fields]
+            converters = [(name, convert) for name, convert in converters if name in fields]
+        rows = list(queryset.values(*columns))
+        for row in rows:
+            for name, convert in converters:
+                if row[name] is not None:
+                    row[name] = convert(row[name])
+        return rows
+
+
+gatepass_list_values = ValuesSerializer(GatePass, GatePassListSerializer.Meta.fields)
 
 
 class ParentVerificationSerializer(serializers.ModelSerializer):
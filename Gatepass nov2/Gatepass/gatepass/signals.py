@@ -0,0 +1,152 @@
+from django.db import connections, transaction
+from django.db.models.signals import pre_save, post_save, post_delete, post_migrate
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from . import analytics, occupancy, search, student_stats, user_cache
+from .models import (
+    User, Student, Warden, Security, GatePass, ArchivedGatePass, Notification, ChangeMarker,
+    USERS_SCOPE, bump_gatepass_markers, bump_notification_markers, normalize_hall_ticket,
+)
+
+
+# Sent after a GatePass is saved with a different status than it was loaded with.
+# Receivers get ``gatepass``, ``previous_status`` (None for a new gatepass) and ``status``.
+# Code that changes statuses with ``QuerySet.update()``/``bulk_update()`` must send it itself.
+gatepass_status_changed = Signal()
+
+WARDEN_DECISIONS = ('warden_approved', 'warden_rejected')
+
+
+@receiver(pre_save, sender=GatePass)
+def stamp_warden_decision(sender, instance, **kwargs):
+    """Record when a pending gatepass was first approved or rejected"""
+    if instance.status in WARDEN_DECISIONS and instance.warden_decided_at is None:
+        instance.warden_decided_at = timezone.now()
+
+
+@receiver(pre_save, sender=GatePass)
+def fill_deadlines(sender, instance, **kwargs):
+    instance.sync_deadlines()
+
+
+@receiver(pre_save, sender=GatePass)
+def fill_student_snapshot(sender, instance, **kwargs):
+    if instance._state.adding and not instance.student_name:
+        instance.copy_student_snapshot()
+
+
+@receiver(pre_save, sender=Student)
+def normalize_student_hall_ticket(sender, instance, **kwargs):
+    instance.hall_ticket_no = normalize_hall_ticket(instance.hall_ticket_no)
+
+
+@receiver(post_save, sender=Student)
+def sync_student_snapshot(sender, instance, created, **kwargs):
+    """Push profile edits to the copies held on the student's gatepasses"""
+    if created:
+        return
+    snapshot = instance.gatepass_snapshot()
+    stale = GatePass.all_hostels.filter(student=instance).exclude(**snapshot)
+    with transaction.atomic():
+        # Occupancy is bucketed by the snapshot, so passes that are out move with it
+        occupancy.move_out_passes(stale, **snapshot)
+        # A hostel move changes the lists of the old hostel and the new one
+        hostel_ids = set(stale.values_list('hostel_id', flat=True))
+        if hostel_ids:
+            # updated_at is bumped so cached list fragments pick up the change
+            stale.update(**snapshot, updated_at=timezone.now())
+            bump_gatepass_markers(hostel_ids | {instance.hostel_id})
+    ArchivedGatePass.objects.filter(student=instance).exclude(**snapshot).update(**snapshot)
+
+
+@receiver(post_save, sender=User)
+def sync_student_gender(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.role != 'student' or (update_fields and 'gender' not in update_fields):
+        return
+    gender = instance.gender or ''
+    stale = GatePass.all_hostels.filter(student__user=instance).exclude(student_gender=gender)
+    with transaction.atomic():
+        occupancy.move_out_passes(stale, student_gender=gender)
+        hostel_ids = set(stale.values_list('hostel_id', flat=True))
+        if hostel_ids:
+            stale.update(student_gender=gender, updated_at=timezone.now())
+            bump_gatepass_markers(hostel_ids)
+    ArchivedGatePass.objects.filter(student__user=instance).exclude(student_gender=gender).update(
+        student_gender=gender
+    )
+
+
+@receiver(post_save, sender=GatePass)
+def dispatch_status_change(sender, instance, created, **kwargs):
+    if created:
+        previous_status = None
+    elif hasattr(instance, '_loaded_status'):
+        previous_status = instance._loaded_status
+        if previous_status == instance.status:
+            return
+    else:
+        # Status was never loaded (e.g. deferred), so the transition is unknown
+        return
+    instance._loaded_status = instance.status
+    gatepass_status_changed.send(
+        sender=GatePass, gatepass=instance, previous_status=previous_status, status=instance.status
+    )
+
+
+# Change markers behind the dashboard and API ETags (gatepass/conditional.py),
+# bumped when the write commits. Bulk writes and deletes (QuerySet.update/delete,
+# bulk_create, bulk_update) bump them explicitly; post_delete receivers here
+# would disable fast deletes.
+
+@receiver(post_save, sender=GatePass)
+def bump_gatepasses(sender, instance, **kwargs):
+    bump_gatepass_markers([instance.hostel_id])
+
+
+@receiver(post_save, sender=Notification)
+def bump_notifications(sender, instance, **kwargs):
+    bump_notification_markers([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users(sender, **kwargs):
+    ChangeMarker.bump(USERS_SCOPE)
+
+
+@receiver(gatepass_status_changed)
+def update_daily_stats(sender, gatepass, previous_status, status, **kwargs):
+    analytics.record_transition(gatepass, previous_status, status)
+
+
+@receiver(gatepass_status_changed)
+def update_occupancy(sender, gatepass, previous_status, status, **kwargs):
+    occupancy.record_transition(gatepass, previous_status, status)
+
+
+@receiver(gatepass_status_changed)
+def update_student_stats(sender, gatepass, previous_status, status, **kwargs):
+    student_stats.record_transition(gatepass, previous_status, status)
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using, **kwargs):
+    if sender.name == 'gatepass':
+        search.install_search_index(connections[using])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Warden)
+@receiver(post_save, sender=Security)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Warden)
+@receiver(post_delete, sender=Security)
+def evict_cached_profile_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
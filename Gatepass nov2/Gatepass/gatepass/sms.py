@@ -0,0 +1,66 @@
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class SMSGateway:
+    """Delivers a batch of outbox messages.
+
+    ``send_batch`` returns ``{message_id: error}`` for the messages that could
+    not be delivered; every message not in the result counts as sent.
+    """
+
+    def send_batch(self, messages):
+        raise NotImplementedError
+
+
+class FileGateway(SMSGateway):
+    """Local stub: appends each message as a JSON line to ``GATEPASS_SMS_FILE``"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or settings.GATEPASS_SMS_FILE)
+
+    def send_batch(self, messages):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for message in messages:
+                f.write(json.dumps({
+                    'id': message.id,
+                    'to': message.recipient,
+                    'body': message.body,
+                    'sent_at': timezone.now().isoformat(),
+                }) + '\n')
+        return {}
+
+
+class HTTPGateway(SMSGateway):
+    """POSTs the whole batch as JSON to ``GATEPASS_SMS_HTTP_URL``.
+
+    The provider (or a local stub server) answers with ``{"failed": {"<id>": "reason"}}``
+    for messages it rejected; a transport error fails the whole batch.
+    """
+
+    def __init__(self, url=None, timeout=None):
+        self.url = url or settings.GATEPASS_SMS_HTTP_URL
+        self.timeout = timeout or settings.GATEPASS_SMS_HTTP_TIMEOUT
+
+    def send_batch(self, messages):
+        payload = json.dumps({
+            'messages': [{'id': m.id, 'to': m.recipient, 'body': m.body} for m in messages],
+        }).encode()
+        request = urllib.request.Request(self.url, data=payload, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read() or b'{}')
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return {message.id: str(e) for message in messages}
+        return {int(message_id): error for message_id, error in result.get('failed', {}).items()}
+
+
+def get_gateway():
+    return import_string(settings.GATEPASS_SMS_GATEWAY)()
@@ -0,0 +1,85 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import GatePass, ArchivedGatePass, StudentGatePassStats
+
+
+COUNT_FIELDS = ['total_count', 'pending_count', 'approved_count', 'rejected_count']
+
+# Dashboard buckets; returned and completed passes only count towards the total
+BUCKETS = {
+    'pending': 'pending_count',
+    'warden_approved': 'approved_count',
+    'security_approved': 'approved_count',
+    'warden_rejected': 'rejected_count',
+}
+
+
+def transition_increments(previous_status, status):
+    """Counter changes caused by a single status transition"""
+    increments = Counter()
+    if previous_status is None:
+        increments['total_count'] += 1
+    if previous_status in BUCKETS:
+        increments[BUCKETS[previous_status]] -= 1
+    if status in BUCKETS:
+        increments[BUCKETS[status]] += 1
+    return {field: value for field, value in increments.items() if value}
+
+
+def expected_counts(student_ids=None):
+    """Counters recomputed from live and archived gatepasses, keyed by student id"""
+    counts = defaultdict(lambda: dict.fromkeys(COUNT_FIELDS, 0))
+    for model in (GatePass.all_hostels, ArchivedGatePass.objects):
+        rows = model.all()
+        if student_ids is not None:
+            rows = rows.filter(student_id__in=student_ids)
+        for student_id, status, n in rows.values_list('student_id', 'status').annotate(n=Count('id')).order_by():
+            counts[student_id]['total_count'] += n
+            if status in BUCKETS:
+                counts[student_id][BUCKETS[status]] += n
+    return counts
+
+
+def rebuild_student(student_id):
+    """Recount one student's passes; used the first time a student's counters are needed"""
+    counters = expected_counts([student_id])[student_id]
+    stats, _ = StudentGatePassStats.objects.update_or_create(student_id=student_id, defaults=counters)
+    return stats
+
+
+def record_transition(gatepass, previous_status, status):
+    increments = transition_increments(previous_status, status)
+    if not increments:
+        return
+    updated = StudentGatePassStats.objects.filter(student_id=gatepass.student_id).update(
+        updated_at=timezone.now(), **{field: F(field) + value for field, value in increments.items()}
+    )
+    if not updated:
+        # The recount already sees this transition, which was saved before the signal
+        rebuild_student(gatepass.student_id)
+
+
+def counts(student):
+    """The student's dashboard counters, from one indexed row"""
+    stats = StudentGatePassStats.objects.filter(student=student).first() or rebuild_student(student.pk)
+    return {field: getattr(stats, field) for field in COUNT_FIELDS}
+
+
+def reconcile():
+    """Rewrite drifted counters; returns {student_id: (stored, expected)}"""
+    expected = expected_counts()
+    with transaction.atomic():
+        stored = {stats.student_id: stats for stats in StudentGatePassStats.objects.select_for_update()}
+        drift = {}
+        for student_id in set(stored) | set(expected):
+            stats = stored.get(student_id)
+            current = {field: getattr(stats, field) for field in COUNT_FIELDS} if stats else dict.fromkeys(COUNT_FIELDS, 0)
+            if current == expected[student_id]:
+                continue
+            drift[student_id] = (current, expected[student_id])
+            StudentGatePassStats.objects.update_or_create(student_id=student_id, defaults=expected[student_id])
+    return drift
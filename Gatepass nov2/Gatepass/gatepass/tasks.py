@@ -0,0 +1,51 @@
+from django.core.management import call_command
+
+from .jobs import job
+from .models import User, GatePass, Notification, bump_notification_markers
+from . import deadlines, outbox
+
+
+@job('notify_overdue_passes')
+def notify_overdue_passes():
+    return deadlines.notify_overdue_passes()
+
+
+@job('notify_wardens_of_request')
+def notify_wardens_of_request(gatepass_id):
+    """Tell the wardens of the student's hostel about a new request.
+
+    Without hostel wardens this falls back to the wardens of the student's
+    gender, then to every warden.
+    """
+    gatepass = GatePass.all_hostels.get(pk=gatepass_id)
+    message = f"New gatepass request from {gatepass.student_name}"
+    wardens = User.objects.none()
+    if gatepass.hostel_id:
+        wardens = User.objects.filter(role='warden', is_approved=True, warden_profile__hostel_id=gatepass.hostel_id)
+    if not wardens.exists():
+        wardens = User.objects.filter(role='warden', is_approved=True, gender=gatepass.student_gender)
+    if not wardens.exists():
+        wardens = User.objects.filter(role='warden', is_approved=True)
+        message += " (No gender-specific warden found)"
+    notifications = Notification.objects.bulk_create([
+        Notification(user=warden_user, gatepass=gatepass, notification_type='gatepass_request', message=message)
+        for warden_user in wardens
+    ])
+    bump_notification_markers(notification.user_id for notification in notifications)
+
+
+@job('deliver_outbox')
+def deliver_outbox():
+    """Drain the SMS outbox"""
+    while any(outbox.deliver_batch()):
+        pass
+
+
+@job('backup_db')
+def backup_db(**options):
+    call_command('backup_db', **options)
+
+
+@job('export_gatepasses')
+def export_gatepasses(**options):
+    call_command('export_gatepasses', **options)
@@ -0,0 +1,56 @@
+from datetime import date, time
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import User, Student, GatePass, Notification
+from .pagination import EstimatedCountPaginator
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminChangelistTest(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='Password123')
+        self.client.force_login(self.admin)
+        # Load the signed-in user into the user cache so every measured request starts warm
+        self.client.get(reverse('admin:index'))
+
+    def add_students(self, start, count):
+        for n in range(start, start + count):
+            user = User.objects.create_user(
+                username=f'student{n}', email=f'student{n}@example.com', password='x', role='student'
+            )
+            student = Student.objects.create(
+                user=user, hall_ticket_no=f'22BH1A{n:04d}', student_name=f'Student {n}', room_no='101',
+                parent_name='Parent', parent_mobile=f'90000{n:05d}',
+            )
+            gatepass = GatePass.objects.create(
+                student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), purpose='Outing',
+            )
+            Notification.objects.create(
+                user=user, gatepass=gatepass, notification_type='gatepass_request', message='Created'
+            )
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:gatepass_{model}_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelists_do_not_query_per_row(self):
+        self.add_students(0, 2)
+        before = {model: self.changelist_queries(model) for model in ('student', 'gatepass', 'notification')}
+        self.add_students(2, 5)
+        after = {model: self.changelist_queries(model) for model in ('student', 'gatepass', 'notification')}
+        self.assertEqual(after, before)
+
+    def test_estimated_count_only_for_large_unfiltered_lists(self):
+        with mock.patch('gatepass.pagination.estimated_row_count', return_value=5000000):
+            self.assertEqual(EstimatedCountPaginator(GatePass.objects.all(), 100).count, 5000000)
+            self.assertEqual(EstimatedCountPaginator(GatePass.objects.filter(status='pending'), 100).count, 0)
+        self.assertEqual(EstimatedCountPaginator(GatePass.objects.all(), 100).count, 0)
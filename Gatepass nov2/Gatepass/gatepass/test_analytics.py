@@ -0,0 +1,86 @@
+from datetime import date, time
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import analytics
+from .models import User, Student, GatePass, DailyGatePassStats
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class DailyGatePassStatsTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='student1', email='student1@example.com', password='Password123', role='student')
+        self.student = Student.objects.create(
+            user=user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+
+    def _gatepass(self):
+        return GatePass.objects.create(
+            student=self.student,
+            outing_date=timezone.localdate(),
+            outing_time=time(10, 0),
+            expected_return_date=timezone.localdate(),
+            expected_return_time=time(18, 0),
+        )
+
+    def _run_lifecycle(self):
+        approved = self._gatepass()
+        approved.status = 'warden_approved'
+        approved.save()
+        approved = GatePass.objects.get(pk=approved.pk)
+        approved.status = 'security_approved'
+        approved.save()
+        approved.status = 'returned'
+        approved.save()
+
+        rejected = self._gatepass()
+        rejected.status = 'warden_rejected'
+        rejected.save()
+
+        self._gatepass()
+
+    def test_transitions_update_todays_rollup(self):
+        self._run_lifecycle()
+
+        stats = DailyGatePassStats.objects.get(date=timezone.localdate())
+        self.assertEqual(stats.created_count, 3)
+        self.assertEqual(stats.warden_approved_count, 1)
+        self.assertEqual(stats.warden_rejected_count, 1)
+        self.assertEqual(stats.exit_count, 1)
+        self.assertEqual(stats.return_count, 1)
+        self.assertEqual(stats.approval_latency_samples, 2)
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self._run_lifecycle()
+        incremental = analytics.totals()
+
+        analytics.rebuild_daily_stats()
+
+        self.assertEqual(analytics.totals(), incremental)
+
+    def test_superadmin_dashboard_reads_rollup(self):
+        self._run_lifecycle()
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password='Password123', role='superadmin', is_approved=True)
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('superadmin_dashboard'))
+        self.assertEqual(response.context['total_gatepasses'], 3)
+        self.assertEqual(response.context['pending_gatepasses'], 1)
+
+        # Removing a pending pass leaves the rollup alone but not the pending count
+        GatePass.objects.filter(status='pending').delete()
+        response = self.client.get(reverse('superadmin_dashboard'))
+        self.assertEqual(response.context['total_gatepasses'], 3)
+        self.assertEqual(response.context['pending_gatepasses'], 0)
+
+        response = self.client.get(reverse('superadmin_analytics'), {'days': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['period']['created_count'], 3)
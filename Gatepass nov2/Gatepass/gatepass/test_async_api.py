@@ -0,0 +1,97 @@
+from datetime import date, time
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .models import User, Student, GatePass, Notification
+
+
+class AsyncAPIParityTest(TestCase):
+    """The async endpoints must answer exactly like their DRF counterparts"""
+
+    def setUp(self):
+        self.warden = User.objects.create_user(
+            username='warden', email='warden@example.com', password='Password123', role='warden', is_approved=True
+        )
+        self.guard = User.objects.create_user(
+            username='guard', email='guard@example.com', password='Password123', role='security', is_approved=True
+        )
+        student_user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student', gender='M'
+        )
+        self.student = Student.objects.create(
+            user=student_user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+        self.gatepasses = [
+            GatePass.objects.create(
+                student=self.student,
+                outing_date=date(2025, 1, day),
+                outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, day),
+                expected_return_time=time(18, 0),
+                purpose=f'Outing {day}',
+            )
+            for day in (1, 2)
+        ]
+
+    def auth(self, user):
+        token, _ = Token.objects.get_or_create(user=user)
+        return {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+    def test_login_parity(self):
+        payload = {'username': 'student1', 'password': 'Password123'}
+        sync = self.client.post(reverse('api_login'), payload, content_type='application/json')
+        async_ = self.client.post(reverse('api_async_login'), payload, content_type='application/json')
+        self.assertEqual(sync.status_code, 200)
+        self.assertEqual(async_.json(), sync.json())
+
+        payload['password'] = 'wrong'
+        sync = self.client.post(reverse('api_login'), payload, content_type='application/json')
+        async_ = self.client.post(reverse('api_async_login'), payload, content_type='application/json')
+        self.assertEqual((async_.status_code, async_.json()), (sync.status_code, sync.json()))
+
+    def test_list_parity(self):
+        for user in (self.student.user, self.warden):
+            sync = self.client.get(reverse('api_gatepass_list_create'), **self.auth(user))
+            async_ = self.client.get(reverse('api_async_gatepass_list'), **self.auth(user))
+            self.assertEqual(async_.json(), sync.json())
+        self.assertEqual(self.client.get(reverse('api_async_gatepass_list')).status_code, 401)
+
+    def test_approve_parity(self):
+        first, second = self.gatepasses
+        sync = self.client.post(reverse('api_warden_approve', args=[first.id]), **self.auth(self.warden))
+        async_ = self.client.post(reverse('api_async_warden_approve', args=[second.id]), **self.auth(self.warden))
+        self.assertEqual(async_.json(), sync.json())
+
+        sync = self.client.post(reverse('api_security_approve', args=[first.id]), **self.auth(self.guard))
+        async_ = self.client.post(reverse('api_async_security_approve', args=[second.id]), **self.auth(self.guard))
+        self.assertEqual(async_.json(), sync.json())
+
+        for gatepass in self.gatepasses:
+            gatepass.refresh_from_db()
+            self.assertEqual(gatepass.status, 'security_approved')
+            self.assertEqual(gatepass.warden_approval, self.warden)
+            self.assertEqual(gatepass.security_approval, self.guard)
+
+        denied = self.client.post(reverse('api_async_warden_approve', args=[first.id]), **self.auth(self.guard))
+        self.assertEqual(denied.status_code, 403)
+
+    def test_unread_count_long_poll(self):
+        user = self.student.user
+        Notification.objects.create(
+            user=user, gatepass=self.gatepasses[0], notification_type='gatepass_request', message='Created'
+        )
+        sync = self.client.get(reverse('api_notification_unread_count'), **self.auth(user))
+        async_ = self.client.get(reverse('api_async_notification_unread_count'), **self.auth(user))
+        self.assertEqual(async_.json(), sync.json())
+
+        # A stale count is answered at once, a current one after the wait
+        url = reverse('api_async_notification_unread_count')
+        self.assertEqual(self.client.get(url, {'since': 0, 'wait': 30}, **self.auth(user)).json(), {'unread': 1})
+        self.assertEqual(self.client.get(url, {'since': 1, 'wait': 0}, **self.auth(user)).json(), {'unread': 1})
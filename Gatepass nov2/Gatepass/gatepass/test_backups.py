@@ -0,0 +1,58 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from . import backups
+
+
+class SQLiteBackupTest(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.database = Path(self.tmp.name) / 'db.sqlite3'
+        with sqlite3.connect(self.database) as conn:
+            conn.execute('CREATE TABLE item (name TEXT)')
+            conn.execute("INSERT INTO item VALUES ('original')")
+        self.db_settings = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(self.database)}
+
+    def _names(self):
+        conn = sqlite3.connect(self.database)
+        try:
+            return [row[0] for row in conn.execute('SELECT name FROM item')]
+        finally:
+            conn.close()
+
+    def test_backup_and_restore_round_trip(self):
+        destination = backups.backup_path(self.tmp.name, 'sqlite')
+        backups.backup_database(self.db_settings, destination)
+        self.assertTrue(destination.name.endswith('.sqlite3.gz'))
+
+        with sqlite3.connect(self.database) as conn:
+            conn.execute("UPDATE item SET name = 'changed'")
+        backups.restore_database(self.db_settings, destination)
+
+        self.assertEqual(self._names(), ['original'])
+
+    def test_rotation_keeps_newest_backups(self):
+        for timestamp in ['20250101_000000', '20250102_000000', '20250103_000000']:
+            (Path(self.tmp.name) / f'backup_{timestamp}.sqlite3.gz').write_bytes(b'')
+
+        removed = backups.rotate_backups(self.tmp.name, keep=2)
+
+        self.assertEqual([path.name for path in removed], ['backup_20250101_000000.sqlite3.gz'])
+        self.assertEqual(len(backups.list_backups(self.tmp.name)), 2)
+
+        for keep in (0, -1):
+            with self.assertRaises(ValueError):
+                backups.rotate_backups(self.tmp.name, keep=keep)
+        self.assertEqual(len(backups.list_backups(self.tmp.name)), 2)
+
+    def test_command_rejects_keeping_no_backups(self):
+        with self.assertRaisesMessage(CommandError, '--keep must be at least 1'):
+            call_command('backup_db', '--output-dir', self.tmp.name, '--keep', '0')
+        self.assertEqual(backups.list_backups(self.tmp.name), [])
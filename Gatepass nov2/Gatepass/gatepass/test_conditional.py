@@ -0,0 +1,126 @@
+from datetime import date, time
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .models import (
+    User, Student, Warden, Hostel, GatePass, Notification, ChangeMarker, ALL_GATEPASSES_SCOPE,
+    bump_gatepass_markers, bump_notification_markers, gatepasses_scope, notifications_scope,
+)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ConditionalGetTest(TestCase):
+
+    def setUp(self):
+        self.warden = User.objects.create_user(
+            username='warden', email='warden@example.com', password='Password123', role='warden',
+            gender='M', is_approved=True,
+        )
+        user = User.objects.create_user(
+            username='student', email='student@example.com', password='Password123', role='student',
+            gender='M', is_approved=True,
+        )
+        student = Student.objects.create(
+            user=user, hall_ticket_no='22BH1A0001', student_name='Student', room_no='101',
+            parent_name='Parent', parent_mobile='9000000001',
+        )
+        self.gatepass = GatePass.objects.create(
+            student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+            expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), purpose='Outing',
+        )
+        token = Token.objects.create(user=self.warden)
+        self.auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+    def revalidate(self, url, **extra):
+        first = self.client.get(url, **extra)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+        return first['ETag'], self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'], **extra)
+
+    def test_dashboard_not_modified_until_data_changes(self):
+        self.client.force_login(self.warden)
+        url = reverse('warden_dashboard')
+        etag, second = self.revalidate(url)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(
+                user=self.warden, gatepass=self.gatepass, notification_type='gatepass_request', message='Hello'
+            )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Another user's notifications leave this dashboard alone
+        etag, _ = self.revalidate(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(
+                user=self.gatepass.student.user, gatepass=self.gatepass, notification_type='gatepass_request',
+                message='Hi',
+            )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_api_lists_revalidate_on_gatepass_change(self):
+        for name in ('api_gatepass_list_create', 'api_async_gatepass_list'):
+            url = reverse(name)
+            etag, second = self.revalidate(url, **self.auth)
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second['ETag'], etag)
+            # Query parameters change the representation, so they change the tag
+            self.assertEqual(self.client.get(url, {'compact': 1}, HTTP_IF_NONE_MATCH=etag, **self.auth).status_code, 200)
+
+            self.gatepass.purpose = 'Changed'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.gatepass.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()[0]['purpose'], 'Changed')
+
+    def test_markers_are_per_hostel_and_bumped_on_commit(self):
+        hostel = Hostel.objects.create(name='Boys Block A', gender='M')
+        Warden.objects.create(user=self.warden, name='Warden', hostel=hostel)
+        other = Hostel.objects.create(name='Boys Block B', gender='M')
+        student = self.gatepass.student
+        with self.captureOnCommitCallbacks(execute=True):
+            student.hostel = hostel
+            student.save()
+        self.gatepass.refresh_from_db()
+        scopes = (gatepasses_scope(hostel.pk), gatepasses_scope(other.pk), ALL_GATEPASSES_SCOPE)
+        before = ChangeMarker.versions(*scopes)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.gatepass.purpose = 'Changed'
+            self.gatepass.save()
+            # Nothing is bumped inside the writer's transaction
+            self.assertEqual(ChangeMarker.versions(*scopes), before)
+        for callback in callbacks:
+            callback()
+        after = ChangeMarker.versions(*scopes)
+        self.assertEqual([after[scope] - before[scope] for scope in scopes], [1, 0, 1])
+
+        # A write in another hostel leaves this warden's list valid
+        etag, second = self.revalidate(reverse('api_gatepass_list_create'), **self.auth)
+        self.assertEqual(second.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_gatepass_markers([other.pk])
+        response = self.client.get(reverse('api_gatepass_list_create'), HTTP_IF_NONE_MATCH=etag, **self.auth)
+        self.assertEqual(response.status_code, 304)
+
+    def test_notification_markers_bump_in_one_statement(self):
+        users = [
+            User.objects.create_user(username=f'user{n}', email=f'user{n}@example.com', password='Password123')
+            for n in range(20)
+        ]
+        for expected_queries in (2, 1):  # new scopes are inserted in one batch, then updated in one
+            with self.captureOnCommitCallbacks() as callbacks:
+                bump_notification_markers(user.pk for user in users)
+            with self.assertNumQueries(expected_queries):
+                for callback in callbacks:
+                    callback()
+        self.assertEqual(ChangeMarker.versions(notifications_scope(users[0].pk))[notifications_scope(users[0].pk)], 2)
+
+    def test_gzip(self):
+        self.client.force_login(self.warden)
+        response = self.client.get(reverse('warden_dashboard'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from . import deadlines
+from .models import User, Student, GatePass, Notification
+
+
+class DeadlineSchedulerTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='student1', email='student1@example.com', password='Password123', role='student')
+        self.student = Student.objects.create(
+            user=user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+
+    def create_gatepass(self, expected_return, status='security_approved'):
+        expected_return = timezone.localtime(expected_return)
+        return GatePass.objects.create(
+            student=self.student,
+            outing_date=expected_return.date(),
+            outing_time=expected_return.time().replace(hour=0, minute=0, second=0, microsecond=0),
+            expected_return_date=expected_return.date(),
+            expected_return_time=expected_return.time().replace(second=0, microsecond=0),
+            status=status,
+        )
+
+    def sent(self, gatepass, notification_type):
+        return Notification.objects.filter(gatepass=gatepass, notification_type=notification_type).count()
+
+    def test_fires_reminder_then_overdue_at_their_times(self):
+        gatepass = self.create_gatepass(timezone.now() + timedelta(hours=2))
+        scheduler = deadlines.DeadlineScheduler()
+        scheduler.load()
+        self.assertEqual(len(scheduler), 2)
+
+        expected = gatepass.expected_return_at
+        scheduler.run_due(expected - timedelta(minutes=31))
+        self.assertEqual(self.sent(gatepass, 'return_reminder'), 0)
+        scheduler.run_due(expected - timedelta(minutes=29))
+        self.assertEqual(self.sent(gatepass, 'return_reminder'), 1)
+        scheduler.run_due(expected + timedelta(seconds=1))
+        self.assertEqual(self.sent(gatepass, 'overdue_return'), 1)
+
+    def test_refresh_picks_up_exits_and_drops_returns(self):
+        scheduler = deadlines.DeadlineScheduler()
+        scheduler.load(timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(scheduler), 0)
+
+        out = self.create_gatepass(timezone.now() + timedelta(minutes=10))
+        returned = self.create_gatepass(timezone.now() + timedelta(minutes=10))
+        self.assertEqual(scheduler.refresh(), 2)
+        self.assertEqual(scheduler.refresh(), 0)
+
+        returned.status = 'returned'
+        returned.save()
+        scheduler.run_due(out.expected_return_at + timedelta(seconds=1))
+        self.assertEqual(self.sent(out, 'overdue_return'), 1)
+        self.assertEqual(self.sent(returned, 'overdue_return'), 0)
@@ -0,0 +1,85 @@
+from datetime import date, time, timedelta
+
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from . import filters
+from .forms import GatePassFilterForm
+from .models import User, Student, GatePass
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class GatePassFilterTest(TestCase):
+
+    def setUp(self):
+        self.warden = User.objects.create_user(
+            username='warden', email='warden@example.com', password='Password123', role='warden', is_approved=True
+        )
+        rows = [
+            # hall ticket, name, room, gender, status, outing day
+            ('22BH1A0001', 'Asha Rao', '101', 'F', 'pending', 1),
+            ('22BH1A0002', 'Ravi Kumar', '102', 'M', 'warden_approved', 2),
+            ('23BH1A0003', 'Kiran Das', '101', 'M', 'security_approved', 3),
+            ('23BH1A0004', 'Meena Iyer', '204', 'F', 'returned', 10),
+            # Typed in lower case at registration
+            ('24bh1a0005', 'Arun Nair', '305', 'M', 'warden_rejected', 1),
+        ]
+        self.gatepasses = {}
+        for n, (ticket, name, room, gender, status, day) in enumerate(rows):
+            user = User.objects.create_user(
+                username=f'student{n}', email=f'student{n}@example.com', password='Password123',
+                role='student', gender=gender,
+            )
+            student = Student.objects.create(
+                user=user, hall_ticket_no=ticket, student_name=name, room_no=room,
+                parent_name='Parent', parent_mobile=f'900000000{n}',
+            )
+            outing = date(2025, 1, day)
+            gatepass = GatePass.objects.create(
+                student=student, outing_date=outing, outing_time=time(10, 0),
+                expected_return_date=outing + timedelta(days=1), expected_return_time=time(18, 0), purpose='Outing',
+            )
+            gatepass.status = status
+            gatepass.warden_approval = self.warden if status != 'pending' else None
+            gatepass.save()
+            self.gatepasses[ticket] = gatepass
+
+    def matches(self, query):
+        form = GatePassFilterForm(QueryDict(query))
+        self.assertTrue(form.is_valid(), form.errors)
+        return sorted(filters.apply(GatePass.objects.all(), form.cleaned_data).values_list('hall_ticket_no', flat=True))
+
+    def test_criteria(self):
+        self.assertEqual(self.matches('status=pending,returned'), ['22BH1A0001', '23BH1A0004'])
+        self.assertEqual(self.matches('status=pending&status=returned'), ['22BH1A0001', '23BH1A0004'])
+        self.assertEqual(self.matches('status_filter=pending'), ['22BH1A0001'])
+        self.assertEqual(self.matches('from_date=2025-01-02&to_date=2025-01-03'), ['22BH1A0002', '23BH1A0003'])
+        self.assertEqual(self.matches('return_from=2025-01-11'), ['23BH1A0004'])
+        self.assertEqual(self.matches('room=101'), ['22BH1A0001', '23BH1A0003'])
+        self.assertEqual(self.matches('hall_ticket=23bh'), ['23BH1A0003', '23BH1A0004'])
+        self.assertEqual(self.matches('hall_ticket=24BH1A'), ['24BH1A0005'])
+        self.assertEqual(self.matches('hall_ticket=24bh1a0005'), ['24BH1A0005'])
+        self.assertEqual(self.matches('gender=F&status=returned'), ['23BH1A0004'])
+        self.assertEqual(self.matches(f'approver={self.warden.pk}&room=101'), ['23BH1A0003'])
+        self.assertEqual(self.matches('overdue=on'), ['23BH1A0003'])
+        self.assertEqual(self.matches('q=Meena'), ['23BH1A0004'])
+
+    def test_api_filters_and_rejects_bad_values(self):
+        token = Token.objects.create(user=self.warden)
+        auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        for name in ('api_gatepass_list_create', 'api_async_gatepass_list'):
+            response = self.client.get(reverse(name), {'status': 'pending,warden_approved', 'compact': 1}, **auth)
+            self.assertEqual(sorted(row['hall_ticket_no'] for row in response.json()), ['22BH1A0001', '22BH1A0002'])
+
+            response = self.client.get(reverse(name), {'status': 'lost', 'from_date': 'soon'}, **auth)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(set(response.json()), {'status', 'from_date'})
+
+    def test_warden_dashboard_uses_filters(self):
+        self.client.force_login(self.warden)
+        response = self.client.get(reverse('warden_dashboard'), {'room': '101', 'overdue': 'on'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['filtered_count'], 1)
+        self.assertEqual(response.context['students_out'], 1)
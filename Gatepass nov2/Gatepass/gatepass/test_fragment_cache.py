@@ -0,0 +1,49 @@
+from datetime import date, time
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.test import TestCase
+
+from .models import User, Student, GatePass
+
+
+class GatePassFragmentCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='student1', email='student1@example.com', password='Password123', role='student')
+        student = Student.objects.create(
+            user=user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+        self.gatepass = GatePass.objects.create(
+            student=student,
+            outing_date=date(2025, 1, 1),
+            outing_time=time(10, 0),
+            expected_return_date=date(2025, 1, 1),
+            expected_return_time=time(18, 0),
+            purpose='Original purpose',
+        )
+
+    def render(self):
+        gatepass = GatePass.objects.select_related('student').get(pk=self.gatepass.pk)
+        return render_to_string('gatepass/partials/_request_list.html', {
+            'request_list': [gatepass], 'list_type': 'pending', 'empty_message': {},
+        })
+
+    def test_rows_are_cached_until_gatepass_is_saved(self):
+        self.assertIn('Original purpose', self.render())
+
+        # A change that skips save() keeps updated_at, so the cached row is served
+        GatePass.objects.filter(pk=self.gatepass.pk).update(purpose='Changed purpose')
+        self.assertIn('Original purpose', self.render())
+
+        gatepass = GatePass.objects.get(pk=self.gatepass.pk)
+        gatepass.save()
+        html = self.render()
+        self.assertIn('Changed purpose', html)
+        self.assertNotIn('Original purpose', html)
@@ -0,0 +1,105 @@
+from datetime import date, time
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from . import jobs, occupancy
+from .hostels import hostel_scope
+from .models import User, Hostel, Student, Warden, GatePass, Notification
+
+
+class HostelScopingTest(TestCase):
+
+    def setUp(self):
+        self.boys = Hostel.objects.create(name='Boys Block A', gender='M')
+        self.girls = Hostel.objects.create(name='Girls Block A', gender='F')
+        self.wardens = {}
+        self.gatepasses = {}
+        for n, hostel in enumerate((self.boys, self.girls)):
+            warden = User.objects.create_user(
+                username=f'warden{n}', email=f'warden{n}@example.com', password='Password123',
+                role='warden', is_approved=True
+            )
+            Warden.objects.create(user=warden, name=f'Warden {n}', hostel=hostel)
+            student_user = User.objects.create_user(
+                username=f'student{n}', email=f'student{n}@example.com', password='Password123',
+                role='student', gender=hostel.gender
+            )
+            student = Student.objects.create(
+                user=student_user, hostel=hostel, hall_ticket_no=f'22BH1A000{n}', student_name=f'Student {n}',
+                room_no='101', parent_name='Parent', parent_mobile=f'900000000{n}',
+            )
+            self.wardens[hostel.pk] = warden
+            self.gatepasses[hostel.pk] = GatePass.objects.create(
+                student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), purpose='Outing',
+            )
+
+    def auth(self, user):
+        token, _ = Token.objects.get_or_create(user=user)
+        return {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+    def test_gatepass_copies_student_hostel(self):
+        gatepass = self.gatepasses[self.boys.pk]
+        self.assertEqual(gatepass.hostel, self.boys)
+
+        student = gatepass.student
+        student.hostel = self.girls
+        student.save()
+        gatepass.refresh_from_db()
+        self.assertEqual(gatepass.hostel, self.girls)
+
+    def test_manager_scope(self):
+        self.assertEqual(GatePass.objects.count(), 2)
+        with hostel_scope(self.boys.pk):
+            self.assertEqual(list(GatePass.objects.all()), [self.gatepasses[self.boys.pk]])
+            self.assertEqual(Student.objects.get().hostel, self.boys)
+            self.assertEqual(GatePass.all_hostels.count(), 2)
+
+    def test_wardens_only_see_their_hostel(self):
+        warden = self.wardens[self.boys.pk]
+        own, other = self.gatepasses[self.boys.pk], self.gatepasses[self.girls.pk]
+        for name in ('api_gatepass_list_create', 'api_async_gatepass_list'):
+            ids = [row['id'] for row in self.client.get(reverse(name), **self.auth(warden)).json()]
+            self.assertEqual(ids, [own.id])
+
+        response = self.client.post(reverse('api_warden_approve', args=[other.id]), **self.auth(warden))
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(reverse('api_warden_approve', args=[own.id]), **self.auth(warden))
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_requests_notify_hostel_wardens(self):
+        gatepass = self.gatepasses[self.girls.pk]
+        jobs.dispatch('notify_wardens_of_request', gatepass_id=gatepass.id)
+        self.assertEqual(
+            list(Notification.objects.filter(gatepass=gatepass).values_list('user', flat=True)),
+            [self.wardens[self.girls.pk].pk]
+        )
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_occupancy_is_per_hostel(self):
+        # Both students live in room 101 of their own hostel
+        for gatepass in self.gatepasses.values():
+            gatepass.status = 'security_approved'
+            gatepass.save()
+        warden = self.wardens[self.boys.pk]
+        self.client.force_login(warden)
+        self.assertEqual(self.client.get(reverse('warden_dashboard')).context['students_out'], 1)
+
+        response = self.client.get(reverse('api_occupancy'), **self.auth(warden))
+        self.assertEqual(response.json(), {'total': 1, 'by_gender': {'M': 1}, 'by_room': {'101': 1}})
+        admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='Password123', role='superadmin', is_approved=True
+        )
+        response = self.client.get(reverse('api_occupancy'), **self.auth(admin))
+        self.assertEqual(response.json()['by_room'], {f'{self.boys.pk}/101': 1, f'{self.girls.pk}/101': 1})
+        student = self.gatepasses[self.boys.pk].student
+        self.assertEqual(self.client.get(reverse('api_occupancy'), **self.auth(student.user)).status_code, 403)
+
+        # Changing hostel while out carries the count along
+        student.hostel = self.girls
+        student.save()
+        self.assertEqual(occupancy.snapshot(self.girls.pk)['total'], 2)
+        self.assertEqual(occupancy.reconcile(), {})
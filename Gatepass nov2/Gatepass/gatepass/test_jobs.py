@@ -0,0 +1,153 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import jobs
+from .models import User, Student, GatePass, Notification, Job
+
+
+calls = []
+
+
+@jobs.job('test_record')
+def record(value):
+    calls.append(value)
+
+
+@jobs.job('test_explode')
+def explode():
+    raise RuntimeError('boom')
+
+
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_unique_enqueue_reuses_queued_job(self):
+        first = jobs.enqueue('test_record', unique=True, value=1)
+        self.assertEqual(jobs.enqueue('test_record', unique=True, value=1), first)
+        self.assertNotEqual(jobs.enqueue('test_record', unique=True, value=2), first)
+        with self.assertRaises(KeyError):
+            jobs.enqueue('no_such_job')
+
+    def test_claim_and_run(self):
+        later = jobs.enqueue('test_record', value='later', run_at=timezone.now() + timedelta(hours=1))
+        queued = jobs.enqueue('test_record', value='now')
+
+        job = jobs.claim_job('worker-1')
+        self.assertEqual((job.pk, job.status, job.attempts, job.locked_by), (queued.pk, 'running', 1, 'worker-1'))
+        self.assertIsNone(jobs.claim_job('worker-2'))
+
+        self.assertTrue(jobs.run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertIsNotNone(job.duration_ms)
+        self.assertEqual(calls, ['now'])
+        later.refresh_from_db()
+        self.assertEqual(later.status, 'queued')
+
+    def test_failures_retry_then_give_up(self):
+        queued = jobs.enqueue('test_explode', max_attempts=2)
+        self.assertFalse(jobs.run_job(jobs.claim_job('worker')))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.last_error), ('queued', 'RuntimeError: boom'))
+        self.assertGreater(queued.run_at, timezone.now())
+
+        Job.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.assertFalse(jobs.run_job(jobs.claim_job('worker')))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+
+    def test_requeue_stale(self):
+        jobs.enqueue('test_record', value=1)
+        job = jobs.claim_job('crashed')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(jobs.requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+
+    @mock.patch('gatepass.jobs.time.sleep')
+    def test_only_lock_errors_are_retried(self, sleep):
+        attempts = []
+
+        def locked_twice():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OperationalError('database table is locked')
+            return 'ok'
+
+        self.assertEqual(jobs.retry_locked(locked_twice), 'ok')
+        self.assertEqual(len(attempts), 3)
+
+        attempts.clear()
+
+        def broken():
+            attempts.append(1)
+            raise OperationalError('no such table: gatepass_job')
+
+        with self.assertRaises(OperationalError):
+            jobs.retry_locked(broken)
+        self.assertEqual(len(attempts), 1)
+
+    def test_prune_finished_jobs(self):
+        old = timezone.now() - timedelta(days=30)
+        for status in ('done', 'failed', 'queued', 'running'):
+            Job.objects.create(name='test_record', status=status, finished_at=old)
+        recent = Job.objects.create(name='test_record', status='done', finished_at=timezone.now())
+
+        out = StringIO()
+        call_command('prune_jobs', '--days', '7', '--batch-size', '1', stdout=out)
+        self.assertIn('Deleted 2 jobs in 2 batches', out.getvalue())
+        self.assertEqual(sorted(Job.objects.values_list('status', flat=True)), ['done', 'queued', 'running'])
+        self.assertTrue(Job.objects.filter(pk=recent.pk).exists())
+
+    @override_settings(GATEPASS_JOBS_INLINE=False)
+    def test_dispatch_queues_when_not_inline(self):
+        jobs.dispatch('test_record', value=1)
+        self.assertEqual(calls, [])
+        self.assertEqual(Job.objects.filter(name='test_record', status='queued').count(), 1)
+
+    def test_warden_fan_out(self):
+        for n, gender in enumerate(('M', 'F')):
+            User.objects.create_user(
+                username=f'warden{n}', email=f'warden{n}@example.com', password='Password123',
+                role='warden', is_approved=True, gender=gender
+            )
+        student_user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student', gender='M'
+        )
+        student = Student.objects.create(
+            user=student_user, hall_ticket_no='22BH1A0001', student_name='Test Student', room_no='101',
+            parent_name='Test Parent', parent_mobile='9000000001',
+        )
+        now = timezone.localtime()
+        gatepass = GatePass.objects.create(
+            student=student, outing_date=now.date(), outing_time=now.time(),
+            expected_return_date=now.date(), expected_return_time=now.time(), purpose='Outing',
+        )
+        jobs.dispatch('notify_wardens_of_request', gatepass_id=gatepass.id)
+        self.assertEqual(
+            list(Notification.objects.filter(gatepass=gatepass).values_list('user__username', flat=True)), ['warden0']
+        )
+
+
+class RunWorkersCommandTest(TransactionTestCase):
+
+    def test_workers_drain_queue(self):
+        calls.clear()
+        for value in range(10):
+            jobs.enqueue('test_record', value=value)
+        jobs.enqueue('test_explode', max_attempts=1)
+
+        out = StringIO()
+        call_command('run_workers', concurrency=2, once=True, stdout=out)
+        self.assertEqual(sorted(calls), list(range(10)))
+        self.assertEqual(Job.objects.filter(status='done').count(), 10)
+        self.assertEqual(Job.objects.filter(status='failed').count(), 1)
+        self.assertIn('test_record: 10 done, 0 failed', out.getvalue())
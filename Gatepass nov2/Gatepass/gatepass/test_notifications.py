@@ -0,0 +1,78 @@
+from datetime import date, time
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .models import User, Student, GatePass, Notification
+
+
+class NotificationReadTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student', is_approved=True
+        )
+        student = Student.objects.create(
+            user=self.user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+        gatepass = GatePass.objects.create(
+            student=student,
+            outing_date=date(2025, 1, 1),
+            outing_time=time(10, 0),
+            expected_return_date=date(2025, 1, 1),
+            expected_return_time=time(18, 0),
+        )
+        self.notifications = [
+            Notification.objects.create(user=self.user, gatepass=gatepass, notification_type='gatepass_request', message=str(i))
+            for i in range(3)
+        ]
+        other = User.objects.create_user(username='other', email='other@example.com', password='Password123', role='warden')
+        self.other_notification = Notification.objects.create(
+            user=other, gatepass=gatepass, notification_type='gatepass_request', message='other'
+        )
+
+    def test_mark_selected_notifications_read(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('mark_notifications_read'),
+            {'ids': [self.notifications[0].id, self.other_notification.id]},
+            HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(response.json(), {'updated': 1, 'unread': 2})
+        self.other_notification.refresh_from_db()
+        self.assertFalse(self.other_notification.is_read)
+
+    def test_mark_read_only_redirects_back_to_this_site(self):
+        self.client.force_login(self.user)
+        url = reverse('mark_notifications_read')
+
+        response = self.client.post(url, HTTP_REFERER='http://testserver/notifications/')
+        self.assertRedirects(response, 'http://testserver/notifications/', fetch_redirect_response=False)
+
+        response = self.client.post(url, HTTP_REFERER='https://evil.example.com/phish')
+        self.assertRedirects(response, reverse('dashboard_redirect'), fetch_redirect_response=False)
+        self.assertFalse(Notification.objects.filter(user=self.user, is_read=False).exists())
+
+    def test_api_mark_all_and_unread_count(self):
+        token = Token.objects.create(user=self.user)
+        headers = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+        response = self.client.get(reverse('api_notification_unread_count'), **headers)
+        self.assertEqual(response.json(), {'unread': 3})
+
+        # A false flag is not a request to mark everything
+        for flag in ('false', '0'):
+            response = self.client.post(reverse('api_notifications_read'), {'all': flag}, **headers)
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('api_notifications_read'), {'all': 'maybe'}, **headers)
+        self.assertIn('all', response.json())
+        self.assertEqual(self.client.get(reverse('api_notification_unread_count'), **headers).json(), {'unread': 3})
+
+        response = self.client.post(reverse('api_notifications_read'), {'all': True}, content_type='application/json', **headers)
+        self.assertEqual(response.json(), {'updated': 3, 'unread': 0})
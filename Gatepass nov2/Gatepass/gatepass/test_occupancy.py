@@ -0,0 +1,91 @@
+from datetime import date, time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from . import occupancy
+from .hostels import hostel_scope
+from .models import User, Hostel, Student, GatePass, OccupancyCounter
+
+
+class OccupancyCounterTest(TestCase):
+
+    def setUp(self):
+        self.guard = User.objects.create_user(
+            username='guard', email='guard@example.com', password='Password123', role='security', is_approved=True
+        )
+        self.gatepasses = []
+        for index, (gender, room_no) in enumerate([('M', '101'), ('M', '101'), ('F', '202')]):
+            user = User.objects.create_user(
+                username=f'student{index}', email=f'student{index}@example.com', password='Password123',
+                role='student', gender=gender,
+            )
+            student = Student.objects.create(
+                user=user,
+                hall_ticket_no=f'22BH1A000{index}',
+                student_name=f'Student {index}',
+                room_no=room_no,
+                parent_name='Parent',
+                parent_mobile=f'900000000{index}',
+            )
+            self.gatepasses.append(GatePass.objects.create(
+                student=student,
+                outing_date=date(2025, 1, 1),
+                outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, 1),
+                expected_return_time=time(18, 0),
+                status='warden_approved',
+            ))
+
+    def test_security_approve_and_return_maintain_counter(self):
+        self.client.force_login(self.guard)
+        for gatepass in self.gatepasses:
+            self.client.post(reverse('security_approve_gatepass', args=[gatepass.id]))
+        # A repeated approval must not be counted twice
+        self.client.post(reverse('security_approve_gatepass', args=[self.gatepasses[0].id]))
+
+        self.assertEqual(occupancy.snapshot(), {
+            'total': 3,
+            'by_gender': {'M': 2, 'F': 1},
+            'by_room': {'101': 2, '202': 1},
+        })
+
+        self.client.post(reverse('security_record_return', args=[self.gatepasses[0].id]), {
+            'actual_return_date': '2025-01-01',
+            'actual_return_hour': '6',
+            'actual_return_minute': '0',
+            'actual_return_ampm': 'PM',
+        })
+        self.assertEqual(occupancy.snapshot()['by_room'], {'101': 1, '202': 1})
+
+    def test_profile_edits_while_out_move_the_count(self):
+        gatepass = self.gatepasses[0]
+        gatepass.status = 'security_approved'
+        gatepass.save()
+
+        student = gatepass.student
+        student.room_no = '303'
+        student.save()
+        student.user.gender = 'F'
+        student.user.save()
+        self.assertEqual(occupancy.snapshot(), {'total': 1, 'by_gender': {'F': 1}, 'by_room': {'303': 1}})
+
+        gatepass.refresh_from_db()
+        gatepass.status = 'returned'
+        gatepass.save()
+        self.assertEqual(occupancy.snapshot()['total'], 0)
+        self.assertEqual(occupancy.reconcile(), {})
+
+    def test_reconcile_fixes_drift(self):
+        GatePass.objects.filter(pk=self.gatepasses[0].pk).update(status='security_approved')
+        OccupancyCounter.objects.create(gender='F', room_no='202', count=5)
+
+        call_command('reconcile_occupancy', stdout=StringIO())
+
+        self.assertEqual(occupancy.snapshot(), {'total': 1, 'by_gender': {'M': 1}, 'by_room': {'101': 1}})
+
+        # A reconcile started inside a request's hostel scope still sees every hostel
+        with hostel_scope(Hostel.objects.create(name='Girls Block A', gender='F').pk):
+            self.assertEqual(occupancy.reconcile(), {})
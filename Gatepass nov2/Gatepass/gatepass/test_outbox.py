@@ -0,0 +1,70 @@
+import json
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import outbox
+from .models import User, Student, OutboxMessage
+from .sms import SMSGateway, FileGateway
+
+
+class FailingGateway(SMSGateway):
+
+    def send_batch(self, messages):
+        return {message.id: 'provider unavailable' for message in messages}
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class OutboxTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student', gender='M'
+        )
+        Student.objects.create(
+            user=self.user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+
+    def test_create_gatepass_queues_code_and_worker_delivers_it(self):
+        self.client.force_login(self.user)
+        outing = date.today() + timedelta(days=1)
+        self.client.post(reverse('create_gatepass'), {
+            'outing_date': outing, 'expected_return_date': outing, 'purpose': 'Home',
+            'outing_hour': 10, 'outing_minute': 0, 'outing_ampm': 'AM',
+            'expected_return_hour': 6, 'expected_return_minute': 0, 'expected_return_ampm': 'PM',
+        })
+        message = OutboxMessage.objects.get()
+        code = message.gatepass.verification.verification_code
+        self.assertEqual((message.recipient, message.status), ('9000000001', 'pending'))
+        self.assertIn(code, message.body)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'sms.jsonl'
+            self.assertEqual(outbox.deliver_batch(FileGateway(path)), (1, 0, 0))
+            self.assertEqual(json.loads(path.read_text())['to'], '9000000001')
+        message.refresh_from_db()
+        self.assertEqual(message.status, 'sent')
+
+    @override_settings(GATEPASS_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        message = outbox.enqueue_sms('9000000001', 'Hello')
+        self.assertEqual(outbox.deliver_batch(FailingGateway()), (0, 1, 0))
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        # Not due yet, so nothing is claimed
+        self.assertEqual(outbox.deliver_batch(FailingGateway()), (0, 0, 0))
+
+        OutboxMessage.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.deliver_batch(FailingGateway()), (0, 0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.last_error), ('failed', 'provider unavailable'))
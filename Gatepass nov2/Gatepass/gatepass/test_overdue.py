@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import User, Student, GatePass, Notification
+from .views import check_overdue_returns
+
+
+class OverdueReturnTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='student1', email='student1@example.com', password='Password123', role='student')
+        self.student = Student.objects.create(
+            user=user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+
+    def create_gatepass(self, expected_return):
+        expected_return = timezone.localtime(expected_return)
+        outing = expected_return - timedelta(hours=4)
+        return GatePass.objects.create(
+            student=self.student,
+            outing_date=outing.date(),
+            outing_time=outing.time().replace(microsecond=0),
+            expected_return_date=expected_return.date(),
+            expected_return_time=expected_return.time().replace(microsecond=0),
+            status='security_approved',
+        )
+
+    def test_expected_return_at_is_maintained(self):
+        gatepass = self.create_gatepass(timezone.now())
+        gatepass.expected_return_time = (timezone.localtime() + timedelta(hours=2)).time().replace(second=0, microsecond=0)
+        gatepass.save()
+        self.assertEqual(
+            timezone.localtime(gatepass.expected_return_at).time(), gatepass.expected_return_time
+        )
+
+    def test_overdue_uses_time_not_just_date(self):
+        late = self.create_gatepass(timezone.now() - timedelta(minutes=30))
+        on_time = self.create_gatepass(timezone.now() + timedelta(hours=1))
+
+        check_overdue_returns()
+        flagged = set(Notification.objects.filter(notification_type='overdue_return').values_list('gatepass_id', flat=True))
+        self.assertEqual(flagged, {late.id})
+        self.assertNotIn(on_time.id, flagged)
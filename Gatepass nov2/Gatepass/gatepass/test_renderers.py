@@ -0,0 +1,44 @@
+import io
+import json
+from datetime import date, time
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import User, Student, GatePass
+from .renderers import ORJSONRenderer, ORJSONParser
+from .serializers import GatePassListSerializer, gatepass_list_values
+
+
+class FastJSONTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student', gender='F'
+        )
+        student = Student.objects.create(
+            user=user, hall_ticket_no='22BH1A0001', student_name='Test Student', room_no='101',
+            parent_name='Parent', parent_mobile='9000000001',
+        )
+        GatePass.objects.create(
+            student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 30),
+            expected_return_date=date(2025, 1, 2), expected_return_time=time(18, 0), purpose='Line\u2028break',
+        )
+        # A pass with no deadlines exercises the None handling
+        GatePass.objects.filter(pk=GatePass.objects.create(
+            student=student, outing_date=date(2025, 1, 3), outing_time=time(9, 0),
+            expected_return_date=date(2025, 1, 3), expected_return_time=time(12, 0),
+        ).pk).update(outing_at=None, expected_return_at=None, created_at=timezone.now())
+
+    def test_values_serializer_matches_model_serializer(self):
+        queryset = GatePass.objects.order_by('id')
+        expected = [dict(row) for row in GatePassListSerializer(queryset, many=True).data]
+        self.assertEqual(gatepass_list_values.serialize(queryset), expected)
+
+    def test_renderer_matches_stock_output(self):
+        data = gatepass_list_values.serialize(GatePass.objects.order_by('id'))
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+        self.assertIn(b'\\u2028', rendered)
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(rendered)), data)
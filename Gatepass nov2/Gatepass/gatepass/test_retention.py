@@ -0,0 +1,105 @@
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from . import exports, retention
+from .models import (
+    User, Student, GatePass, ParentVerification, Notification,
+    ArchivedGatePass, ArchivedParentVerification, ArchivedNotification,
+)
+
+
+class ArchiveGatePassTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='student1', email='student1@example.com', password='Password123', role='student')
+        self.student = Student.objects.create(
+            user=user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+        self.old_returned = self._gatepass('returned', days_ago=400)
+        self.old_pending = self._gatepass('pending', days_ago=400)
+        self.recent_returned = self._gatepass('returned', days_ago=1)
+
+    def _gatepass(self, status, days_ago):
+        gatepass = GatePass.objects.create(
+            student=self.student,
+            outing_date=date(2024, 1, 1),
+            outing_time=time(10, 0),
+            expected_return_date=date(2024, 1, 1),
+            expected_return_time=time(18, 0),
+            status=status,
+        )
+        ParentVerification.objects.create(gatepass=gatepass, parent_mobile='9000000001', verification_code='123456')
+        Notification.objects.create(
+            user=self.student.user, gatepass=gatepass, notification_type='gatepass_request', message='hello'
+        )
+        GatePass.objects.filter(pk=gatepass.pk).update(updated_at=timezone.now() - timedelta(days=days_ago))
+        return gatepass
+
+    def test_only_old_finished_gatepasses_are_archived(self):
+        call_command('archive_gatepasses', '--days', '180', '--batch-size', '1', stdout=StringIO())
+
+        self.assertEqual(list(ArchivedGatePass.objects.values_list('id', flat=True)), [self.old_returned.id])
+        self.assertFalse(GatePass.objects.filter(pk=self.old_returned.pk).exists())
+        self.assertTrue(GatePass.objects.filter(pk=self.old_pending.pk).exists())
+        self.assertTrue(GatePass.objects.filter(pk=self.recent_returned.pk).exists())
+        self.assertTrue(ArchivedParentVerification.objects.filter(gatepass_id=self.old_returned.pk).exists())
+        self.assertTrue(ArchivedNotification.objects.filter(gatepass_id=self.old_returned.pk).exists())
+        self.assertFalse(Notification.objects.filter(gatepass_id=self.old_returned.pk).exists())
+
+    def test_export_includes_archived_gatepasses(self):
+        retention.archive_batch(retention.archive_cutoff(180))
+
+        exported_ids = [row[0] for row in exports.export_rows(statuses=['returned'])]
+        self.assertEqual(sorted(exported_ids), sorted([self.old_returned.id, self.recent_returned.id]))
+
+
+class PruneNotificationsTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='warden1', email='warden1@example.com', password='Password123', role='warden')
+        student_user = User.objects.create_user(username='student1', email='student1@example.com', password='Password123', role='student')
+        student = Student.objects.create(
+            user=student_user, hall_ticket_no='22BH1A0001', student_name='Test Student', room_no='101',
+            parent_name='Test Parent', parent_mobile='9000000001',
+        )
+        self.gatepass = GatePass.objects.create(
+            student=student, outing_date=date(2024, 1, 1), outing_time=time(10, 0),
+            expected_return_date=date(2024, 1, 1), expected_return_time=time(18, 0),
+        )
+        self.old_read = [self._notification(is_read=True, days_ago=60) for _ in range(3)]
+        self.old_unread = self._notification(is_read=False, days_ago=60)
+        self.ancient_unread = self._notification(is_read=False, days_ago=400)
+        self.recent_read = self._notification(is_read=True, days_ago=1)
+
+    def _notification(self, is_read, days_ago):
+        notification = Notification.objects.create(
+            user=self.user, gatepass=self.gatepass, notification_type='gatepass_request', message='hello', is_read=is_read
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return notification.pk
+
+    def test_prunes_read_and_very_old_notifications_in_batches(self):
+        out = StringIO()
+        call_command('prune_notifications', '--days', '30', '--unread-days', '180', '--batch-size', '2', '--archive', stdout=out)
+
+        pruned = self.old_read + [self.ancient_unread]
+        self.assertEqual(sorted(Notification.objects.values_list('pk', flat=True)), [self.old_unread, self.recent_read])
+        self.assertEqual(sorted(ArchivedNotification.objects.values_list('pk', flat=True)), pruned)
+        self.assertIn('Batch 2: archived 2 notifications', out.getvalue())
+        self.assertIn('rows/s', out.getvalue())
+
+    def test_unread_can_be_kept(self):
+        call_command('prune_notifications', '--unread-days', '0', stdout=StringIO())
+
+        self.assertTrue(Notification.objects.filter(pk=self.ancient_unread).exists())
+        self.assertFalse(Notification.objects.filter(pk__in=self.old_read).exists())
+        self.assertFalse(ArchivedNotification.objects.exists())
@@ -0,0 +1,97 @@
+from datetime import date, time
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from . import occupancy, returns
+from .models import User, Student, GatePass, Notification, DailyGatePassStats
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class BatchReturnTest(TestCase):
+
+    def setUp(self):
+        self.guard = User.objects.create_user(
+            username='guard', email='guard@example.com', password='Password123', role='security', is_approved=True
+        )
+        self.gatepasses = []
+        for index, status in enumerate(['warden_approved', 'warden_approved', 'pending']):
+            user = User.objects.create_user(
+                username=f'student{index}', email=f'student{index}@example.com', password='Password123',
+                role='student', gender='M',
+            )
+            student = Student.objects.create(
+                user=user, hall_ticket_no=f'22BH1A000{index}', student_name=f'Student {index}', room_no='101',
+                parent_name='Parent', parent_mobile=f'900000000{index}',
+            )
+            gatepass = GatePass.objects.create(
+                student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), status=status,
+            )
+            if status == 'warden_approved':
+                gatepass.status = 'security_approved'
+                gatepass.save()
+            self.gatepasses.append(gatepass)
+
+    def test_record_returns_reports_each_item(self):
+        first, second, pending = self.gatepasses
+        items = returns.parse_items(f'gp-{first.id}\n22bh1a0001, 22BH1A0002 NOBODY #{first.id}')
+        results = returns.record_returns(items, self.guard)
+
+        self.assertEqual([row['result'] for row in results], ['returned', 'returned', 'not_out', 'not_found', 'duplicate'])
+        self.assertEqual(results[1]['student_name'], 'Student 1')
+        for gatepass in (first, second):
+            gatepass.refresh_from_db()
+            self.assertEqual((gatepass.status, gatepass.return_verified_by), ('returned', self.guard))
+            self.assertIsNotNone(gatepass.actual_return_time)
+        self.assertEqual(Notification.objects.filter(notification_type='return_recorded').count(), 2)
+
+        # Rollups follow the bulk update
+        self.assertEqual(occupancy.snapshot()['total'], 0)
+        self.assertEqual(DailyGatePassStats.objects.get().return_count, 2)
+
+        # A second scan of the same students changes nothing
+        results = returns.record_returns(items[:2], self.guard)
+        self.assertEqual([row['result'] for row in results], ['not_out', 'not_out'])
+
+    def test_api_and_page(self):
+        token = Token.objects.create(user=self.guard)
+        response = self.client.post(
+            reverse('api_batch_return'), {'items': ['22BH1A0000', 'NOBODY']}, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Token {token.key}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['returned'], 1)
+
+        self.client.force_login(self.guard)
+        response = self.client.post(reverse('security_batch_return'), {'items': f'GP-{self.gatepasses[1].id}'})
+        self.assertContains(response, 'Recorded 1 of 1 returns.')
+
+        student = self.gatepasses[0].student.user
+        self.client.force_login(student)
+        self.assertRedirects(self.client.get(reverse('security_batch_return')), reverse('home'), fetch_redirect_response=False)
+
+    def test_lower_case_hall_ticket_and_pass_token(self):
+        user = User.objects.create_user(
+            username='student9', email='student9@example.com', password='Password123', role='student', gender='M',
+            is_approved=True,
+        )
+        student = Student.objects.create(
+            user=user, hall_ticket_no=' 22bh1a0099', student_name='Student 9', room_no='101',
+            parent_name='Parent', parent_mobile='9000000009',
+        )
+        gatepass = GatePass.objects.create(
+            student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+            expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), status='warden_approved',
+        )
+        self.assertEqual(gatepass.student.hall_ticket_no, '22BH1A0099')
+
+        # Students show the token on their dashboard while the pass is usable at the gate
+        self.client.force_login(user)
+        self.assertContains(self.client.get(reverse('student_dashboard')), f'Pass {gatepass.pass_token}')
+
+        gatepass.status = 'security_approved'
+        gatepass.save()
+        results = returns.record_returns(returns.parse_items('22bh1a0099'), self.guard)
+        self.assertEqual([row['result'] for row in results], ['returned'])
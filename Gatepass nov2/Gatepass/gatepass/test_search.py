@@ -0,0 +1,62 @@
+from datetime import date, time
+
+from django.test import TestCase
+from django.urls import reverse
+
+from . import search
+from .models import User, Student, GatePass
+
+
+class StudentSearchTest(TestCase):
+
+    def setUp(self):
+        self.guard = User.objects.create_user(
+            username='guard', email='guard@example.com', password='Password123', role='security', is_approved=True
+        )
+        self.students = []
+        for index, (name, room_no) in enumerate([('Ravi Kumar', '101'), ('Priya Sharma', '202')]):
+            user = User.objects.create_user(
+                username=f'student{index}', email=f'student{index}@example.com', password='Password123',
+                role='student',
+            )
+            self.students.append(Student.objects.create(
+                user=user,
+                hall_ticket_no=f'22BH1A05{index}7',
+                student_name=name,
+                room_no=room_no,
+                parent_name='Parent',
+                parent_mobile=f'98765432{index}0',
+            ))
+        self.gatepass = GatePass.objects.create(
+            student=self.students[1],
+            outing_date=date(2025, 1, 1),
+            outing_time=time(10, 0),
+            expected_return_date=date(2025, 1, 1),
+            expected_return_time=time(18, 0),
+            status='warden_approved',
+        )
+
+    def test_partial_matches(self):
+        self.assertEqual(search.search_students('kumar'), [self.students[0]])
+        self.assertCountEqual(search.search_students('22BH'), self.students)
+        self.assertEqual(search.search_students('A0517'), [self.students[1]])
+        self.assertEqual(search.search_students('202'), [self.students[1]])
+
+    def test_index_follows_updates(self):
+        student = self.students[0]
+        student.student_name = 'Arjun Reddy'
+        student.save()
+        self.assertEqual(search.search_students('reddy'), [student])
+        self.assertEqual(search.search_students('kumar'), [])
+
+    def test_endpoint_includes_active_gatepass(self):
+        self.client.force_login(self.guard)
+        response = self.client.get(reverse('student_search'), {'q': 'priya'})
+        results = response.json()['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['active_gatepass']['id'], self.gatepass.id)
+
+    def test_endpoint_requires_staff_role(self):
+        self.client.force_login(self.students[0].user)
+        response = self.client.get(reverse('student_search'), {'q': 'priya'})
+        self.assertEqual(response.status_code, 403)
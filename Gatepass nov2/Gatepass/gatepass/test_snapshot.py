@@ -0,0 +1,58 @@
+from datetime import date, time
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .models import User, Student, GatePass
+
+
+class GatePassStudentSnapshotTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student', gender='M'
+        )
+        self.student = Student.objects.create(
+            user=self.user,
+            hall_ticket_no='22BH1A0001',
+            student_name='Test Student',
+            room_no='101',
+            parent_name='Test Parent',
+            parent_mobile='9000000001',
+        )
+        self.gatepass = GatePass.objects.create(
+            student=self.student,
+            outing_date=date(2025, 1, 1),
+            outing_time=time(10, 0),
+            expected_return_date=date(2025, 1, 1),
+            expected_return_time=time(18, 0),
+        )
+
+    def test_snapshot_copied_on_create(self):
+        gatepass = GatePass.objects.get(pk=self.gatepass.pk)
+        self.assertEqual(
+            (gatepass.student_name, gatepass.hall_ticket_no, gatepass.room_no, gatepass.parent_mobile, gatepass.student_gender),
+            ('Test Student', '22BH1A0001', '101', '9000000001', 'M'),
+        )
+
+    def test_profile_edits_are_synced(self):
+        before = GatePass.objects.get(pk=self.gatepass.pk).updated_at
+        self.student.room_no = '202'
+        self.student.save()
+        self.user.gender = 'F'
+        self.user.save()
+
+        gatepass = GatePass.objects.get(pk=self.gatepass.pk)
+        self.assertEqual((gatepass.room_no, gatepass.student_gender), ('202', 'F'))
+        self.assertGreater(gatepass.updated_at, before)
+
+    def test_compact_list_needs_no_joins(self):
+        token, _ = Token.objects.get_or_create(user=self.user)
+        with self.assertNumQueries(4):  # token, ETag change markers, student profile, gatepass list
+            response = self.client.get(
+                reverse('api_gatepass_list_create'), {'compact': 1}, HTTP_AUTHORIZATION=f'Token {token.key}'
+            )
+        row = response.json()[0]
+        self.assertEqual(row['student_name'], 'Test Student')
+        self.assertNotIn('student', row)
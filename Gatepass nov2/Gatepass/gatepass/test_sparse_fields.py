@@ -0,0 +1,71 @@
+from datetime import date, time
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .models import User, Student, GatePass
+
+
+class SparseFieldsTest(TestCase):
+
+    def setUp(self):
+        self.warden = User.objects.create_user(
+            username='warden', email='warden@example.com', password='Password123', role='warden', is_approved=True
+        )
+        for n in range(3):
+            user = User.objects.create_user(
+                username=f'student{n}', email=f'student{n}@example.com', password='Password123', role='student'
+            )
+            student = Student.objects.create(
+                user=user, hall_ticket_no=f'22BH1A000{n}', student_name=f'Student {n}', room_no='101',
+                parent_name='Parent', parent_mobile=f'900000000{n}',
+            )
+            GatePass.objects.create(
+                student=student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), purpose='Outing',
+            )
+        token = Token.objects.create(user=self.warden)
+        self.auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+    def get(self, name, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name), params, **self.auth)
+        gatepass_query = next(query['sql'] for query in queries if 'FROM "gatepass_gatepass"' in query['sql'])
+        return response, gatepass_query
+
+    def test_fields_narrow_payload_and_query(self):
+        for name in ('api_gatepass_list_create', 'api_async_gatepass_list'):
+            response, sql = self.get(name, {'fields': 'id,status,updated_at'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(set(response.json()[0]), {'id', 'status', 'updated_at'})
+            self.assertNotIn('"purpose"', sql)
+            self.assertNotIn('JOIN', sql)
+
+    def test_fields_allow_spaces_after_commas(self):
+        response, _ = self.get('api_gatepass_list_create', {'fields': 'id, status', 'expand': ' student'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()[0]), {'id', 'status', 'student'})
+
+    def test_expand_student(self):
+        response, sql = self.get('api_gatepass_list_create', {'fields': 'id,status', 'expand': 'student'})
+        row = response.json()[0]
+        self.assertEqual(set(row), {'id', 'status', 'student'})
+        self.assertEqual(row['student']['user']['username'][:7], 'student')
+        self.assertIn('JOIN', sql)
+
+        # Without parameters the full nested representation is unchanged
+        full, _ = self.get('api_gatepass_list_create', {})
+        self.assertIn('student', full.json()[0])
+        self.assertIn('purpose', full.json()[0])
+
+    def test_compact_fields_and_unknown_names(self):
+        response, _ = self.get('api_gatepass_list_create', {'compact': 1, 'fields': 'id,student_name'})
+        self.assertEqual(response.json()[0].keys(), {'id', 'student_name'})
+
+        for name in ('api_gatepass_list_create', 'api_async_gatepass_list'):
+            response = self.client.get(reverse(name), {'fields': 'id,password'}, **self.auth)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('status', response.json()['fields'])
@@ -0,0 +1,100 @@
+from datetime import date, time, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import retention, student_stats
+from .models import User, Student, GatePass, StudentGatePassStats
+from .pagination import decode_cursor
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class StudentStatsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='student', email='student@example.com', password='Password123', role='student',
+            gender='M', is_approved=True,
+        )
+        self.student = Student.objects.create(
+            user=self.user, hall_ticket_no='22BH1A0001', student_name='Student', room_no='101',
+            parent_name='Parent', parent_mobile='9000000001',
+        )
+        self.client.force_login(self.user)
+
+    def add_gatepasses(self, count, status='pending'):
+        gatepasses = []
+        for n in range(count):
+            gatepass = GatePass.objects.create(
+                student=self.student, outing_date=date(2025, 1, 1), outing_time=time(10, 0),
+                expected_return_date=date(2025, 1, 1), expected_return_time=time(18, 0), purpose=f'Outing {n}',
+            )
+            if status != 'pending':
+                gatepass.status = status
+                gatepass.save()
+            gatepasses.append(gatepass)
+        return gatepasses
+
+    def test_counters_follow_transitions(self):
+        first, second, third = self.add_gatepasses(3)
+        first.status = 'warden_approved'
+        first.save()
+        second.status = 'warden_rejected'
+        second.save()
+        first.status = 'returned'
+        first.save()
+        self.assertEqual(student_stats.counts(self.student), {
+            'total_count': 3, 'pending_count': 1, 'approved_count': 0, 'rejected_count': 1,
+        })
+        self.assertEqual(student_stats.reconcile(), {})
+
+        # Archiving keeps the counts
+        GatePass.objects.update(updated_at=timezone.now() - timedelta(days=400))
+        self.assertEqual(retention.archive_batch(timezone.now() - timedelta(days=1)), 2)
+        self.assertEqual(student_stats.reconcile(), {})
+
+    def test_missing_counters_are_rebuilt(self):
+        self.add_gatepasses(2, status='warden_approved')
+        StudentGatePassStats.objects.all().delete()
+        self.assertEqual(student_stats.counts(self.student)['approved_count'], 2)
+        self.add_gatepasses(1)
+        self.assertEqual(student_stats.counts(self.student)['total_count'], 3)
+
+    def dashboard_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('student_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_dashboard_cost_does_not_grow_with_history(self):
+        self.add_gatepasses(3)
+        self.client.get(reverse('student_dashboard'))
+        few = self.dashboard_queries()
+        self.add_gatepasses(30, status='returned')
+        self.assertEqual(self.dashboard_queries(), few)
+
+    def test_history_pages_through_live_and_archived_passes(self):
+        self.add_gatepasses(15, status='returned')
+        GatePass.objects.update(updated_at=timezone.now() - timedelta(days=400))
+        self.assertEqual(retention.archive_batch(timezone.now() - timedelta(days=1)), 15)
+        self.add_gatepasses(15)
+
+        url = reverse('student_gatepass_history')
+        seen, params = [], {}
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [gatepass.pk for gatepass in response.context['gatepasses']]
+            if not response.context['next_cursor']:
+                break
+            params = {'after': response.context['next_cursor']}
+        self.assertEqual(len(seen), 30)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+        self.assertEqual(self.client.get(url, {'after': 'garbage'}).status_code, 200)
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from . import throttling
+from .models import User
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    GATEPASS_THROTTLE_RATES={'login_ip': '3/min', 'login_user': '2/min', 'gatepass': '2/min'},
+)
+class ThrottlingTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='student1', email='student1@example.com', password='Password123', role='student'
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_token_bucket_refills(self):
+        self.assertEqual(throttling.consume('gatepass', 'a', now=0), 0)
+        self.assertEqual(throttling.consume('gatepass', 'a', now=0), 0)
+        self.assertAlmostEqual(throttling.consume('gatepass', 'a', now=0), 30)
+        # Half a minute refills one of the two tokens
+        self.assertEqual(throttling.consume('gatepass', 'a', now=30), 0)
+        self.assertEqual(throttling.consume('gatepass', 'b', now=30), 0)
+
+    def test_api_login_throttled_per_username(self):
+        payload = {'username': 'student1', 'password': 'wrong'}
+        for _ in range(2):
+            self.assertEqual(self.client.post(reverse('api_login'), payload).status_code, 400)
+        response = self.client.post(reverse('api_login'), payload)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+
+        response = self.client.post(reverse('api_async_login'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_html_login_throttled_per_ip(self):
+        for n in range(3):
+            response = self.client.post(reverse('login'), {'username': f'nobody{n}', 'password': 'x'})
+            self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse('login'), {'username': 'student1', 'password': 'Password123'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_forwarded_for_only_trusted_from_configured_proxies(self):
+        # Without a trusted proxy a rotating X-Forwarded-For does not buy fresh buckets
+        for n in range(3):
+            response = self.client.post(
+                reverse('login'), {'username': f'nobody{n}', 'password': 'x'}, HTTP_X_FORWARDED_FOR=f'10.0.0.{n}'
+            )
+            self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            reverse('login'), {'username': 'nobody', 'password': 'x'}, HTTP_X_FORWARDED_FOR='10.0.0.9'
+        )
+        self.assertEqual(response.status_code, 429)
+
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='10.0.0.9, 203.0.113.7', REMOTE_ADDR='10.1.1.1')
+        self.assertEqual(throttling.client_ip(request), '10.1.1.1')
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            # Behind one proxy, the address it appended
+            self.assertEqual(throttling.client_ip(request), '203.0.113.7')
+
+    def test_gatepass_list_throttled_per_user(self):
+        auth = {'HTTP_AUTHORIZATION': f'Token {Token.objects.create(user=self.user).key}'}
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('api_gatepass_list_create'), **auth).status_code, 200)
+        response = self.client.get(reverse('api_gatepass_list_create'), **auth)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import User, Student
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class CachedUserTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='student', email='student@example.com', password='Password123', role='student',
+            gender='M', is_approved=True,
+        )
+        self.student = Student.objects.create(
+            user=self.user, hall_ticket_no='22BH1A0001', student_name='Student', room_no='101',
+            parent_name='Parent', parent_mobile='9000000001',
+        )
+        self.client.login(username='student', password='Password123')
+
+    def tables_read(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_user_and_profile_come_from_cache(self):
+        url = reverse('notification_unread_count')
+        _, sql = self.tables_read(url)
+        self.assertIn('"gatepass_student"', sql)  # first request fills the cache
+
+        _, sql = self.tables_read(url)
+        self.assertNotIn('FROM "gatepass_user"', sql)
+        self.assertNotIn('FROM "gatepass_student"', sql)
+
+        response, sql = self.tables_read(reverse('student_dashboard'))
+        self.assertNotIn('FROM "gatepass_student"', sql)
+        self.assertEqual(response.context['student'].room_no, '101')
+
+    def test_saves_evict_the_cached_user(self):
+        self.tables_read(reverse('notification_unread_count'))
+        self.student.room_no = '202'
+        self.student.save()
+        response, _ = self.tables_read(reverse('student_dashboard'))
+        self.assertEqual(response.context['student'].room_no, '202')
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('notification_unread_count'))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,109 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+
+# Token buckets: a scope's rate "N/period" allows bursts of N requests and
+# refills at N per period. Bucket state lives in GATEPASS_THROTTLE_CACHE, which
+# is per process with the local-memory cache and shared with REDIS_URL. The
+# read-modify-write is not atomic, so concurrent requests may slip a few over
+# the limit; that is fine for shedding abusive load.
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60.0); None or '' disables the scope"""
+    if not rate:
+        return None
+    num, period = rate.split('/')
+    return int(num), float(PERIODS[period[0]])
+
+
+def consume(scope, ident, now=None):
+    """Take one token from the (scope, ident) bucket; returns seconds to wait, 0 if allowed"""
+    if not settings.GATEPASS_THROTTLE_ENABLED:
+        return 0
+    rate = parse_rate(settings.GATEPASS_THROTTLE_RATES.get(scope))
+    if rate is None or ident is None:
+        return 0
+    capacity, period = rate
+    refill = capacity / period
+    now = time.time() if now is None else now
+
+    cache = caches[settings.GATEPASS_THROTTLE_CACHE]
+    key = f'throttle:{scope}:{ident}'
+    tokens, updated = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens < 1:
+        cache.set(key, (tokens, now), math.ceil(period))
+        return (1 - tokens) / refill
+    cache.set(key, (tokens - 1, now), math.ceil(period))
+    return 0
+
+
+def client_ip(request):
+    # DRF's ident: REMOTE_ADDR, or the address the last of NUM_PROXIES trusted proxies saw
+    return BaseThrottle().get_ident(request)
+
+
+def login_wait(request, username):
+    """Wait before another login attempt from this IP or for this username, 0 if allowed"""
+    ip_wait = consume('login_ip', client_ip(request))
+    user_wait = consume('login_user', username.lower() if username else None)
+    return max(ip_wait, user_wait)
+
+
+def retry_after(wait):
+    return str(max(1, math.ceil(wait)))
+
+
+def throttled_response(wait):
+    response = JsonResponse(
+        {'detail': f'Request was throttled. Expected available in {retry_after(wait)} seconds.'}, status=429
+    )
+    response['Retry-After'] = retry_after(wait)
+    return response
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """DRF throttle backed by ``consume``; DRF adds Retry-After from ``wait()``"""
+
+    scope = None
+
+    def get_cache_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.delay = consume(self.scope, self.get_cache_ident(request, view))
+        return not self.delay
+
+    def wait(self):
+        return self.delay
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = 'login_ip'
+
+    def get_cache_ident(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    scope = 'login_user'
+
+    def get_cache_ident(self, request, view):
+        username = request.data.get('username')
+        return username.lower() if isinstance(username, str) and username else None
+
+
+class GatePassThrottle(TokenBucketThrottle):
+    """Per user (or per IP when anonymous) budget for the gatepass endpoints"""
+
+    scope = 'gatepass'
@@ -21,12 +21,16 @@ urlpatterns = [
     path('warden/dashboard/', views.warden_dashboard, name='warden_dashboard'),
     path('security/dashboard/', views.security_dashboard, name='security_dashboard'),
     path('superadmin/dashboard/', views.superadmin_dashboard, name='superadmin_dashboard'),
+    path('superadmin/analytics/', views.superadmin_analytics, name='superadmin_analytics'),
     
     # Gatepass URLs
     path('student/gatepass/create/', views.create_gatepass, name='create_gatepass'),
+    path('student/gatepasses/', views.student_gatepass_history, name='student_gatepass_history'),
     path('warden/gatepass/<int:gatepass_id>/approve/', views.warden_approve_gatepass, name='warden_approve_gatepass'),
     path('security/gatepass/<int:gatepass_id>/approve/', views.security_approve_gatepass, name='security_approve_gatepass'),
     path('security/gatepass/<int:gatepass_id>/return/', views.security_record_return, name='security_record_return'),
+    path('security/returns/batch/', views.security_batch_return, name='security_batch_return'),
+    path('security/students/search/', views.student_search, name='student_search'),
     
     # User Management URLs
     path('superadmin/user/<int:user_id>/approve/', views.approve_user, name='approve_user'),
@@ -34,6 +38,12 @@ urlpatterns = [
     
     # Super Admin Gatepass URLs
     path('superadmin/gatepass/<int:gatepass_id>/approve/', views.superadmin_approve_gatepass, name='superadmin_approve_gatepass'),
+    path('superadmin/gatepasses/export/', views.export_gatepasses, name='export_gatepasses'),
+    
+    # Notifications
+    path('notifications/read/', views.mark_notifications_read, name='mark_notifications_read'),
+    path('notifications/<int:notification_id>/read/', views.mark_notification_read, name='mark_notification_read'),
+    path('notifications/unread-count/', views.notification_unread_count, name='notification_unread_count'),
     
     # Parent Verification
     path('parent/verify/<int:gatepass_id>/', views.parent_verification, name='parent_verification'),
@@ -44,11 +54,24 @@ urlpatterns = [
 ]
 
 # --- API endpoints for mobile clients ---
-from . import api_views
+from . import api_views, async_api_views
 
 urlpatterns += [
     path('api/login/', api_views.LoginAPIView.as_view(), name='api_login'),
     path('api/gatepasses/', api_views.GatePassListCreateAPIView.as_view(), name='api_gatepass_list_create'),
     path('api/gatepasses/<int:pk>/warden-approve/', api_views.WardenApproveAPIView.as_view(), name='api_warden_approve'),
     path('api/gatepasses/<int:pk>/security-approve/', api_views.SecurityApproveAPIView.as_view(), name='api_security_approve'),
+    path('api/returns/batch/', api_views.BatchReturnAPIView.as_view(), name='api_batch_return'),
+    path('api/students/search/', api_views.StudentSearchAPIView.as_view(), name='api_student_search'),
+    path('api/occupancy/', api_views.OccupancyAPIView.as_view(), name='api_occupancy'),
+    path('api/notifications/read/', api_views.NotificationMarkReadAPIView.as_view(), name='api_notifications_read'),
+    path('api/notifications/<int:pk>/read/', api_views.NotificationMarkReadAPIView.as_view(), name='api_notification_read'),
+    path('api/notifications/unread-count/', api_views.NotificationUnreadCountAPIView.as_view(), name='api_notification_unread_count'),
+
+    # Async API (same payloads as above; use with an ASGI server)
+    path('api/async/login/', async_api_views.login, name='api_async_login'),
+    path('api/async/gatepasses/', async_api_views.gatepass_list, name='api_async_gatepass_list'),
+    path('api/async/gatepasses/<int:pk>/warden-approve/', async_api_views.warden_approve, name='api_async_warden_approve'),
+    path('api/async/gatepasses/<int:pk>/security-approve/', async_api_views.security_approve, name='api_async_security_approve'),
+    path('api/async/notifications/unread-count/', async_api_views.notification_unread_count, name='api_async_notification_unread_count'),
 ]
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from django.utils.crypto import constant_time_compare
+
+from .hostels import PROFILE_BY_ROLE
+from .models import User
+
+
+# The signed-in user is kept in GATEPASS_USER_CACHE together with their
+# student/warden/security profile, so a page no longer reads the User row and
+# then the profile on every request. Saves and deletes of users and profiles
+# evict the entry (see signals.py); updates through QuerySet.update() do not,
+# and are seen once GATEPASS_USER_CACHE_TIMEOUT expires. The local-memory
+# cache is per process, so without REDIS_URL the timeout is kept short.
+
+# Only sessions created by these backends are resolved from the cache
+CACHED_BACKENDS = ('django.contrib.auth.backends.ModelBackend',)
+
+
+def cache_key(user_id):
+    return f'gatepass:user:{user_id}'
+
+
+def user_cache():
+    return caches[settings.GATEPASS_USER_CACHE]
+
+
+def load_user(user_id):
+    """The user with every role profile joined in; missing profiles are cached as absent"""
+    return User.objects.select_related(*PROFILE_BY_ROLE.values()).filter(pk=user_id).first()
+
+
+def cached_user(user_id):
+    user = user_cache().get(cache_key(user_id))
+    if user is None:
+        user = load_user(user_id)
+        if user is not None and settings.GATEPASS_USER_CACHE_TIMEOUT:
+            user_cache().set(cache_key(user_id), user, settings.GATEPASS_USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate(user_id):
+    user_cache().delete(cache_key(user_id))
+    # Evict again once the write is visible, in case a request re-cached the old row meanwhile
+    transaction.on_commit(lambda: user_cache().delete(cache_key(user_id)))
+
+
+def session_user(request):
+    """``django.contrib.auth.get_user`` served from the cache.
+
+    Anything the cache cannot vouch for (other backends, inactive users,
+    session hashes that need SECRET_KEY_FALLBACKS) goes through Django's own
+    lookup, which also flushes invalid sessions.
+    """
+    session = request.session
+    if SESSION_KEY not in session:
+        return auth.get_user(request)
+    backend = session.get(BACKEND_SESSION_KEY)
+    if backend not in CACHED_BACKENDS or backend not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+    try:
+        user_id = User._meta.pk.to_python(session[SESSION_KEY])
+    except ValidationError:
+        return auth.get_user(request)
+    user = cached_user(user_id)
+    session_hash = session.get(HASH_SESSION_KEY)
+    if user is None or not user.is_active or not (
+        session_hash and constant_time_compare(session_hash, user.get_session_auth_hash())
+    ):
+        return auth.get_user(request)
+    return user
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = session_user(request)
+    return request._cached_user
+
+
+def profile_or_404(user, role):
+    """The user's profile for ``role`` (already loaded for the cached request user)"""
+    profile = getattr(user, PROFILE_BY_ROLE[role], None)
+    if profile is None:
+        raise Http404(f'No {role} profile for this user.')
+    return profile
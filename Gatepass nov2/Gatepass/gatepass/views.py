@@ -2,19 +2,36 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.db import transaction
+from django.db.models import Count, Q
 from django.contrib.auth.views import LoginView
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
 import random
 import string
-from datetime import datetime, date, time
-from .models import User, Student, Warden, Security, GatePass, ParentVerification, Notification
+from datetime import datetime, date, time, timedelta
+from .models import (
+    User, Student, Warden, Security, GatePass, ParentVerification, Notification, ArchivedGatePass,
+    DailyGatePassStats, bump_gatepass_markers,
+)
 from .forms import (
     StudentRegistrationForm, WardenRegistrationForm, SecurityRegistrationForm,
-    GatePassRequestForm, WardenApprovalForm, ParentVerificationForm, SecurityReturnForm, WardenDateFilterForm
+    GatePassRequestForm, WardenApprovalForm, ParentVerificationForm, SecurityReturnForm, GatePassFilterForm,
+    GatePassExportForm, BatchReturnForm
 )
+from . import exports, analytics, occupancy, search, outbox, jobs, throttling, hostels, returns, student_stats, filters
+from .conditional import conditional_page, superadmin_scopes
+from .user_cache import profile_or_404
+from .pagination import keyset_page
+
+
+# Gatepasses per page of a student's history
+STUDENT_HISTORY_PAGE_SIZE = 20
 
 
 def home(request):
@@ -38,6 +55,16 @@ class CustomLoginView(LoginView):
             return redirect('dashboard_redirect')
         return super().dispatch(request, *args, **kwargs)
 
+    def post(self, request, *args, **kwargs):
+        """Refuse login attempts over the per-IP or per-username rate before hashing the password"""
+        wait = throttling.login_wait(request, request.POST.get('username'))
+        if wait:
+            messages.error(request, f'Too many login attempts. Please try again in {throttling.retry_after(wait)} seconds.')
+            response = self.render_to_response(self.get_context_data(form=self.get_form()), status=429)
+            response['Retry-After'] = throttling.retry_after(wait)
+            return response
+        return super().post(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         role = self.request.GET.get('role')
@@ -327,6 +354,7 @@ def register_security(request):
 
 
 @login_required
+@conditional_page()
 def student_dashboard(request):
     """Student dashboard"""
     if request.user.role != 'student':
@@ -336,30 +364,55 @@ def student_dashboard(request):
     # Check for overdue returns
     check_overdue_returns()
     
-    student = get_object_or_404(Student, user=request.user)
-    gatepasses = GatePass.objects.filter(student=student).order_by('-created_at')
+    student = profile_or_404(request.user, 'student')
     
-    # Get statistics
-    total_requests = gatepasses.count()
-    pending_requests = gatepasses.filter(status='pending').count()
-    approved_requests = gatepasses.filter(status__in=['warden_approved', 'security_approved']).count()
-    rejected_requests = gatepasses.filter(status='warden_rejected').count()
+    # Statistics come from the per-student counters, not COUNTs over the history
+    stats = student_stats.counts(student)
+    
+    # Recent history falls back to the archive once live passes run out
+    recent_gatepasses, more_history = keyset_page(
+        [GatePass.objects.filter(student=student), ArchivedGatePass.objects.filter(student=student)], None, 5
+    )
     
     # Get recent notifications
     notifications = Notification.objects.filter(user=request.user).order_by('-created_at')[:5]
     
     context = {
         'student': student,
-        'gatepasses': gatepasses,
-        'total_requests': total_requests,
-        'pending_requests': pending_requests,
-        'approved_requests': approved_requests,
-        'rejected_requests': rejected_requests,
+        'gatepasses': recent_gatepasses,
+        'more_history': more_history is not None,
+        'total_requests': stats['total_count'],
+        'pending_requests': stats['pending_count'],
+        'approved_requests': stats['approved_count'],
+        'rejected_requests': stats['rejected_count'],
         'notifications': notifications,
     }
     return render(request, 'gatepass/student_dashboard.html', context)
 
 
+@login_required
+@conditional_page()
+def student_gatepass_history(request):
+    """A student's full gatepass history, newest first, with keyset paging"""
+    if request.user.role != 'student':
+        messages.error(request, 'Access denied.')
+        return redirect('home')
+    
+    student = profile_or_404(request.user, 'student')
+    gatepasses, next_cursor = keyset_page(
+        [GatePass.objects.filter(student=student), ArchivedGatePass.objects.filter(student=student)],
+        request.GET.get('after'), STUDENT_HISTORY_PAGE_SIZE,
+    )
+    
+    context = {
+        'student': student,
+        'gatepasses': gatepasses,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
+    }
+    return render(request, 'gatepass/student_gatepass_history.html', context)
+
+
 @login_required
 def create_gatepass(request):
     """Create gatepass request"""
@@ -367,7 +420,7 @@ def create_gatepass(request):
         messages.error(request, 'Access denied.')
         return redirect('home')
     
-    student = get_object_or_404(Student, user=request.user)
+    student = profile_or_404(request.user, 'student')
     
     if request.method == 'POST':
         form = GatePassRequestForm(request.POST)
@@ -395,42 +448,31 @@ def create_gatepass(request):
             gatepass.expected_return_time = time(return_hour, return_minute)
             
             gatepass.student = student
-            gatepass.save()
             
-            print(f"DEBUG: Student {student.student_name} (ID: {student.id}) gender: {student.user.gender}")
+            # The verification SMS is queued in the same transaction, so it is sent
+            # if and only if the gatepass exists; delivery happens in deliver_outbox
+            with transaction.atomic():
+                gatepass.save()
 
-            # Create parent verification
-            verification_code = ''.join(random.choices(string.digits, k=6))
-            ParentVerification.objects.create(
-                gatepass=gatepass,
-                parent_mobile=student.parent_mobile,
-                verification_code=verification_code
-            )
+                # Create parent verification
+                verification_code = ''.join(random.choices(string.digits, k=6))
+                ParentVerification.objects.create(
+                    gatepass=gatepass,
+                    parent_mobile=student.parent_mobile,
+                    verification_code=verification_code
+                )
+                outbox.enqueue_sms(
+                    student.parent_mobile,
+                    f"{student.student_name} has requested a gatepass for {gatepass.outing_date} {gatepass.outing_time}. "
+                    f"Verification code: {verification_code}",
+                    gatepass=gatepass,
+                )
             
-            # Create notification for appropriate wardens based on student's gender
-            wardens_to_notify = User.objects.filter(role='warden', is_approved=True, gender=student.user.gender)
-            
-            print(f"DEBUG: Wardens to notify (gender-matched): {list(wardens_to_notify.values_list('username', 'gender'))}")
-
-            if wardens_to_notify.exists():
-                for warden_user in wardens_to_notify:
-                    Notification.objects.create(
-                        user=warden_user,
-                        gatepass=gatepass,
-                        notification_type='gatepass_request',
-                        message=f"New gatepass request from {student.student_name}"
-                    )
-            else:
-                # Fallback: If no specific gender-matching warden found, notify all approved wardens
-                all_approved_wardens = User.objects.filter(role='warden', is_approved=True)
-                print(f"DEBUG: No gender-matched wardens found. Notifying all approved wardens: {list(all_approved_wardens.values_list('username', 'gender'))}")
-                for warden_user in all_approved_wardens:
-                    Notification.objects.create(
-                        user=warden_user,
-                        gatepass=gatepass,
-                        notification_type='gatepass_request',
-                        message=f"New gatepass request from {student.student_name} (No gender-specific warden found)"
-                    )
+            # Notify the gender-matched wardens (or all wardens) and, when workers run,
+            # wake the SMS delivery job
+            jobs.dispatch('notify_wardens_of_request', gatepass_id=gatepass.id)
+            if not settings.GATEPASS_JOBS_INLINE:
+                jobs.enqueue('deliver_outbox', unique=True)
             
             messages.success(request, 'Gatepass request submitted successfully!')
             return redirect('student_dashboard')
@@ -444,6 +486,7 @@ def create_gatepass(request):
 
 
 @login_required
+@conditional_page()
 def warden_dashboard(request):
     """Warden dashboard"""
     if request.user.role != 'warden':
@@ -454,37 +497,27 @@ def warden_dashboard(request):
     check_overdue_returns()
     
     # Initialize filter form
-    filter_form = WardenDateFilterForm(request.GET)
+    filter_form = GatePassFilterForm(request.GET)
     
     # Get all gatepass requests for filtering
     all_requests = GatePass.objects.all().order_by('-created_at')
-    print(f"DEBUG: Warden {request.user.username} (ID: {request.user.id}) gender: {request.user.gender}")
-    print(f"DEBUG: All requests before gender filter: {list(all_requests.values_list('id', 'student__user__gender', 'status'))}")
 
     # Gender filter is removed to show all requests to all wardens.
+    # Wardens assigned to a hostel only see its requests (HostelScopeMiddleware).
     # if request.user.gender:
     #     gender_filtered = all_requests.filter(student__user__gender=request.user.gender)
     #     if gender_filtered.exists():
     #         all_requests = gender_filtered
-    #         print(f"DEBUG: Requests after gender filter (matched): {list(all_requests.values_list('id', 'student__user__gender', 'status'))}")
+    #         print(f"DEBUG: Requests after gender filter (matched): {list(all_requests.values_list('id', 'student_gender', 'status'))}")
     #     else:
     #         print(f"DEBUG: No requests found matching warden's gender ({request.user.gender}). All requests queryset is now empty.")
     #         all_requests = gender_filtered # This will be an empty queryset
     # else:
     #     print("DEBUG: Warden gender not set. No gender filter applied.")
     
-    # Apply date and status filters
+    # Apply the shared list filters
     if filter_form.is_valid():
-        from_date = filter_form.cleaned_data.get('from_date')
-        to_date = filter_form.cleaned_data.get('to_date')
-        status_filter = filter_form.cleaned_data.get('status_filter')
-        
-        if from_date:
-            all_requests = all_requests.filter(outing_date__gte=from_date)
-        if to_date:
-            all_requests = all_requests.filter(outing_date__lte=to_date)
-        if status_filter:
-            all_requests = all_requests.filter(status=status_filter)
+        all_requests = filters.apply(all_requests, filter_form.cleaned_data)
     
     # Get pending gatepass requests
     pending_requests = all_requests.filter(status='pending')
@@ -499,7 +532,7 @@ def warden_dashboard(request):
     )[:10]
     
     # Get returned requests (students who have returned)
-    returned_requests = all_requests.filter(status='returned')[:10]
+    returned_requests = all_requests.filter(status='returned').select_related('return_verified_by')[:10]
     
     # Get students currently out
     students_out_requests = all_requests.filter(status='security_approved')[:10]
@@ -509,7 +542,10 @@ def warden_dashboard(request):
     total_approved = all_requests.filter(status='warden_approved').count()
     total_rejected = all_requests.filter(warden_approval=request.user, status='warden_rejected').count()
     total_returned = all_requests.filter(status='returned').count()
-    students_out = all_requests.filter(status='security_approved').count()
+    if filter_form.is_valid() and filters.is_filtered(filter_form.cleaned_data):
+        students_out = all_requests.filter(status='security_approved').count()
+    else:
+        students_out = occupancy.snapshot(hostels.current_hostel_id())['total']
     
     # Get filtered counts for display
     filtered_count = all_requests.count()
@@ -563,7 +599,7 @@ def warden_approve_gatepass(request, gatepass_id):
                 gatepass.warden_approval = request.user
                 gatepass.parent_verification = True
                 gatepass.save()
-                security_users = User.objects.filter(role='security')
+                security_users = hostels.hostel_staff(User.objects.filter(role='security'), 'security', gatepass.hostel_id)
                 for security in security_users:
                     Notification.objects.create(
                         user=security,
@@ -601,6 +637,7 @@ def warden_approve_gatepass(request, gatepass_id):
 
 
 @login_required
+@conditional_page()
 def security_dashboard(request):
     """Security dashboard"""
     if request.user.role != 'security':
@@ -613,7 +650,7 @@ def security_dashboard(request):
     # Get approved gatepasses waiting for security approval
     approved_requests = GatePass.objects.filter(
         status='warden_approved'
-    ).order_by('-created_at')
+    ).select_related('warden_approval').order_by('-created_at')
     
     # Get security approved requests (students who have left but not returned)
     security_approved = GatePass.objects.filter(
@@ -662,17 +699,23 @@ def security_approve_gatepass(request, gatepass_id):
         return redirect('security_dashboard')
     
     if request.method == 'POST':
-        gatepass.status = 'security_approved'
-        gatepass.security_approval = request.user
-        gatepass.save()
-        
-        # Create notification for student
-        Notification.objects.create(
-            user=gatepass.student.user,
-            gatepass=gatepass,
-            notification_type='security_approval',
-            message="Your gatepass has been approved by security. You can now leave the campus."
-        )
+        with transaction.atomic():
+            # Lock the row so two guards cannot both record the exit (and double count occupancy)
+            gatepass = GatePass.objects.select_for_update().get(id=gatepass_id)
+            if gatepass.status != 'warden_approved':
+                messages.info(request, 'This gatepass has already been processed.')
+                return redirect('security_dashboard')
+            gatepass.status = 'security_approved'
+            gatepass.security_approval = request.user
+            gatepass.save()
+            
+            # Create notification for student
+            Notification.objects.create(
+                user=gatepass.student.user,
+                gatepass=gatepass,
+                notification_type='security_approval',
+                message="Your gatepass has been approved by security. You can now leave the campus."
+            )
         
         messages.success(request, 'Gatepass approved by security!')
         return redirect('security_dashboard')
@@ -683,6 +726,7 @@ def security_approve_gatepass(request, gatepass_id):
 
 
 @login_required
+@conditional_page(superadmin_scopes)
 def superadmin_dashboard(request):
     """Super admin dashboard"""
     if request.user.role != 'superadmin':
@@ -696,21 +740,27 @@ def superadmin_dashboard(request):
     pending_users = User.objects.filter(is_approved=False).exclude(role='superadmin')
     
     # Get overdue returns
-    from datetime import date
     overdue_returns = GatePass.objects.filter(
         status='security_approved',
-        expected_return_date__lt=date.today()
-    ).order_by('expected_return_date')
+        expected_return_at__lt=timezone.now()
+    ).order_by('expected_return_at')
     
     # Get all pending gatepass requests for superadmin approval
     pending_gatepass_approvals = GatePass.objects.filter(status='pending').order_by('-created_at')
     
-    # Get statistics
-    total_students = User.objects.filter(role='student').count()
-    total_wardens = User.objects.filter(role='warden').count()
-    total_security = User.objects.filter(role='security').count()
-    total_gatepasses = GatePass.objects.count()
-    pending_gatepasses = GatePass.objects.filter(status='pending').count()
+    # Get statistics (gatepass totals come from the daily rollup, not full-table counts)
+    user_counts = User.objects.aggregate(
+        students=Count('id', filter=Q(role='student')),
+        wardens=Count('id', filter=Q(role='warden')),
+        security=Count('id', filter=Q(role='security')),
+    )
+    total_students = user_counts['students']
+    total_wardens = user_counts['wardens']
+    total_security = user_counts['security']
+    stats = analytics.totals()
+    total_gatepasses = stats['created_count']
+    # Counted live off gatepass_status_created_idx; deleted passes and superadmin overrides make the rollup drift
+    pending_gatepasses = pending_gatepass_approvals.count()
     overdue_count = overdue_returns.count()
     
     # Get recent gatepass requests
@@ -735,6 +785,38 @@ def superadmin_dashboard(request):
     return render(request, 'gatepass/superadmin_dashboard.html', context)
 
 
+@login_required
+@conditional_page(superadmin_scopes)
+def superadmin_analytics(request):
+    """Gatepass trends read from the daily rollup table"""
+    if request.user.role != 'superadmin':
+        messages.error(request, 'Access denied.')
+        return redirect('home')
+    
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 366)
+    except ValueError:
+        days = 30
+    since = timezone.localdate() - timedelta(days=days - 1)
+    daily_stats = DailyGatePassStats.objects.filter(date__gte=since).order_by('-date')
+    
+    period = dict.fromkeys(analytics.STAT_FIELDS, 0)
+    for row in daily_stats:
+        for field in period:
+            period[field] += getattr(row, field)
+    mean_latency = None
+    if period['approval_latency_samples']:
+        mean_latency = timedelta(seconds=period['approval_latency_seconds'] / period['approval_latency_samples'])
+    
+    context = {
+        'days': days,
+        'daily_stats': daily_stats,
+        'period': period,
+        'mean_latency': mean_latency,
+    }
+    return render(request, 'gatepass/superadmin_analytics.html', context)
+
+
 @login_required
 def approve_user(request, user_id):
     """Approve user registration"""
@@ -758,12 +840,61 @@ def reject_user(request, user_id):
         return redirect('home')
     
     user = get_object_or_404(User, id=user_id)
+    # The cascade removes the user's gatepasses without post_save
+    hostel_ids = set(GatePass.all_hostels.filter(student__user=user).values_list('hostel_id', flat=True))
     user.delete()
+    bump_gatepass_markers(hostel_ids)
     
     messages.success(request, f'User {user.username} has been rejected and deleted.')
     return redirect('superadmin_dashboard')
 
 
+@login_required
+@require_POST
+def mark_notifications_read(request):
+    """Mark the selected (or all) notifications of the current user as read"""
+    ids = request.POST.getlist('ids')
+    if ids and not all(value.isdigit() for value in ids):
+        return JsonResponse({'detail': 'Invalid notification ids'}, status=400)
+    updated = Notification.objects.filter(user=request.user).mark_read(ids or None)
+    
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest' or 'application/json' in request.headers.get('accept', ''):
+        unread = Notification.objects.filter(user=request.user).unread().count()
+        return JsonResponse({'updated': updated, 'unread': unread})
+    # Only go back to a page on this site; the Referer header is client-controlled
+    referer = request.META.get('HTTP_REFERER')
+    if referer and url_has_allowed_host_and_scheme(
+        referer, allowed_hosts={request.get_host()}, require_https=request.is_secure()
+    ):
+        return redirect(referer)
+    return redirect('dashboard_redirect')
+
+
+@login_required
+@require_POST
+def mark_notification_read(request, notification_id):
+    """Mark a single notification of the current user as read"""
+    updated = Notification.objects.filter(user=request.user).mark_read([notification_id])
+    unread = Notification.objects.filter(user=request.user).unread().count()
+    return JsonResponse({'updated': updated, 'unread': unread})
+
+
+@login_required
+def notification_unread_count(request):
+    """Unread notification count for badge polling"""
+    unread = Notification.objects.filter(user=request.user).unread().count()
+    return JsonResponse({'unread': unread})
+
+
+@login_required
+def student_search(request):
+    """Student lookup for the security desk, returns JSON"""
+    if request.user.role not in ('security', 'warden', 'superadmin'):
+        return JsonResponse({'error': 'Access denied.'}, status=403)
+    students = search.search_students(request.GET.get('q', ''))
+    return JsonResponse({'results': [search.serialize_student(student) for student in students]})
+
+
 def parent_verification(request, gatepass_id):
     """Parent verification page"""
     gatepass = get_object_or_404(GatePass, id=gatepass_id)
@@ -808,8 +939,6 @@ def security_record_return(request, gatepass_id):
     if request.method == 'POST':
         form = SecurityReturnForm(request.POST, instance=gatepass)
         if form.is_valid():
-            gatepass = form.save(commit=False)
-
             # Construct actual_return_time
             return_hour = int(form.cleaned_data['actual_return_hour'])
             return_minute = int(form.cleaned_data['actual_return_minute'])
@@ -818,19 +947,27 @@ def security_record_return(request, gatepass_id):
                 return_hour += 12
             elif return_ampm == 'AM' and return_hour == 12:
                 return_hour = 0
-            gatepass.actual_return_time = time(return_hour, return_minute)
 
-            gatepass.status = 'returned'
-            gatepass.return_verified_by = request.user
-            gatepass.save()
-            
-            # Create notification for student
-            Notification.objects.create(
-                user=gatepass.student.user,
-                gatepass=gatepass,
-                notification_type='return_recorded',
-                message=f"Your return has been recorded on {gatepass.actual_return_date} at {gatepass.actual_return_time}"
-            )
+            with transaction.atomic():
+                # Lock the row so a return is only recorded (and counted) once
+                gatepass = GatePass.objects.select_for_update().get(id=gatepass_id)
+                if gatepass.status != 'security_approved':
+                    messages.info(request, 'This return has already been recorded.')
+                    return redirect('security_dashboard')
+                gatepass.actual_return_date = form.cleaned_data['actual_return_date']
+                gatepass.return_notes = form.cleaned_data['return_notes']
+                gatepass.actual_return_time = time(return_hour, return_minute)
+                gatepass.status = 'returned'
+                gatepass.return_verified_by = request.user
+                gatepass.save()
+                
+                # Create notification for student
+                Notification.objects.create(
+                    user=gatepass.student.user,
+                    gatepass=gatepass,
+                    notification_type='return_recorded',
+                    message=f"Your return has been recorded on {gatepass.actual_return_date} at {gatepass.actual_return_time}"
+                )
             
             messages.success(request, f'Return recorded for {gatepass.student.student_name}')
             return redirect('security_dashboard')
@@ -843,51 +980,39 @@ def security_record_return(request, gatepass_id):
     })
 
 
-def check_overdue_returns():
-    """Check for overdue returns and create notifications"""
-    from django.utils import timezone
-    from datetime import datetime, date, time, time
-    
-    # Get all security approved gatepasses that haven't returned
-    overdue_gatepasses = GatePass.objects.filter(
-        status='security_approved',
-        expected_return_date__lt=date.today()
-    )
+@login_required
+def security_batch_return(request):
+    """Record many returns at once from scanned or typed hall tickets and pass tokens"""
+    if request.user.role != 'security':
+        messages.error(request, 'Access denied.')
+        return redirect('home')
     
-    for gatepass in overdue_gatepasses:
-        # Check if notification already exists for today
-        today = date.today()
-        if not Notification.objects.filter(
-            gatepass=gatepass,
-            notification_type='overdue_return',
-            created_at__date=today
-        ).exists():
-            # Create notification for warden
-            if gatepass.warden_approval:
-                Notification.objects.create(
-                    user=gatepass.warden_approval,
-                    gatepass=gatepass,
-                    notification_type='overdue_return',
-                    message=f"URGENT: Student {gatepass.student.student_name} has not returned after expected date {gatepass.expected_return_date}. Parent contact: {gatepass.student.parent_mobile}"
-                )
-            
-            # Create notification for superadmin
-            superadmin = User.objects.filter(role='superadmin').first()
-            if superadmin:
-                Notification.objects.create(
-                    user=superadmin,
-                    gatepass=gatepass,
-                    notification_type='overdue_return',
-                    message=f"URGENT: Student {gatepass.student.student_name} (Hall Ticket: {gatepass.student.hall_ticket_no}) has not returned after expected date {gatepass.expected_return_date}. Parent contact: {gatepass.student.parent_mobile}"
-                )
-            
-            # Create notification for student
-            Notification.objects.create(
-                user=gatepass.student.user,
-                gatepass=gatepass,
-                notification_type='overdue_return',
-                message=f"URGENT: You have not returned to the hostel after your expected return date {gatepass.expected_return_date}. Please contact the hostel immediately."
+    results = None
+    if request.method == 'POST':
+        form = BatchReturnForm(request.POST)
+        if form.is_valid():
+            results = returns.record_returns(
+                form.cleaned_data['items'], request.user, notes=form.cleaned_data['return_notes']
             )
+            recorded = sum(row['result'] == returns.RETURNED for row in results)
+            messages.success(request, f'Recorded {recorded} of {len(results)} returns.')
+            form = BatchReturnForm()
+    else:
+        form = BatchReturnForm()
+    
+    return render(request, 'gatepass/security_batch_return.html', {
+        'form': form,
+        'results': results,
+    })
+
+
+def check_overdue_returns():
+    """Check for overdue returns and create notifications.
+
+    Skipped when the run_deadline_scheduler process delivers the alerts instead.
+    """
+    if settings.GATEPASS_INLINE_OVERDUE_CHECK:
+        jobs.dispatch('notify_overdue_passes', unique=True)
 
 
 @login_required
@@ -907,7 +1032,9 @@ def superadmin_approve_gatepass(request, gatepass_id):
             gatepass.save()
             
             # Create notification for security
-            security_users = User.objects.filter(role='security', is_approved=True)
+            security_users = hostels.hostel_staff(
+                User.objects.filter(role='security', is_approved=True), 'security', gatepass.hostel_id
+            )
             for security in security_users:
                 Notification.objects.create(
                     user=security,
@@ -941,6 +1068,36 @@ def superadmin_approve_gatepass(request, gatepass_id):
     })
 
 
+@login_required
+def export_gatepasses(request):
+    """Stream the full gatepass history as CSV or JSON Lines for auditors"""
+    if request.user.role != 'superadmin':
+        messages.error(request, 'Access denied.')
+        return redirect('home')
+    
+    form = GatePassExportForm(request.GET)
+    if not form.is_valid():
+        for field, errors in form.errors.items():
+            for error in errors:
+                messages.error(request, error)
+        return redirect('superadmin_dashboard')
+    
+    export_format = form.cleaned_data['format']
+    rows = exports.export_rows(
+        statuses=form.cleaned_data.get('status'),
+        from_date=form.cleaned_data.get('from_date'),
+        to_date=form.cleaned_data.get('to_date'),
+    )
+    content_type = 'application/x-ndjson' if export_format == 'jsonl' else 'text/csv'
+    lines = exports.render_export(export_format, rows)
+    if isinstance(request, ASGIRequest):
+        lines = exports.aiter_lines(lines)
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    response['Content-Disposition'] = f'attachment; filename="gatepasses_{timestamp}.{export_format}"'
+    return response
+
+
 @login_required
 def warden_debug(request):
     """Debug information for warden dashboard"""
@@ -64,12 +64,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'gatepass.middleware.CachedAuthenticationMiddleware',
+    'gatepass.middleware.HostelScopeMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,7 +82,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'gatepass' / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
@@ -88,6 +89,13 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'gatepass.context_processors.notifications_context',
             ],
+            # Compiled templates are kept in memory; in DEBUG they are reloaded when a file changes
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -167,7 +175,109 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Proxies in front of the app that append to X-Forwarded-For (1 behind Render's
+    # load balancer). With 0 the throttles key on REMOTE_ADDR and ignore the header,
+    # which any client can set.
+    'NUM_PROXIES': int(os.environ.get('GATEPASS_NUM_PROXIES', '0')),
 }
 
+# orjson-backed JSON rendering/parsing for the API (gatepass/renderers.py); the
+# classes fall back to DRF's stock JSON handling when orjson is not installed
+if os.environ.get('GATEPASS_FAST_JSON', 'True').lower() == 'true':
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'gatepass.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'gatepass.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
 # during development allow CORS from mobile clients; change in production
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Retention: finished gatepasses older than this many days are moved to archive tables
+GATEPASS_ARCHIVE_AFTER_DAYS = int(os.environ.get('GATEPASS_ARCHIVE_AFTER_DAYS', '180'))
+GATEPASS_ARCHIVE_BATCH_SIZE = int(os.environ.get('GATEPASS_ARCHIVE_BATCH_SIZE', '500'))
+
+# Backups written by the backup_db command
+GATEPASS_BACKUP_DIR = os.environ.get('GATEPASS_BACKUP_DIR', str(BASE_DIR / 'backups'))
+GATEPASS_BACKUP_KEEP = int(os.environ.get('GATEPASS_BACKUP_KEEP', '7'))
+
+# Cache used for template fragments (gatepass rows and cards). Set REDIS_URL to
+# share it between worker processes; the local-memory default is per process.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'gatepass',
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '5000'))},
+        }
+    }
+
+# Return deadlines: reminder lead time, and whether page views scan for overdue
+# passes (turn off when the run_deadline_scheduler process is running)
+GATEPASS_RETURN_REMINDER_MINUTES = int(os.environ.get('GATEPASS_RETURN_REMINDER_MINUTES', '30'))
+GATEPASS_INLINE_OVERDUE_CHECK = os.environ.get('GATEPASS_INLINE_OVERDUE_CHECK', 'True').lower() == 'true'
+
+# Parent SMS: messages are queued in OutboxMessage and sent by the deliver_outbox command.
+# The default gateway only writes to GATEPASS_SMS_FILE; use gatepass.sms.HTTPGateway for a provider.
+GATEPASS_SMS_GATEWAY = os.environ.get('GATEPASS_SMS_GATEWAY', 'gatepass.sms.FileGateway')
+GATEPASS_SMS_FILE = os.environ.get('GATEPASS_SMS_FILE', str(BASE_DIR / 'sms_outbox.jsonl'))
+GATEPASS_SMS_HTTP_URL = os.environ.get('GATEPASS_SMS_HTTP_URL', '')
+GATEPASS_SMS_HTTP_TIMEOUT = float(os.environ.get('GATEPASS_SMS_HTTP_TIMEOUT', '10'))
+GATEPASS_OUTBOX_BATCH_SIZE = int(os.environ.get('GATEPASS_OUTBOX_BATCH_SIZE', '50'))
+GATEPASS_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('GATEPASS_OUTBOX_MAX_ATTEMPTS', '8'))
+
+# Background jobs: with GATEPASS_JOBS_INLINE side effects run in the request as before;
+# turn it off to queue them in the Job table for the run_workers command.
+GATEPASS_JOBS_INLINE = os.environ.get('GATEPASS_JOBS_INLINE', 'True').lower() == 'true'
+GATEPASS_JOBS_MAX_ATTEMPTS = int(os.environ.get('GATEPASS_JOBS_MAX_ATTEMPTS', '3'))
+# Done and failed jobs older than this many days are removed by the prune_jobs command
+GATEPASS_JOBS_KEEP_DAYS = int(os.environ.get('GATEPASS_JOBS_KEEP_DAYS', '7'))
+GATEPASS_JOBS_PRUNE_BATCH_SIZE = int(os.environ.get('GATEPASS_JOBS_PRUNE_BATCH_SIZE', '1000'))
+
+# Token-bucket throttles ("N/period" = bursts of N, refilled at N per period) for the
+# login views and the gatepass API. Buckets live in this cache alias; with REDIS_URL
+# they are shared by all workers.
+GATEPASS_THROTTLE_ENABLED = os.environ.get('GATEPASS_THROTTLE_ENABLED', 'True').lower() == 'true'
+GATEPASS_THROTTLE_CACHE = os.environ.get('GATEPASS_THROTTLE_CACHE', 'default')
+GATEPASS_THROTTLE_RATES = {
+    'login_ip': os.environ.get('GATEPASS_THROTTLE_LOGIN_IP', '20/min'),
+    'login_user': os.environ.get('GATEPASS_THROTTLE_LOGIN_USER', '10/min'),
+    'gatepass': os.environ.get('GATEPASS_THROTTLE_GATEPASS', '120/min'),
+}
+
+# Conditional GET: dashboards and the gatepass list API send ETags built from
+# ChangeMarker versions and answer unchanged polls with 304. Time-based content
+# (overdue badges) can stay hidden behind a 304 for at most GATEPASS_ETAG_MAX_AGE seconds.
+GATEPASS_CONDITIONAL_GET = os.environ.get('GATEPASS_CONDITIONAL_GET', 'True').lower() == 'true'
+GATEPASS_ETAG_MAX_AGE = int(os.environ.get('GATEPASS_ETAG_MAX_AGE', '60'))
+
+# Sessions and the signed-in user (with their role profile) are read from the
+# cache. The local-memory cache is per process, so a logout or password change
+# would only be seen by the worker that handled it: without REDIS_URL sessions
+# stay in the database and cached users expire quickly.
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.cached_db' if os.environ.get('REDIS_URL') else 'django.contrib.sessions.backends.db',
+)
+GATEPASS_USER_CACHE = os.environ.get('GATEPASS_USER_CACHE', 'default')
+GATEPASS_USER_CACHE_TIMEOUT = int(os.environ.get(
+    'GATEPASS_USER_CACHE_TIMEOUT', '300' if os.environ.get('REDIS_URL') else '30'
+))
+
+# Notification pruning (prune_notifications command): read notifications older than
+# GATEPASS_NOTIFICATION_READ_DAYS and unread ones older than GATEPASS_NOTIFICATION_UNREAD_DAYS
+# (0 keeps unread notifications) are removed in primary-key batches
+GATEPASS_NOTIFICATION_READ_DAYS = int(os.environ.get('GATEPASS_NOTIFICATION_READ_DAYS', '30'))
+GATEPASS_NOTIFICATION_UNREAD_DAYS = int(os.environ.get('GATEPASS_NOTIFICATION_UNREAD_DAYS', '180'))
+GATEPASS_NOTIFICATION_PRUNE_BATCH_SIZE = int(os.environ.get('GATEPASS_NOTIFICATION_PRUNE_BATCH_SIZE', '1000'))